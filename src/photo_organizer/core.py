@@ -22,6 +22,10 @@ from photo_organizer.state import ProcessingState, StateChangeEvent, StateManage
 from photo_organizer.ui.cli_progress import CLIProgressReporter, ProcessingStage
 
 
+# File extensions treated as images when scanning input paths
+IMAGE_EXTENSIONS = frozenset({".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tiff", ".tif", ".webp"})
+
+
 class ApplicationCore:
     """Core application logic for the Photo Organizer application."""
     
@@ -377,7 +381,8 @@ class ApplicationCore:
         
         return image_paths
     
-    def _is_image_file(self, path: Path) -> bool:
+    @staticmethod
+    def _is_image_file(path: Path) -> bool:
         """
         Check if a file is an image.
         
@@ -387,8 +392,7 @@ class ApplicationCore:
         Returns:
             True if the file is an image, False otherwise
         """
-        image_extensions = {".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tiff", ".tif", ".webp"}
-        return path.suffix.lower() in image_extensions
+        return path.suffix.lower() in IMAGE_EXTENSIONS
     
     def _analyze_images(self, image_paths: List[str]) -> List[Image]:
         """
@@ -39,6 +39,24 @@ class ImageFormat(Enum):
         return format_map.get(extension, cls.UNKNOWN)
 
 
+def format_timestamp(timestamp: datetime) -> str:
+    """
+    Format a timestamp as M/D/YYYY h:MMam/pm (e.g. "2/8/2025 3:15pm").
+    
+    Built from the datetime fields directly, since the strftime directives for
+    unpadded values differ between platforms ("%-I" vs "%#I").
+    
+    Args:
+        timestamp: The timestamp to format
+        
+    Returns:
+        The formatted timestamp string
+    """
+    hour = timestamp.hour % 12 or 12
+    suffix = "am" if timestamp.hour < 12 else "pm"
+    return f"{timestamp.month}/{timestamp.day}/{timestamp.year} {hour}:{timestamp.minute:02d}{suffix}"
+
+
 @dataclass
 class GeoLocation:
     """Geographic location data."""
@@ -97,7 +115,7 @@ class ImageMetadata:
         if not self.timestamp:
             return None
         
-        return self.timestamp.strftime("%-m/%-d/%Y %-I:%M%p").lower()
+        return format_timestamp(self.timestamp)
 
 
 class Image:
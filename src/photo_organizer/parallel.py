@@ -3,6 +3,7 @@ Parallel processing utilities for the Photo Organizer application.
 """
 
 import concurrent.futures
+import contextlib
 import threading
 import time
 from typing import Any, Callable, Dict, List, Optional, TypeVar, Union
@@ -19,6 +20,7 @@ class WorkerPool:
         max_workers: int = 4,
         name: str = "WorkerPool",
         progress_callback: Optional[Callable[[int, int], None]] = None,
+        shared_executor: Optional[concurrent.futures.Executor] = None,
     ) -> None:
         """
         Initialize a worker pool.
@@ -27,10 +29,14 @@ class WorkerPool:
             max_workers: Maximum number of worker threads
             name: Name of the worker pool
             progress_callback: Callback for progress updates
+            shared_executor: Executor to run tasks on instead of starting
+                new threads for every map; it is owned by the caller, so it
+                is never shut down by the pool and max_workers is not used
         """
         self.max_workers = max_workers
         self.name = name
         self.progress_callback = progress_callback
+        self.shared_executor = shared_executor
         
         self.executor = None
         self.futures = []
@@ -85,11 +91,16 @@ class WorkerPool:
                 self.errors.append((item, e))
                 return None
         
-        # Create thread pool
-        with concurrent.futures.ThreadPoolExecutor(
-            max_workers=self.max_workers,
-            thread_name_prefix=self.name,
-        ) as executor:
+        # Create thread pool, unless one is shared with this pool
+        if self.shared_executor is not None:
+            executor_context = contextlib.nullcontext(self.shared_executor)
+        else:
+            executor_context = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix=self.name,
+            )
+        
+        with executor_context as executor:
             self.executor = executor
             
             # Submit all tasks
@@ -114,6 +125,11 @@ class WorkerPool:
                 # Update progress
                 if self.progress_callback:
                     self.progress_callback(processed_items, total_items)
+            
+            # A shared executor is not shut down on exit, so wait for the
+            # tasks still running as shutting down an own executor would
+            if self.shared_executor is not None:
+                concurrent.futures.wait(self.futures)
         
         return self.results
     
@@ -128,7 +144,8 @@ class WorkerPool:
         
         # Cancel futures
         if self.executor:
-            self.executor.shutdown(wait=False)
+            if self.executor is not self.shared_executor:
+                self.executor.shutdown(wait=False)
             
             for future in self.futures:
                 future.cancel()
@@ -5,6 +5,7 @@ File mapping service for the Photo Organizer application.
 from __future__ import annotations
 
 import os
+import sys
 from pathlib import Path
 from typing import Dict, List, Optional, Set
 
@@ -64,12 +65,19 @@ class FileMappingService:
             # Get the output base path (parent of the first category folder)
             output_base = str(image.new_path.parent.parent.parent)
             
+            # Many files share a category and location, so intern those strings
+            # to keep a single copy of each across all mappings
+            category = sys.intern(self._get_category_from_path(image.new_path, output_base))
+            geolocation = self._get_formatted_geolocation(image.metadata.geolocation) if image.metadata and image.metadata.geolocation else None
+            if geolocation is not None:
+                geolocation = sys.intern(geolocation)
+            
             mapping = FileMapping(
                 original_path=str(image.path),
                 new_path=str(image.new_path),
-                category=self._get_category_from_path(image.new_path, output_base),
+                category=category,
                 timestamp=image.metadata.timestamp if image.metadata else None,
-                geolocation=self._get_formatted_geolocation(image.metadata.geolocation) if image.metadata and image.metadata.geolocation else None,
+                geolocation=geolocation,
             )
             
             mappings.append(mapping)
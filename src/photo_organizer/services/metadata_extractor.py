@@ -4,14 +4,36 @@ MetadataExtractor service for extracting metadata from images.
 
 from __future__ import annotations
 
+import concurrent.futures
 import datetime
+import io
+import struct
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Dict, Optional, Tuple, Union
+from typing import AbstractSet, BinaryIO, Dict, List, Optional, Tuple, Union
 
-import exifread
+from photo_organizer.models.image import GeoLocation, ImageMetadata, format_timestamp
 
-from photo_organizer.models.image import GeoLocation, ImageMetadata
+
+# Number of leading bytes read per file by the bulk prefetch. A JPEG APP1
+# segment is limited to 64KB, so this covers the EXIF block of typical photos.
+EXIF_PREFETCH_SIZE = 64 * 1024
+
+# Container signatures and markers used to locate the EXIF block directly
+JPEG_SOI = b"\xff\xd8"
+JPEG_APP1 = 0xE1
+JPEG_SOS = 0xDA
+JPEG_EOI = 0xD9
+JPEG_STANDALONE_MARKERS = frozenset([0x01] + list(range(0xD0, 0xD8)))
+EXIF_HEADER = b"Exif\x00\x00"
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# Metadata groups that can be requested from extract_metadata
+METADATA_FIELDS = frozenset({"timestamp", "geolocation", "camera"})
+
+# EXIF tag after which exifread can stop reading the EXIF IFD when only the
+# timestamp is needed
+TIMESTAMP_STOP_TAG = "DateTimeOriginal"
 
 
 class MetadataExtractionError(Exception):
@@ -25,12 +47,18 @@ class MetadataExtractor(ABC):
     """
     
     @abstractmethod
-    def extract_metadata(self, image_path: Path) -> ImageMetadata:
+    def extract_metadata(
+        self,
+        image_path: Path,
+        *,
+        want: AbstractSet[str] = METADATA_FIELDS,
+    ) -> ImageMetadata:
         """
         Extract metadata from an image file.
         
         Args:
             image_path: The path to the image file
+            want: The metadata groups to extract, a subset of METADATA_FIELDS
             
         Returns:
             The extracted metadata
@@ -82,12 +110,19 @@ class ExifMetadataExtractor(MetadataExtractor):
     Metadata extractor implementation using exifread.
     """
     
-    def extract_metadata(self, image_path: Path) -> ImageMetadata:
+    def extract_metadata(
+        self,
+        image_path: Path,
+        *,
+        want: AbstractSet[str] = METADATA_FIELDS,
+    ) -> ImageMetadata:
         """
         Extract metadata from an image file.
         
         Args:
             image_path: The path to the image file
+            want: The metadata groups to extract, a subset of METADATA_FIELDS.
+                Groups that are not requested are left unset.
             
         Returns:
             The extracted metadata
@@ -96,13 +131,15 @@ class ExifMetadataExtractor(MetadataExtractor):
             metadata = ImageMetadata()
             
             # Extract timestamp
-            metadata.timestamp = self.extract_timestamp(image_path)
+            if "timestamp" in want:
+                metadata.timestamp = self.extract_timestamp(image_path)
             
             # Extract geolocation
-            metadata.geolocation = self.extract_geolocation(image_path)
+            if "geolocation" in want:
+                metadata.geolocation = self.extract_geolocation(image_path)
             
             # Extract camera info
-            camera_info = self._extract_camera_info(image_path)
+            camera_info = self._extract_camera_info(image_path) if "camera" in want else None
             if camera_info:
                 metadata.camera_make = camera_info.get("make")
                 metadata.camera_model = camera_info.get("model")
@@ -127,22 +164,8 @@ class ExifMetadataExtractor(MetadataExtractor):
             The extracted timestamp, or None if not available
         """
         try:
-            with open(image_path, "rb") as f:
-                tags = exifread.process_file(f, details=False)
-            
-            # Try different EXIF tags for the timestamp
-            date_tags = [
-                "EXIF DateTimeOriginal",
-                "EXIF DateTimeDigitized",
-                "Image DateTime"
-            ]
-            
-            for tag in date_tags:
-                if tag in tags:
-                    date_str = str(tags[tag])
-                    return self._parse_exif_date(date_str)
-            
-            return None
+            tags = self._read_tags(image_path, stop_tag=TIMESTAMP_STOP_TAG)
+            return self._timestamp_from_tags(tags)
         
         except Exception as e:
             # Log the error but don't raise an exception
@@ -160,29 +183,8 @@ class ExifMetadataExtractor(MetadataExtractor):
             The extracted geolocation data, or None if not available
         """
         try:
-            with open(image_path, "rb") as f:
-                tags = exifread.process_file(f, details=False)
-            
-            # Check if GPS info is available
-            if "GPS GPSLatitude" not in tags or "GPS GPSLongitude" not in tags:
-                return None
-            
-            # Extract latitude and longitude
-            lat = self._convert_to_degrees(tags["GPS GPSLatitude"])
-            lon = self._convert_to_degrees(tags["GPS GPSLongitude"])
-            
-            # Check latitude and longitude reference
-            if "GPS GPSLatitudeRef" in tags and str(tags["GPS GPSLatitudeRef"]) == "S":
-                lat = -lat
-            
-            if "GPS GPSLongitudeRef" in tags and str(tags["GPS GPSLongitudeRef"]) == "W":
-                lon = -lon
-            
-            # Create GeoLocation object
-            return GeoLocation(
-                latitude=lat,
-                longitude=lon
-            )
+            tags = self._read_tags(image_path)
+            return self._geolocation_from_tags(tags)
         
         except Exception as e:
             # Log the error but don't raise an exception
@@ -199,7 +201,7 @@ class ExifMetadataExtractor(MetadataExtractor):
         Returns:
             The formatted timestamp string in the format "M/D/YYYY h:MMam/pm"
         """
-        return timestamp.strftime("%-m/%-d/%Y %-I:%M%p").lower()
+        return format_timestamp(timestamp)
     
     def _extract_camera_info(self, image_path: Path) -> Optional[Dict[str, Union[str, float, int]]]:
         """
@@ -212,57 +214,383 @@ class ExifMetadataExtractor(MetadataExtractor):
             A dictionary with camera information, or None if not available
         """
         try:
-            with open(image_path, "rb") as f:
-                tags = exifread.process_file(f, details=False)
-            
-            camera_info = {}
-            
-            # Extract camera make and model
-            if "Image Make" in tags:
-                camera_info["make"] = str(tags["Image Make"])
-            
-            if "Image Model" in tags:
-                camera_info["model"] = str(tags["Image Model"])
-            
-            # Extract exposure time
-            if "EXIF ExposureTime" in tags:
-                exposure_str = str(tags["EXIF ExposureTime"])
-                if "/" in exposure_str:
-                    num, denom = exposure_str.split("/")
-                    camera_info["exposure_time"] = float(num) / float(denom)
-                else:
-                    camera_info["exposure_time"] = float(exposure_str)
-            
-            # Extract aperture
-            if "EXIF FNumber" in tags:
-                aperture_str = str(tags["EXIF FNumber"])
-                if "/" in aperture_str:
-                    num, denom = aperture_str.split("/")
-                    camera_info["aperture"] = float(num) / float(denom)
-                else:
-                    camera_info["aperture"] = float(aperture_str)
-            
-            # Extract ISO
-            if "EXIF ISOSpeedRatings" in tags:
-                iso_str = str(tags["EXIF ISOSpeedRatings"])
-                camera_info["iso"] = int(iso_str)
-            
-            # Extract focal length
-            if "EXIF FocalLength" in tags:
-                focal_length_str = str(tags["EXIF FocalLength"])
-                if "/" in focal_length_str:
-                    num, denom = focal_length_str.split("/")
-                    camera_info["focal_length"] = float(num) / float(denom)
-                else:
-                    camera_info["focal_length"] = float(focal_length_str)
-            
-            return camera_info if camera_info else None
+            tags = self._read_tags(image_path)
+            return self._camera_info_from_tags(tags)
         
         except Exception as e:
             # Log the error but don't raise an exception
             print(f"Warning: Failed to extract camera info from {image_path}: {e}")
             return None
     
+    def extract_metadata_batch(
+        self,
+        image_paths: List[Path],
+        max_workers: int = 16,
+    ) -> Dict[Path, ImageMetadata]:
+        """
+        Extract metadata from many image files, prefetching EXIF data concurrently.
+        
+        The leading bytes of every file are read on a thread pool so the small
+        reads overlap instead of being issued one after another, and the tags
+        of each file are parsed once from the prefetched buffer.
+        
+        Args:
+            image_paths: The paths to the image files
+            max_workers: Maximum number of concurrent reads
+            
+        Returns:
+            A dictionary mapping each path to its extracted metadata. Paths that
+            could not be read are omitted.
+        """
+        results: Dict[Path, ImageMetadata] = {}
+        
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="ExifPrefetch",
+        ) as executor:
+            futures = {
+                executor.submit(self._prefetch_exif, path): path
+                for path in image_paths
+            }
+            
+            for future in concurrent.futures.as_completed(futures):
+                path = futures[future]
+                try:
+                    tags = self._parse_prefetched(path, future.result())
+                except Exception as e:
+                    # Log the error but don't raise an exception
+                    print(f"Warning: Failed to extract metadata from {path}: {e}")
+                    continue
+                
+                results[path] = self._metadata_from_tags(path, tags)
+        
+        return results
+    
+    def _prefetch_exif(self, image_path: Path) -> bytes:
+        """
+        Read the leading bytes of an image file, where the EXIF data lives.
+        
+        Args:
+            image_path: The path to the image file
+            
+        Returns:
+            Up to EXIF_PREFETCH_SIZE bytes from the start of the file
+        """
+        with open(image_path, "rb") as f:
+            return f.read(EXIF_PREFETCH_SIZE)
+    
+    def _parse_prefetched(self, image_path: Path, data: bytes) -> Dict:
+        """
+        Parse EXIF tags from a prefetched buffer.
+        
+        Falls back to parsing the whole file when the buffer was truncated and
+        did not contain the tags (e.g. TIFF files with trailing IFDs).
+        
+        Args:
+            image_path: The path to the image file
+            data: The prefetched leading bytes of the file
+            
+        Returns:
+            The EXIF tags
+        """
+        try:
+            tags = self._process_exif(io.BytesIO(data))
+        except Exception:
+            tags = {}
+        
+        if not tags and len(data) >= EXIF_PREFETCH_SIZE:
+            tags = self._read_tags(image_path)
+        
+        return tags
+    
+    def _read_tags(self, image_path: Path, stop_tag: Optional[str] = None) -> Dict:
+        """
+        Read the EXIF tags of an image file.
+        
+        Args:
+            image_path: The path to the image file
+            stop_tag: Optional EXIF tag name after which exifread stops reading
+                the current IFD
+            
+        Returns:
+            The EXIF tags
+        """
+        with open(image_path, "rb") as f:
+            return self._process_exif(f, stop_tag)
+    
+    def _process_exif(self, f: BinaryIO, stop_tag: Optional[str] = None) -> Dict:
+        """
+        Parse EXIF tags from an open image file.
+        
+        The EXIF block of JPEG and PNG files is located directly and only that
+        block is handed to exifread. Other containers fall back to letting
+        exifread scan the whole file.
+        
+        Args:
+            f: The open image file, positioned at the start
+            stop_tag: Optional EXIF tag name after which exifread stops reading
+                the current IFD
+            
+        Returns:
+            The EXIF tags
+        """
+        # Imported here so that importing this module does not load exifread
+        import exifread
+        
+        options = {"details": False}
+        if stop_tag is not None:
+            options["stop_tag"] = stop_tag
+        
+        block = self._locate_exif_block(f)
+        if block is not None:
+            return exifread.process_file(io.BytesIO(block), **options)
+        
+        f.seek(0)
+        return exifread.process_file(f, **options)
+    
+    def _locate_exif_block(self, f: BinaryIO) -> Optional[bytes]:
+        """
+        Locate the TIFF-formatted EXIF block of a JPEG or PNG file.
+        
+        Args:
+            f: The open image file, positioned at the start
+            
+        Returns:
+            The EXIF block, or None if it could not be located
+        """
+        signature = f.read(len(PNG_SIGNATURE))
+        if signature.startswith(JPEG_SOI):
+            f.seek(len(JPEG_SOI))
+            return self._locate_app1(f)
+        
+        if signature == PNG_SIGNATURE:
+            return self._locate_png_exif(f)
+        
+        return None
+    
+    def _locate_app1(self, f: BinaryIO) -> Optional[bytes]:
+        """
+        Walk the JPEG segment headers up to the EXIF APP1 segment.
+        
+        Args:
+            f: The open JPEG file, positioned just after the SOI marker
+            
+        Returns:
+            The TIFF block of the APP1 segment, or None if there is none
+        """
+        while True:
+            marker = f.read(2)
+            if len(marker) < 2 or marker[0] != 0xFF:
+                return None
+            
+            marker_type = marker[1]
+            if marker_type == 0xFF:
+                # Fill byte, the marker type follows
+                f.seek(-1, io.SEEK_CUR)
+                continue
+            
+            if marker_type in JPEG_STANDALONE_MARKERS:
+                continue
+            
+            if marker_type in (JPEG_SOS, JPEG_EOI):
+                # EXIF data always precedes the image data
+                return None
+            
+            length_bytes = f.read(2)
+            if len(length_bytes) < 2:
+                return None
+            
+            length = struct.unpack(">H", length_bytes)[0] - 2
+            if marker_type == JPEG_APP1:
+                payload = f.read(length)
+                if len(payload) == length and payload.startswith(EXIF_HEADER):
+                    return payload[len(EXIF_HEADER):]
+                
+                # Not an EXIF APP1 segment (e.g. XMP), keep looking
+                continue
+            
+            f.seek(length, io.SEEK_CUR)
+    
+    def _locate_png_exif(self, f: BinaryIO) -> Optional[bytes]:
+        """
+        Walk the PNG chunk headers up to the eXIf chunk.
+        
+        Args:
+            f: The open PNG file, positioned just after the signature
+            
+        Returns:
+            The contents of the eXIf chunk, or None if there is none
+        """
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                return None
+            
+            length, chunk_type = struct.unpack(">I4s", header)
+            if chunk_type == b"eXIf":
+                payload = f.read(length)
+                if len(payload) != length:
+                    return None
+                
+                # Some writers keep the JPEG-style header in the chunk
+                if payload.startswith(EXIF_HEADER):
+                    payload = payload[len(EXIF_HEADER):]
+                
+                return payload
+            
+            if chunk_type == b"IEND":
+                return None
+            
+            # Skip the chunk data and CRC
+            f.seek(length + 4, io.SEEK_CUR)
+    
+    def _metadata_from_tags(self, image_path: Path, tags: Dict) -> ImageMetadata:
+        """
+        Build image metadata from already parsed EXIF tags.
+        
+        Args:
+            image_path: The path to the image file, used for warnings
+            tags: The EXIF tags
+            
+        Returns:
+            The extracted metadata
+        """
+        metadata = ImageMetadata()
+        
+        try:
+            metadata.timestamp = self._timestamp_from_tags(tags)
+        except Exception as e:
+            print(f"Warning: Failed to extract timestamp from {image_path}: {e}")
+        
+        try:
+            metadata.geolocation = self._geolocation_from_tags(tags)
+        except Exception as e:
+            print(f"Warning: Failed to extract geolocation from {image_path}: {e}")
+        
+        try:
+            camera_info = self._camera_info_from_tags(tags)
+        except Exception as e:
+            print(f"Warning: Failed to extract camera info from {image_path}: {e}")
+            camera_info = None
+        
+        if camera_info:
+            metadata.camera_make = camera_info.get("make")
+            metadata.camera_model = camera_info.get("model")
+            metadata.exposure_time = camera_info.get("exposure_time")
+            metadata.aperture = camera_info.get("aperture")
+            metadata.iso = camera_info.get("iso")
+            metadata.focal_length = camera_info.get("focal_length")
+        
+        return metadata
+    
+    def _timestamp_from_tags(self, tags: Dict) -> Optional[datetime.datetime]:
+        """
+        Extract the timestamp from parsed EXIF tags.
+        
+        Args:
+            tags: The EXIF tags
+            
+        Returns:
+            The extracted timestamp, or None if not available
+        """
+        # Try different EXIF tags for the timestamp
+        date_tags = [
+            "EXIF DateTimeOriginal",
+            "EXIF DateTimeDigitized",
+            "Image DateTime"
+        ]
+        
+        for tag in date_tags:
+            if tag in tags:
+                date_str = str(tags[tag])
+                return self._parse_exif_date(date_str)
+        
+        return None
+    
+    def _geolocation_from_tags(self, tags: Dict) -> Optional[GeoLocation]:
+        """
+        Extract geolocation data from parsed EXIF tags.
+        
+        Args:
+            tags: The EXIF tags
+            
+        Returns:
+            The extracted geolocation data, or None if not available
+        """
+        # Check if GPS info is available
+        if "GPS GPSLatitude" not in tags or "GPS GPSLongitude" not in tags:
+            return None
+        
+        # Extract latitude and longitude
+        lat = self._convert_to_degrees(tags["GPS GPSLatitude"])
+        lon = self._convert_to_degrees(tags["GPS GPSLongitude"])
+        
+        # Check latitude and longitude reference
+        if "GPS GPSLatitudeRef" in tags and str(tags["GPS GPSLatitudeRef"]) == "S":
+            lat = -lat
+        
+        if "GPS GPSLongitudeRef" in tags and str(tags["GPS GPSLongitudeRef"]) == "W":
+            lon = -lon
+        
+        # Create GeoLocation object
+        return GeoLocation(
+            latitude=lat,
+            longitude=lon
+        )
+    
+    def _camera_info_from_tags(self, tags: Dict) -> Optional[Dict[str, Union[str, float, int]]]:
+        """
+        Extract camera information from parsed EXIF tags.
+        
+        Args:
+            tags: The EXIF tags
+            
+        Returns:
+            A dictionary with camera information, or None if not available
+        """
+        camera_info = {}
+        
+        # Extract camera make and model
+        if "Image Make" in tags:
+            camera_info["make"] = str(tags["Image Make"])
+        
+        if "Image Model" in tags:
+            camera_info["model"] = str(tags["Image Model"])
+        
+        # Extract exposure time
+        if "EXIF ExposureTime" in tags:
+            exposure_str = str(tags["EXIF ExposureTime"])
+            if "/" in exposure_str:
+                num, denom = exposure_str.split("/")
+                camera_info["exposure_time"] = float(num) / float(denom)
+            else:
+                camera_info["exposure_time"] = float(exposure_str)
+        
+        # Extract aperture
+        if "EXIF FNumber" in tags:
+            aperture_str = str(tags["EXIF FNumber"])
+            if "/" in aperture_str:
+                num, denom = aperture_str.split("/")
+                camera_info["aperture"] = float(num) / float(denom)
+            else:
+                camera_info["aperture"] = float(aperture_str)
+        
+        # Extract ISO
+        if "EXIF ISOSpeedRatings" in tags:
+            iso_str = str(tags["EXIF ISOSpeedRatings"])
+            camera_info["iso"] = int(iso_str)
+        
+        # Extract focal length
+        if "EXIF FocalLength" in tags:
+            focal_length_str = str(tags["EXIF FocalLength"])
+            if "/" in focal_length_str:
+                num, denom = focal_length_str.split("/")
+                camera_info["focal_length"] = float(num) / float(denom)
+            else:
+                camera_info["focal_length"] = float(focal_length_str)
+        
+        return camera_info if camera_info else None
+    
     def _parse_exif_date(self, date_str: str) -> datetime.datetime:
         """
         Parse an EXIF date string into a datetime object.
@@ -296,12 +624,18 @@ class ExifMetadataExtractor(MetadataExtractor):
         """
         # GPS coordinates in EXIF are stored as a tuple of three rational values
         # representing degrees, minutes, and seconds
-        d = str(value).replace("[", "").replace("]", "").split(",")
-        
-        # Parse degrees, minutes, and seconds
-        degrees = self._parse_rational(d[0])
-        minutes = self._parse_rational(d[1])
-        seconds = self._parse_rational(d[2])
+        values = getattr(value, "values", None)
+        if isinstance(values, list) and len(values) >= 3:
+            # exifread tags carry the parsed rationals, no need to format them
+            # as a string and parse them back
+            degrees, minutes, seconds = (float(v) for v in values[:3])
+        else:
+            d = str(value).replace("[", "").replace("]", "").split(",")
+            
+            # Parse degrees, minutes, and seconds
+            degrees = self._parse_rational(d[0])
+            minutes = self._parse_rational(d[1])
+            seconds = self._parse_rational(d[2])
         
         # Convert to decimal degrees
         return degrees + (minutes / 60.0) + (seconds / 3600.0)
@@ -7,8 +7,9 @@ from __future__ import annotations
 import html
 import os
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Union
+from typing import Callable, Dict, List, Optional, Set, Union
 
+from photo_organizer.models.image import format_timestamp
 from photo_organizer.services.reporting import (
     FileMapping,
     FolderNode,
@@ -18,6 +19,37 @@ from photo_organizer.services.reporting import (
 )
 
 
+# Static report sections, built once at import rather than on every export
+TEXT_REPORT_HEADER = (
+    "Photo Organizer Report",
+    "=" * 80,
+    "",
+)
+
+HTML_REPORT_HEADER = (
+    "<!DOCTYPE html>",
+    "<html>",
+    "<head>",
+    "  <title>Photo Organizer Report</title>",
+    "  <style>",
+    "    body { font-family: Arial, sans-serif; margin: 20px; }",
+    "    h1 { color: #333; }",
+    "    h2 { color: #666; margin-top: 30px; }",
+    "    .summary { background-color: #f5f5f5; padding: 10px; border-radius: 5px; }",
+    "    .folder { margin-left: 20px; }",
+    "    .file { margin-left: 40px; color: #333; }",
+    "    .mapping { margin-bottom: 20px; padding: 10px; background-color: #f9f9f9; border-radius: 5px; }",
+    "    .error { color: red; }",
+    "  </style>",
+    "</head>",
+    "<body>",
+    "  <h1>Photo Organizer Report</h1>",
+)
+
+# Number of report lines joined per write when exporting
+REPORT_WRITE_CHUNK_LINES = 1000
+
+
 class ReportExportService:
     """Service for exporting reports in various formats."""
     
@@ -30,15 +62,19 @@ class ReportExportService:
             format: The format to export the report in
             output_path: The path to save the report to
         """
-        if format == ReportFormat.TEXT:
-            content = self._format_report_text(report)
-        elif format == ReportFormat.HTML:
-            content = self._format_report_html(report)
-        else:
+        formatter = REPORT_FORMATTERS.get(format)
+        if formatter is None:
             raise ValueError(f"Unsupported report format: {format}")
         
+        lines = formatter(self, report)
+        
+        # Write the lines in chunks rather than joining the whole report, so a
+        # large report is not held in memory twice
         with open(output_path, "w", encoding="utf-8") as f:
-            f.write(content)
+            for start in range(0, len(lines), REPORT_WRITE_CHUNK_LINES):
+                if start:
+                    f.write("\n")
+                f.write("\n".join(lines[start:start + REPORT_WRITE_CHUNK_LINES]))
     
     def _format_report_text(self, report: Report) -> str:
         """
@@ -50,12 +86,20 @@ class ReportExportService:
         Returns:
             The formatted report as a string
         """
-        lines = []
+        return "\n".join(self._report_lines_text(report))
+    
+    def _report_lines_text(self, report: Report) -> List[str]:
+        """
+        Render a report as lines of plain text.
         
+        Args:
+            report: The report to render
+            
+        Returns:
+            The lines of the report
+        """
         # Add header
-        lines.append("Photo Organizer Report")
-        lines.append("=" * 80)
-        lines.append("")
+        lines = list(TEXT_REPORT_HEADER)
         
         # Add summary
         lines.append("Summary")
@@ -89,7 +133,7 @@ class ReportExportService:
                 lines.append(f"Error: {error['error']}")
                 lines.append("")
         
-        return "\n".join(lines)
+        return lines
     
     def _format_folder_structure_text(self, folder: FolderNode, indent: int = 0) -> str:
         """
@@ -145,7 +189,7 @@ class ReportExportService:
                 lines.append(f"  {original_filename} -> {new_filename}")
                 
                 if mapping.timestamp:
-                    timestamp = mapping.timestamp.strftime("%-m/%-d/%Y %-I:%M%p").lower()
+                    timestamp = format_timestamp(mapping.timestamp)
                     lines.append(f"    Timestamp: {timestamp}")
                 
                 if mapping.geolocation:
@@ -165,28 +209,20 @@ class ReportExportService:
         Returns:
             The formatted report as a string
         """
-        lines = []
+        return "\n".join(self._report_lines_html(report))
+    
+    def _report_lines_html(self, report: Report) -> List[str]:
+        """
+        Render a report as lines of HTML.
         
+        Args:
+            report: The report to render
+            
+        Returns:
+            The lines of the report
+        """
         # Add HTML header
-        lines.append("<!DOCTYPE html>")
-        lines.append("<html>")
-        lines.append("<head>")
-        lines.append("  <title>Photo Organizer Report</title>")
-        lines.append("  <style>")
-        lines.append("    body { font-family: Arial, sans-serif; margin: 20px; }")
-        lines.append("    h1 { color: #333; }")
-        lines.append("    h2 { color: #666; margin-top: 30px; }")
-        lines.append("    .summary { background-color: #f5f5f5; padding: 10px; border-radius: 5px; }")
-        lines.append("    .folder { margin-left: 20px; }")
-        lines.append("    .file { margin-left: 40px; color: #333; }")
-        lines.append("    .mapping { margin-bottom: 20px; padding: 10px; background-color: #f9f9f9; border-radius: 5px; }")
-        lines.append("    .error { color: red; }")
-        lines.append("  </style>")
-        lines.append("</head>")
-        lines.append("<body>")
-        
-        # Add header
-        lines.append("  <h1>Photo Organizer Report</h1>")
+        lines = list(HTML_REPORT_HEADER)
         
         # Add summary
         lines.append("  <h2>Summary</h2>")
@@ -201,11 +237,11 @@ class ReportExportService:
         
         # Add folder structure
         lines.append("  <h2>Folder Structure</h2>")
-        lines.append(self._format_folder_structure_html(report.folder_structure))
+        self._append_folder_structure_html(report.folder_structure, lines)
         
         # Add file mappings
         lines.append("  <h2>File Mappings</h2>")
-        lines.append(self._format_file_mappings_html(report.file_mappings))
+        self._append_file_mappings_html(report.file_mappings, lines)
         
         # Add errors
         if report.errors:
@@ -220,20 +256,19 @@ class ReportExportService:
         lines.append("</body>")
         lines.append("</html>")
         
-        return "\n".join(lines)
+        return lines
     
-    def _format_folder_structure_html(self, folder: FolderNode) -> str:
+    def _append_folder_structure_html(self, folder: FolderNode, lines: List[str]) -> None:
         """
-        Format a folder structure as HTML.
+        Append the HTML for a folder structure to a list of output lines.
+        
+        Subfolders are rendered into the same list, so nested folders are not
+        joined into intermediate strings at every level of the tree.
         
         Args:
             folder: The root folder of the structure
-            
-        Returns:
-            The formatted folder structure as a string
+            lines: The output lines to append to
         """
-        lines = []
-        
         lines.append("  <div class='folder'>")
         lines.append(f"    <h3>{html.escape(folder.name)}/</h3>")
         
@@ -246,24 +281,18 @@ class ReportExportService:
         
         # Add subfolders
         for subfolder in sorted(folder.subfolders, key=lambda f: f.name):
-            lines.append(self._format_folder_structure_html(subfolder))
+            self._append_folder_structure_html(subfolder, lines)
         
         lines.append("  </div>")
-        
-        return "\n".join(lines)
     
-    def _format_file_mappings_html(self, file_mappings: List[FileMapping]) -> str:
+    def _append_file_mappings_html(self, file_mappings: List[FileMapping], lines: List[str]) -> None:
         """
-        Format file mappings as HTML.
+        Append the HTML for file mappings to a list of output lines.
         
         Args:
             file_mappings: The file mappings to format
-            
-        Returns:
-            The formatted file mappings as a string
+            lines: The output lines to append to
         """
-        lines = []
-        
         # Group file mappings by category
         mappings_by_category: Dict[str, List[FileMapping]] = {}
         for mapping in file_mappings:
@@ -283,12 +312,17 @@ class ReportExportService:
                 lines.append(f"    <p><strong>{html.escape(original_filename)}</strong> -> {html.escape(new_filename)}</p>")
                 
                 if mapping.timestamp:
-                    timestamp = mapping.timestamp.strftime("%-m/%-d/%Y %-I:%M%p").lower()
+                    timestamp = format_timestamp(mapping.timestamp)
                     lines.append(f"    <p>Timestamp: {html.escape(timestamp)}</p>")
                 
                 if mapping.geolocation:
                     lines.append(f"    <p>Location: {html.escape(mapping.geolocation)}</p>")
                 
                 lines.append("  </div>")
-        
-        return "\n".join(lines)
\ No newline at end of file
+
+
+# ReportExportService methods that render each report format
+REPORT_FORMATTERS: Dict[ReportFormat, Callable[[ReportExportService, Report], List[str]]] = {
+    ReportFormat.TEXT: ReportExportService._report_lines_text,
+    ReportFormat.HTML: ReportExportService._report_lines_html,
+}
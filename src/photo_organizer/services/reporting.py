@@ -12,6 +12,8 @@ from enum import Enum, auto
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Set, Union
 
+from photo_organizer.models.image import format_timestamp
+
 
 class ReportFormat(Enum):
     """Supported report formats."""
@@ -256,7 +258,7 @@ class ReportingService:
                 lines.append(f"  {original_filename} -> {new_filename}")
                 
                 if mapping.timestamp:
-                    timestamp = mapping.timestamp.strftime("%-m/%-d/%Y %-I:%M%p").lower()
+                    timestamp = format_timestamp(mapping.timestamp)
                     lines.append(f"    Timestamp: {timestamp}")
                 
                 if mapping.geolocation:
@@ -394,7 +396,7 @@ class ReportingService:
                 lines.append(f"    <p><strong>{html.escape(original_filename)}</strong> -> {html.escape(new_filename)}</p>")
                 
                 if mapping.timestamp:
-                    timestamp = mapping.timestamp.strftime("%-m/%-d/%Y %-I:%M%p").lower()
+                    timestamp = format_timestamp(mapping.timestamp)
                     lines.append(f"    <p>Timestamp: {html.escape(timestamp)}</p>")
                 
                 if mapping.geolocation:
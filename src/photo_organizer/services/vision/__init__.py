@@ -2,24 +2,44 @@
 Computer vision services for the Photo Organizer application.
 """
 
+import importlib
+
 from photo_organizer.services.vision.base import (
+    DETECTION_DTYPE,
     ComputerVisionError,
     ComputerVisionService,
+    FaceBatch,
     FaceInfo,
     ObjectInfo,
     SceneInfo,
+    as_object_infos,
 )
 from photo_organizer.services.vision.detection import (
     DetectionService,
     ObjectDetector,
     SceneDetector,
 )
-from photo_organizer.services.vision.similarity import (
-    FeatureExtractor,
-    ImageSimilarityService,
-    SimilarityAnalyzer,
-)
-from photo_organizer.services.vision.tensorflow import TensorFlowVisionService
+
+# Services whose modules import TensorFlow at load time are imported on first
+# access, so importing this package does not pay for TensorFlow
+_LAZY_IMPORTS = {
+    "FeatureExtractor": "photo_organizer.services.vision.similarity",
+    "ImageSimilarityService": "photo_organizer.services.vision.similarity",
+    "SimilarityAnalyzer": "photo_organizer.services.vision.similarity",
+    "TensorFlowVisionService": "photo_organizer.services.vision.tensorflow",
+}
+
+
+def __getattr__(name: str):
+    """Import a lazily loaded service on first access."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     "ComputerVisionService",
@@ -28,6 +48,9 @@ __all__ = [
     "ObjectInfo",
     "SceneInfo",
     "FaceInfo",
+    "FaceBatch",
+    "DETECTION_DTYPE",
+    "as_object_infos",
     "ObjectDetector",
     "SceneDetector",
     "DetectionService",
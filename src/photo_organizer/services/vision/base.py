@@ -4,18 +4,29 @@ Base classes for computer vision services.
 
 from __future__ import annotations
 
+import sys
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Union
 
+import numpy as np
+
 
 class ComputerVisionError(Exception):
     """Exception raised for computer vision errors."""
     pass
 
 
-@dataclass
+# Detection results are created per object/face, so they drop the per-instance
+# __dict__ where the running Python supports slotted dataclasses (3.10+)
+_RESULT_DATACLASS_OPTIONS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Row order of facial landmarks in landmark arrays
+LANDMARK_NAMES = ("left_eye", "right_eye", "nose", "left_mouth", "right_mouth")
+
+
+@dataclass(frozen=True, **_RESULT_DATACLASS_OPTIONS)
 class ObjectInfo:
     """Information about a detected object."""
     label: str
@@ -23,19 +34,123 @@ class ObjectInfo:
     bounding_box: Optional[Tuple[float, float, float, float]] = None  # (x, y, width, height)
 
 
-@dataclass
+@dataclass(frozen=True, **_RESULT_DATACLASS_OPTIONS)
 class SceneInfo:
     """Information about a detected scene."""
     label: str
     confidence: float
 
 
-@dataclass
+# Field layout of detection arrays, one row per detected object or scene
+DETECTION_DTYPE = np.dtype([("label", "U32"), ("confidence", np.float32)])
+
+
+def as_object_infos(detections: np.ndarray) -> List[ObjectInfo]:
+    """
+    Convert a detection array to a list of detected objects.
+    
+    Args:
+        detections: A structured array with DETECTION_DTYPE fields
+        
+    Returns:
+        The detected objects, in array order
+    """
+    return [
+        ObjectInfo(label=str(label), confidence=float(confidence))
+        for label, confidence in zip(detections["label"], detections["confidence"])
+    ]
+
+
+@dataclass(frozen=True, **_RESULT_DATACLASS_OPTIONS)
 class FaceInfo:
     """Information about a detected face."""
     confidence: float
     bounding_box: Tuple[float, float, float, float]  # (x, y, width, height)
-    landmarks: Optional[Dict[str, Tuple[float, float]]] = None  # e.g., {"left_eye": (x, y)}
+    # e.g., {"left_eye": (x, y)}; left out of the hash, since a dict is unhashable
+    landmarks: Optional[Dict[str, Tuple[float, float]]] = field(default=None, hash=False)
+    
+    @property
+    def landmarks_array(self) -> Optional[np.ndarray]:
+        """
+        Get the landmarks as a (5, 2) float32 array in LANDMARK_NAMES order.
+        
+        Missing landmarks are filled with NaN.
+        """
+        if self.landmarks is None:
+            return None
+        
+        points = np.full((len(LANDMARK_NAMES), 2), np.nan, dtype=np.float32)
+        for i, name in enumerate(LANDMARK_NAMES):
+            if name in self.landmarks:
+                points[i] = self.landmarks[name]
+        
+        return points
+
+
+@dataclass
+class FaceBatch:
+    """
+    Detected faces stored as contiguous arrays, one row per face.
+    
+    Faces without landmarks have NaN landmark rows.
+    """
+    confidences: np.ndarray  # (N,) float32
+    bounding_boxes: np.ndarray  # (N, 4) float32, (x, y, width, height)
+    landmarks: np.ndarray  # (N, 5, 2) float32, rows in LANDMARK_NAMES order
+    
+    @classmethod
+    def from_faces(cls, faces: List[FaceInfo]) -> FaceBatch:
+        """
+        Create a face batch from a list of detected faces.
+        
+        Args:
+            faces: The detected faces
+            
+        Returns:
+            The face batch
+        """
+        landmarks = np.full((len(faces), len(LANDMARK_NAMES), 2), np.nan, dtype=np.float32)
+        for i, face in enumerate(faces):
+            face_landmarks = face.landmarks_array
+            if face_landmarks is not None:
+                landmarks[i] = face_landmarks
+        
+        return cls(
+            confidences=np.array([face.confidence for face in faces], dtype=np.float32),
+            bounding_boxes=np.array(
+                [face.bounding_box for face in faces], dtype=np.float32
+            ).reshape(-1, 4),
+            landmarks=landmarks,
+        )
+    
+    def __len__(self) -> int:
+        """Get the number of faces in the batch."""
+        return len(self.confidences)
+    
+    def to_faces(self) -> List[FaceInfo]:
+        """
+        Convert the batch back to a list of detected faces.
+        
+        Returns:
+            The detected faces
+        """
+        faces = []
+        for i in range(len(self)):
+            face_landmarks = None
+            if not np.isnan(self.landmarks[i]).all():
+                face_landmarks = {
+                    name: (float(x), float(y))
+                    for name, (x, y) in zip(LANDMARK_NAMES, self.landmarks[i])
+                    if not (np.isnan(x) or np.isnan(y))
+                }
+            
+            faces.append(FaceInfo(
+                confidence=float(self.confidences[i]),
+                bounding_box=tuple(float(v) for v in self.bounding_boxes[i]),
+                landmarks=face_landmarks
+            ))
+        
+        return faces
 
 
 class ComputerVisionService(ABC):
@@ -4,56 +4,557 @@ Object and scene detection services.
 
 from __future__ import annotations
 
+import concurrent.futures
+import functools
+import hashlib
 import os
+import tempfile
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Union
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    ClassVar,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 import numpy as np
-import tensorflow as tf
 from PIL import Image
 
 from photo_organizer.services.vision.base import (
+    DETECTION_DTYPE,
     ComputerVisionError,
     ComputerVisionService,
     ObjectInfo,
     SceneInfo,
 )
 
+# TensorFlow takes seconds to import, so it is imported only when a model is
+# loaded or an image is preprocessed
+if TYPE_CHECKING:
+    import tensorflow as tf
+
+
+# Runtimes a detection model can run on
+KERAS_BACKEND = "keras"
+TFLITE_BACKEND = "tflite"
+ONNX_BACKEND = "onnx"
+
+# File suffixes of models for the TensorFlow Lite and ONNX runtimes
+TFLITE_SUFFIX = ".tflite"
+ONNX_SUFFIX = ".onnx"
+
+# Name of the directory, inside the model directory, that caches preprocessed images
+PREPROCESS_CACHE_DIRNAME = ".preproc_cache"
+
+# Number of leading file bytes hashed into a preprocessed image's cache key
+PREPROCESS_CACHE_KEY_BYTES = 4096
+
+# Input size (width, height) of the detection models
+MODEL_INPUT_SIZE = (224, 224)
+
+# Image file suffixes tf.io.decode_image can decode; it has no TIFF support
+TF_DECODABLE_SUFFIXES = frozenset({".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp"})
+
+# Data type of preprocessed images. float16 halves the memory of image
+# batches; the models cast their input back to float32
+PREPROCESSED_DTYPE = np.float16
+
+
+def convert_to_int8_tflite(
+    model: tf.keras.Model,
+    representative_images: Iterable[np.ndarray],
+    output_path: Path
+) -> Path:
+    """
+    Convert a Keras model to an INT8 post-training-quantized TFLite model.
+    
+    Args:
+        model: The Keras model to convert
+        representative_images: Preprocessed sample images used to calibrate
+            the quantization ranges
+        output_path: Path to save the .tflite model to
+        
+    Returns:
+        The path of the saved model
+    """
+    import tensorflow as tf
+    
+    def representative_dataset():
+        for img in representative_images:
+            yield [np.expand_dims(img, axis=0).astype(np.float32)]
+    
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    converter.representative_dataset = representative_dataset
+    converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    converter.inference_input_type = tf.uint8
+    converter.inference_output_type = tf.uint8
+    
+    output_path.write_bytes(converter.convert())
+    return output_path
+
+
+def load_tflite_interpreter(model_path: Path) -> tf.lite.Interpreter:
+    """
+    Load a TFLite model and allocate its tensors.
+    
+    Args:
+        model_path: Path to the .tflite model
+        
+    Returns:
+        The interpreter, ready for inference
+    """
+    import tensorflow as tf
+    
+    interpreter = tf.lite.Interpreter(model_path=str(model_path), num_threads=os.cpu_count())
+    interpreter.allocate_tensors()
+    return interpreter
+
+
+def run_tflite_interpreter(interpreter: tf.lite.Interpreter, batch: np.ndarray) -> np.ndarray:
+    """
+    Run a TFLite interpreter on a batch of preprocessed images.
+    
+    Quantized inputs and outputs are converted using the scale and zero point
+    stored in the model, so callers always pass and receive float values.
+    
+    Args:
+        interpreter: The interpreter to run
+        batch: The preprocessed images, with a leading batch dimension
+        
+    Returns:
+        The model output as float32 values
+    """
+    input_details = interpreter.get_input_details()[0]
+    output_details = interpreter.get_output_details()[0]
+    
+    input_dtype = input_details["dtype"]
+    if np.issubdtype(input_dtype, np.integer):
+        scale, zero_point = input_details["quantization"]
+        limits = np.iinfo(input_dtype)
+        batch = np.clip(np.round(batch.astype(np.float32) / scale + zero_point), limits.min, limits.max)
+    
+    interpreter.set_tensor(input_details["index"], batch.astype(input_dtype))
+    interpreter.invoke()
+    output = interpreter.get_tensor(output_details["index"])
+    
+    if np.issubdtype(output_details["dtype"], np.integer):
+        scale, zero_point = output_details["quantization"]
+        output = (output.astype(np.float32) - zero_point) * scale
+    
+    return output
+
+
+def load_onnx_session(model_path: Path):
+    """
+    Load an ONNX model into an ONNX Runtime session on the CPU.
+    
+    onnxruntime is an optional dependency, imported only when an ONNX model
+    is used.
+    
+    Args:
+        model_path: Path to the .onnx model
+        
+    Returns:
+        The inference session, with all graph optimizations enabled
+    """
+    import onnxruntime
+    
+    options = onnxruntime.SessionOptions()
+    options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+    return onnxruntime.InferenceSession(
+        str(model_path),
+        sess_options=options,
+        providers=["CPUExecutionProvider"]
+    )
+
+
+def run_onnx_session(session, batch: np.ndarray) -> np.ndarray:
+    """
+    Run an ONNX Runtime session on a batch of preprocessed images.
+    
+    Args:
+        session: The session to run
+        batch: The preprocessed images, with a leading batch dimension
+        
+    Returns:
+        The first model output
+    """
+    input_name = session.get_inputs()[0].name
+    return session.run(None, {input_name: batch.astype(np.float32)})[0]
+
+
+def quantize_onnx_model(model_path: Path, output_path: Path) -> Path:
+    """
+    Quantize the weights of an ONNX model to INT8.
+    
+    Args:
+        model_path: Path to the float32 .onnx model
+        output_path: Path to save the quantized model to
+        
+    Returns:
+        The path of the saved model
+    """
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    
+    quantize_dynamic(str(model_path), str(output_path), weight_type=QuantType.QUInt8)
+    return output_path
+
+
+def load_saved_model(model_path: Path) -> Tuple[object, str]:
+    """
+    Load a saved model, choosing the runtime from its file suffix.
+    
+    Args:
+        model_path: Path to a .tflite model, a .onnx model, or a Keras model
+        
+    Returns:
+        A tuple of (model, backend)
+    """
+    if model_path.suffix == TFLITE_SUFFIX:
+        return load_tflite_interpreter(model_path), TFLITE_BACKEND
+    if model_path.suffix == ONNX_SUFFIX:
+        return load_onnx_session(model_path), ONNX_BACKEND
+    
+    import tensorflow as tf
+    
+    return tf.keras.models.load_model(str(model_path)), KERAS_BACKEND
+
+
+def find_model_path(model_dir: Path, name: str) -> Path:
+    """
+    Get the path of a model, preferring TFLite and ONNX models.
+    
+    Args:
+        model_dir: Directory containing the models
+        name: The model name within the model directory
+        
+    Returns:
+        The path of the .tflite or .onnx model if one exists, otherwise the
+        path of the Keras model
+    """
+    for suffix in (TFLITE_SUFFIX, ONNX_SUFFIX):
+        path = model_dir / f"{name}{suffix}"
+        if path.exists():
+            return path
+    return model_dir / name
+
+
+@functools.lru_cache(maxsize=1)
+def gpu_available() -> bool:
+    """
+    Check whether TensorFlow can use a GPU.
+    
+    Returns:
+        True if at least one GPU is visible to TensorFlow
+    """
+    import tensorflow as tf
+    
+    return bool(tf.config.list_physical_devices("GPU"))
+
+
+def decode_image(image_path: Path) -> np.ndarray:
+    """
+    Decode an image and resize it to the model input size.
+    
+    With a GPU, images in formats TensorFlow can decode are decoded and
+    resized by TensorFlow; otherwise PIL is used.
+    
+    Args:
+        image_path: Path to the image
+        
+    Returns:
+        The resized image as an RGB array
+    """
+    if image_path.suffix.lower() in TF_DECODABLE_SUFFIXES and gpu_available():
+        import tensorflow as tf
+        
+        data = tf.io.read_file(str(image_path))
+        img = tf.io.decode_image(data, channels=3, expand_animations=False)
+        img = tf.image.resize(img, MODEL_INPUT_SIZE[::-1], method="bilinear")
+        return img.numpy()
+    
+    # Load the image
+    img = Image.open(image_path)
+    
+    # Let the JPEG decoder scale down while decoding, skipping pixels the
+    # resize would throw away; this does nothing for other formats
+    img.draft("RGB", MODEL_INPUT_SIZE)
+    
+    # Resize the image
+    img = img.resize(MODEL_INPUT_SIZE)
+    
+    # Convert to RGB if needed
+    if img.mode != "RGB":
+        img = img.convert("RGB")
+    
+    # Convert to numpy array
+    return np.array(img)
+
+
+def model_cache_key(model_path: Optional[Path], weights: str) -> Tuple[Optional[str], Union[int, str]]:
+    """
+    Get the key a loaded model is cached under.
+    
+    Args:
+        model_path: Path to the saved model, if any
+        weights: Name of the pre-trained weights used when there is no saved model
+        
+    Returns:
+        The model path and modification time for a saved model, so a replaced
+        model is loaded again, or None and the weights name otherwise
+    """
+    if model_path and model_path.exists():
+        return str(model_path), model_path.stat().st_mtime_ns
+    return None, weights
+
+
+def preprocess_cache_key(image_path: Path) -> str:
+    """
+    Get the cache key of an image file.
+    
+    The key hashes the leading bytes of the file together with its size and
+    modification time, so it is cheap to compute and changes when the file
+    is edited.
+    
+    Args:
+        image_path: Path to the image
+        
+    Returns:
+        The cache key as a hex string
+    """
+    stat = image_path.stat()
+    digest = hashlib.sha1()
+    with open(image_path, "rb") as f:
+        digest.update(f.read(PREPROCESS_CACHE_KEY_BYTES))
+    digest.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()
+
+
+def load_cached_image(
+    image_path: Path,
+    cache_dir: Path,
+    preprocess: Callable[[Path], np.ndarray]
+) -> np.ndarray:
+    """
+    Load a preprocessed image from the cache, preprocessing and caching it on a miss.
+    
+    Images are cached as .npy files and read back through a memory map, so
+    repeat runs skip decoding, resizing and normalizing the image.
+    
+    Args:
+        image_path: Path to the image
+        cache_dir: Directory holding the cached images
+        preprocess: Function that loads and preprocesses the image on a miss
+        
+    Returns:
+        The preprocessed image
+    """
+    cache_path = cache_dir / f"{preprocess_cache_key(image_path)}.npy"
+    
+    if cache_path.exists():
+        try:
+            return np.array(np.load(cache_path, mmap_mode="r"), dtype=PREPROCESSED_DTYPE)
+        except (OSError, ValueError):
+            # Fall through and rebuild a damaged cache entry
+            pass
+    
+    img = np.asarray(preprocess(image_path), dtype=PREPROCESSED_DTYPE)
+    
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Write to a temporary file first so concurrent readers never see a
+        # partially written entry
+        with tempfile.NamedTemporaryFile(dir=cache_dir, suffix=".tmp", delete=False) as f:
+            np.save(f, img)
+        os.replace(f.name, cache_path)
+    except OSError as e:
+        print(f"Warning: Failed to cache preprocessed image {image_path}: {e}")
+    
+    return img
+
+
+def predict_class_probs(model, img: np.ndarray, backend: str = KERAS_BACKEND) -> np.ndarray:
+    """
+    Run a classification model on a single preprocessed image.
+    
+    Args:
+        model: The Keras model, TFLite interpreter or ONNX Runtime session to run
+        img: The preprocessed image
+        backend: The runtime the model runs on
+        
+    Returns:
+        The class probabilities for the image
+    """
+    return predict_class_probs_batch(model, np.expand_dims(img, axis=0), backend)[0]
+
+
+def predict_class_probs_batch(model, batch: np.ndarray, backend: str = KERAS_BACKEND) -> np.ndarray:
+    """
+    Run a classification model on a batch of preprocessed images.
+    
+    Args:
+        model: The Keras model, TFLite interpreter or ONNX Runtime session to run
+        batch: The preprocessed images, stacked along the first axis
+        backend: The runtime the model runs on
+        
+    Returns:
+        The class probabilities, one row per image
+    """
+    if backend == TFLITE_BACKEND:
+        # The interpreter's input tensor holds a single image
+        predictions = np.concatenate([
+            run_tflite_interpreter(model, batch[i:i + 1]) for i in range(len(batch))
+        ])
+    elif backend == ONNX_BACKEND:
+        predictions = run_onnx_session(model, batch)
+    else:
+        predictions = model.predict(batch)
+    
+    # Process the predictions
+    if isinstance(predictions, list):
+        # For models that return multiple outputs
+        return predictions[0]
+    
+    # For models that return a single output
+    return predictions
+
+
+def top_k_above_threshold(probs: np.ndarray, k: int, threshold: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the k most confident classes whose probability reaches a threshold.
+    
+    Args:
+        probs: Flat class probabilities
+        k: The maximum number of classes to return
+        threshold: The minimum probability of a returned class
+        
+    Returns:
+        The class indices and their probabilities, most confident first
+    """
+    k = min(k, len(probs))
+    if k <= 0:
+        return np.empty(0, dtype=np.intp), probs[:0]
+    
+    # argpartition only partially sorts, so just the top k are ordered
+    top_indices = np.argpartition(-probs, k - 1)[:k]
+    top_indices = top_indices[probs[top_indices] >= threshold]
+    top_indices = top_indices[np.argsort(-probs[top_indices])]
+    
+    return top_indices, probs[top_indices]
+
+
+@functools.lru_cache(maxsize=1)
+def imagenet_labels() -> np.ndarray:
+    """
+    Get the ImageNet class labels.
+    
+    The labels are built once and shared by all detectors, as a read-only
+    object array that can be indexed by arrays of class indices.
+    
+    Returns:
+        An array of class labels
+    """
+    # This is a simplified list of ImageNet labels
+    labels = np.array([
+        "person", "bicycle", "car", "motorcycle", "airplane", "bus", "train", "truck", "boat",
+        "traffic light", "fire hydrant", "stop sign", "parking meter", "bench", "bird", "cat",
+        "dog", "horse", "sheep", "cow", "elephant", "bear", "zebra", "giraffe", "backpack",
+        "umbrella", "handbag", "tie", "suitcase", "frisbee", "skis", "snowboard", "sports ball",
+        "kite", "baseball bat", "baseball glove", "skateboard", "surfboard", "tennis racket",
+        "bottle", "wine glass", "cup", "fork", "knife", "spoon", "bowl", "banana", "apple",
+        "sandwich", "orange", "broccoli", "carrot", "hot dog", "pizza", "donut", "cake", "chair",
+        "couch", "potted plant", "bed", "dining table", "toilet", "tv", "laptop", "mouse",
+        "remote", "keyboard", "cell phone", "microwave", "oven", "toaster", "sink", "refrigerator",
+        "book", "clock", "vase", "scissors", "teddy bear", "hair drier", "toothbrush"
+    ], dtype=object)
+    labels.flags.writeable = False
+    return labels
+
+
+@functools.lru_cache(maxsize=1)
+def scene_labels() -> np.ndarray:
+    """
+    Get the scene class labels.
+    
+    Returns:
+        A read-only array of scene labels, shared by all detectors
+    """
+    # This is a simplified list of scene labels
+    labels = np.array([
+        "beach", "mountain", "forest", "city", "desert", "field", "lake", "ocean", "river",
+        "street", "sunset", "sunrise", "night", "indoor", "outdoor", "building", "house",
+        "office", "restaurant", "park", "garden", "playground", "stadium", "airport", "station",
+        "bridge", "harbor", "waterfall", "snow", "rain", "fog", "cloudy", "sunny"
+    ], dtype=object)
+    labels.flags.writeable = False
+    return labels
+
 
 class ObjectDetector:
     """
     Service for detecting objects in images.
     """
     
+    # Loaded models shared by all instances, keyed by model_cache_key
+    _MODEL_CACHE: ClassVar[Dict[Tuple[Optional[str], Union[int, str]], Tuple[object, str]]] = {}
+    _MODEL_CACHE_LOCK: ClassVar[threading.Lock] = threading.Lock()
+    
     def __init__(
         self,
         model_path: Optional[Path] = None,
         confidence_threshold: float = 0.5,
-        max_detections: int = 10
+        max_detections: int = 10,
+        cache_dir: Optional[Path] = None
     ) -> None:
         """
         Initialize the ObjectDetector.
         
         Args:
-            model_path: Path to the object detection model
+            model_path: Path to the object detection model (a Keras model, or
+                a model with a .tflite or .onnx suffix)
             confidence_threshold: Minimum confidence threshold for detections
             max_detections: Maximum number of detections to return
+            cache_dir: Directory to cache preprocessed images in, or None to
+                preprocess images every time
         """
         self.model_path = model_path
         self.confidence_threshold = confidence_threshold
         self.max_detections = max_detections
+        self.cache_dir = cache_dir
         self._model = None
+        self._backend = KERAS_BACKEND
         self._labels = []
     
     def load_model(self) -> None:
-        """Load the object detection model."""
+        """Load the object detection model, reusing it if another detector loaded it."""
         try:
-            if self.model_path and self.model_path.exists():
-                # Load a saved model
-                self._model = tf.keras.models.load_model(str(self.model_path))
-            else:
-                # Use a pre-trained model
-                self._model = tf.keras.applications.MobileNetV2(weights="imagenet")
+            key = model_cache_key(self.model_path, "mobilenetv2-imagenet")
+            with self._MODEL_CACHE_LOCK:
+                cached = self._MODEL_CACHE.get(key)
+                if cached is None:
+                    if self.model_path and self.model_path.exists():
+                        # Load a saved model
+                        cached = load_saved_model(self.model_path)
+                    else:
+                        # Use a pre-trained model
+                        import tensorflow as tf
+                        
+                        cached = (tf.keras.applications.MobileNetV2(weights="imagenet"), KERAS_BACKEND)
+                    
+                    # A TFLite interpreter holds per-call tensor state, so each
+                    # detector keeps its own
+                    if cached[1] != TFLITE_BACKEND:
+                        self._MODEL_CACHE[key] = cached
+            
+            self._model, self._backend = cached
             
             # Load ImageNet labels
             self._labels = self._get_imagenet_labels()
@@ -72,43 +573,136 @@ class ObjectDetector:
             A list of detected objects
         """
         try:
-            # Load the model if not already loaded
-            if self._model is None:
-                self.load_model()
+            # Load and preprocess the image
+            img = self._load_and_preprocess_image(image_path)
+            
+            return self.classify(self.predict(img))
+        
+        except Exception as e:
+            raise ComputerVisionError(f"Failed to detect objects in {image_path}: {e}")
+    
+    def detect_array(self, image_path: Path) -> np.ndarray:
+        """
+        Detect objects in an image, as a structured array.
+        
+        Args:
+            image_path: Path to the image
             
+        Returns:
+            An array with DETECTION_DTYPE fields, most confident first
+        """
+        try:
             # Load and preprocess the image
             img = self._load_and_preprocess_image(image_path)
             
-            # Run inference
-            predictions = self._model.predict(np.expand_dims(img, axis=0))
+            return self.classify_array(self.predict(img))
+        
+        except Exception as e:
+            raise ComputerVisionError(f"Failed to detect objects in {image_path}: {e}")
+    
+    def predict(self, img: np.ndarray) -> np.ndarray:
+        """
+        Run the object detection model on a preprocessed image.
+        
+        Args:
+            img: The image, as returned by _load_and_preprocess_image
             
-            # Process the predictions
-            if isinstance(predictions, list):
-                # For models that return multiple outputs
-                class_probs = predictions[0][0]
-            else:
-                # For models that return a single output
-                class_probs = predictions[0]
+        Returns:
+            The ImageNet class probabilities for the image
+        """
+        # Load the model if not already loaded
+        if self._model is None:
+            self.load_model()
+        
+        return predict_class_probs(self._model, img, self._backend)
+    
+    def predict_batch(self, batch: np.ndarray) -> np.ndarray:
+        """
+        Run the object detection model on a batch of preprocessed images.
+        
+        Args:
+            batch: The images, stacked along the first axis
             
-            # Get the top predictions
-            top_indices = np.argsort(class_probs)[-self.max_detections:][::-1]
+        Returns:
+            The ImageNet class probabilities, one row per image
+        """
+        # Load the model if not already loaded
+        if self._model is None:
+            self.load_model()
+        
+        return predict_class_probs_batch(self._model, batch, self._backend)
+    
+    def classify(self, class_probs: np.ndarray) -> List[ObjectInfo]:
+        """
+        Turn ImageNet class probabilities into detected objects.
+        
+        Args:
+            class_probs: Class probabilities from the model
             
-            # Create ObjectInfo objects
-            objects = []
-            for idx in top_indices:
-                confidence = float(class_probs[idx])
-                if confidence >= self.confidence_threshold:
-                    label = self._labels[idx] if idx < len(self._labels) else f"Class_{idx}"
-                    objects.append(ObjectInfo(label=label, confidence=confidence))
+        Returns:
+            A list of detected objects, most confident first
+        """
+        class_probs, top_indices = self._top_indices(class_probs)
+        
+        # Create ObjectInfo objects
+        objects = []
+        for idx in top_indices:
+            objects.append(ObjectInfo(label=self._label(idx), confidence=float(class_probs[idx])))
+        
+        return objects
+    
+    def classify_array(self, class_probs: np.ndarray) -> np.ndarray:
+        """
+        Turn ImageNet class probabilities into a structured array of detected objects.
+        
+        Args:
+            class_probs: Class probabilities from the model
             
-            return objects
+        Returns:
+            An array with DETECTION_DTYPE fields, most confident first
+        """
+        class_probs, top_indices = self._top_indices(class_probs)
         
-        except Exception as e:
-            raise ComputerVisionError(f"Failed to detect objects in {image_path}: {e}")
+        detections = np.empty(len(top_indices), dtype=DETECTION_DTYPE)
+        detections["label"] = [self._label(idx) for idx in top_indices]
+        detections["confidence"] = class_probs[top_indices]
+        
+        return detections
+    
+    def _top_indices(self, class_probs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the most confident classes above the confidence threshold.
+        
+        Args:
+            class_probs: Class probabilities from the model
+            
+        Returns:
+            The flattened class probabilities and the indices of the detected
+            classes, most confident first
+        """
+        # Accept a (1, num_classes) prediction row as well as a flat vector
+        class_probs = np.asarray(class_probs).ravel()
+        top_indices, _ = top_k_above_threshold(
+            class_probs, self.max_detections, self.confidence_threshold
+        )
+        
+        return class_probs, top_indices
+    
+    def _label(self, idx: int) -> str:
+        """
+        Get the label for an ImageNet class index.
+        
+        Args:
+            idx: The class index
+            
+        Returns:
+            The class label, or "Class_<idx>" for classes without a label
+        """
+        return self._labels[idx] if idx < len(self._labels) else f"Class_{idx}"
     
     def _load_and_preprocess_image(self, image_path: Path) -> np.ndarray:
         """
-        Load and preprocess an image for object detection.
+        Load and preprocess an image for object detection, using the cache if enabled.
         
         Args:
             image_path: Path to the image
@@ -116,44 +710,39 @@ class ObjectDetector:
         Returns:
             The preprocessed image as a numpy array
         """
-        # Load the image
-        img = Image.open(image_path)
-        
-        # Resize the image
-        img = img.resize((224, 224))
+        if self.cache_dir is None:
+            return self._preprocess_image(image_path)
         
-        # Convert to RGB if needed
-        if img.mode != "RGB":
-            img = img.convert("RGB")
+        return load_cached_image(image_path, self.cache_dir, self._preprocess_image)
+    
+    def _preprocess_image(self, image_path: Path) -> np.ndarray:
+        """
+        Load and preprocess an image for object detection.
         
-        # Convert to numpy array
-        img_array = np.array(img)
+        Args:
+            image_path: Path to the image
+            
+        Returns:
+            The preprocessed image as a float16 numpy array
+        """
+        # Decode and resize the image
+        img_array = decode_image(image_path)
         
         # Preprocess for TensorFlow models
+        import tensorflow as tf
+        
         img_array = tf.keras.applications.mobilenet_v2.preprocess_input(img_array)
         
-        return img_array
+        return img_array.astype(PREPROCESSED_DTYPE)
     
-    def _get_imagenet_labels(self) -> List[str]:
+    def _get_imagenet_labels(self) -> np.ndarray:
         """
         Get the ImageNet class labels.
         
         Returns:
-            A list of class labels
-        """
-        # This is a simplified list of ImageNet labels
-        return [
-            "person", "bicycle", "car", "motorcycle", "airplane", "bus", "train", "truck", "boat",
-            "traffic light", "fire hydrant", "stop sign", "parking meter", "bench", "bird", "cat",
-            "dog", "horse", "sheep", "cow", "elephant", "bear", "zebra", "giraffe", "backpack",
-            "umbrella", "handbag", "tie", "suitcase", "frisbee", "skis", "snowboard", "sports ball",
-            "kite", "baseball bat", "baseball glove", "skateboard", "surfboard", "tennis racket",
-            "bottle", "wine glass", "cup", "fork", "knife", "spoon", "bowl", "banana", "apple",
-            "sandwich", "orange", "broccoli", "carrot", "hot dog", "pizza", "donut", "cake", "chair",
-            "couch", "potted plant", "bed", "dining table", "toilet", "tv", "laptop", "mouse",
-            "remote", "keyboard", "cell phone", "microwave", "oven", "toaster", "sink", "refrigerator",
-            "book", "clock", "vase", "scissors", "teddy bear", "hair drier", "toothbrush"
-        ]
+            An array of class labels
+        """
+        return imagenet_labels()
 
 
 class SceneDetector:
@@ -161,42 +750,71 @@ class SceneDetector:
     Service for detecting scenes in images.
     """
     
+    # Loaded models shared by all instances, keyed by model_cache_key
+    _MODEL_CACHE: ClassVar[Dict[Tuple[Optional[str], Union[int, str]], Tuple[object, str]]] = {}
+    _MODEL_CACHE_LOCK: ClassVar[threading.Lock] = threading.Lock()
+    
     def __init__(
         self,
         model_path: Optional[Path] = None,
         confidence_threshold: float = 0.5,
-        max_detections: int = 5
+        max_detections: int = 5,
+        cache_dir: Optional[Path] = None
     ) -> None:
         """
         Initialize the SceneDetector.
         
         Args:
-            model_path: Path to the scene detection model
+            model_path: Path to the scene detection model (a Keras model, or
+                a model with a .tflite or .onnx suffix)
             confidence_threshold: Minimum confidence threshold for detections
             max_detections: Maximum number of detections to return
+            cache_dir: Directory to cache preprocessed images in, or None to
+                preprocess images every time
         """
         self.model_path = model_path
         self.confidence_threshold = confidence_threshold
         self.max_detections = max_detections
+        self.cache_dir = cache_dir
         self._model = None
+        self._backend = KERAS_BACKEND
         self._labels = []
+        self._scene_map: Optional[np.ndarray] = None
     
     def load_model(self) -> None:
-        """Load the scene detection model."""
+        """Load the scene detection model, reusing it if another detector loaded it."""
         try:
-            if self.model_path and self.model_path.exists():
-                # Load a saved model
-                self._model = tf.keras.models.load_model(str(self.model_path))
-            else:
-                # Use a pre-trained model
-                self._model = tf.keras.applications.ResNet50(weights="imagenet")
+            key = model_cache_key(self.model_path, "resnet50-imagenet")
+            with self._MODEL_CACHE_LOCK:
+                cached = self._MODEL_CACHE.get(key)
+                if cached is None:
+                    if self.model_path and self.model_path.exists():
+                        # Load a saved model
+                        cached = load_saved_model(self.model_path)
+                    else:
+                        # Use a pre-trained model
+                        import tensorflow as tf
+                        
+                        cached = (tf.keras.applications.ResNet50(weights="imagenet"), KERAS_BACKEND)
+                    
+                    # A TFLite interpreter holds per-call tensor state, so each
+                    # detector keeps its own
+                    if cached[1] != TFLITE_BACKEND:
+                        self._MODEL_CACHE[key] = cached
+            
+            self._model, self._backend = cached
             
             # Load scene labels
-            self._labels = self._get_scene_labels()
+            self._load_labels()
         
         except Exception as e:
             raise ComputerVisionError(f"Failed to load scene detection model: {e}")
     
+    def _load_labels(self) -> None:
+        """Load the scene labels and the class-to-scene lookup table."""
+        self._labels = self._get_scene_labels()
+        self._scene_map = self._build_scene_map(len(self._labels))
+    
     def detect(self, image_path: Path) -> List[SceneInfo]:
         """
         Detect scenes in an image.
@@ -208,43 +826,78 @@ class SceneDetector:
             A list of detected scenes
         """
         try:
-            # Load the model if not already loaded
-            if self._model is None:
-                self.load_model()
-            
             # Load and preprocess the image
             img = self._load_and_preprocess_image(image_path)
             
-            # Run inference
-            predictions = self._model.predict(np.expand_dims(img, axis=0))
-            
-            # Process the predictions
-            if isinstance(predictions, list):
-                # For models that return multiple outputs
-                class_probs = predictions[0][0]
-            else:
-                # For models that return a single output
-                class_probs = predictions[0]
+            return self.classify(self.predict(img))
+        
+        except Exception as e:
+            raise ComputerVisionError(f"Failed to detect scenes in {image_path}: {e}")
+    
+    def predict(self, img: np.ndarray) -> np.ndarray:
+        """
+        Run the scene detection model on a preprocessed image.
+        
+        Args:
+            img: The image, as returned by _load_and_preprocess_image
             
-            # Map ImageNet classes to scene categories
-            scene_probs = self._map_to_scenes(class_probs)
+        Returns:
+            The ImageNet class probabilities for the image
+        """
+        # Load the model if not already loaded
+        if self._model is None:
+            self.load_model()
+        
+        return predict_class_probs(self._model, img, self._backend)
+    
+    def predict_batch(self, batch: np.ndarray) -> np.ndarray:
+        """
+        Run the scene detection model on a batch of preprocessed images.
+        
+        Args:
+            batch: The images, stacked along the first axis
             
-            # Get the top predictions
-            scenes = []
-            for label, confidence in scene_probs.items():
-                if confidence >= self.confidence_threshold:
-                    scenes.append(SceneInfo(label=label, confidence=confidence))
+        Returns:
+            The ImageNet class probabilities, one row per image
+        """
+        # Load the model if not already loaded
+        if self._model is None:
+            self.load_model()
+        
+        return predict_class_probs_batch(self._model, batch, self._backend)
+    
+    def classify(self, class_probs: np.ndarray) -> List[SceneInfo]:
+        """
+        Turn ImageNet class probabilities into detected scenes.
+        
+        The probabilities may come from any ImageNet classifier, so the scene
+        head can run on the output of the object detection backbone.
+        
+        Args:
+            class_probs: Class probabilities from the model
             
-            # Sort by confidence and limit to max_detections
-            scenes.sort(key=lambda x: x.confidence, reverse=True)
-            return scenes[:self.max_detections]
+        Returns:
+            A list of detected scenes, most confident first
+        """
+        if len(self._labels) == 0:
+            self._load_labels()
         
-        except Exception as e:
-            raise ComputerVisionError(f"Failed to detect scenes in {image_path}: {e}")
+        # Map ImageNet classes to scene categories
+        scene_probs = self._map_to_scenes(class_probs)
+        
+        # Get the top predictions
+        scenes = []
+        for label, confidence in scene_probs.items():
+            if confidence >= self.confidence_threshold:
+                scenes.append(SceneInfo(label=label, confidence=confidence))
+        
+        # Sort by confidence and limit to max_detections
+        scenes.sort(key=lambda x: x.confidence, reverse=True)
+        return scenes[:self.max_detections]
     
     def _load_and_preprocess_image(self, image_path: Path) -> np.ndarray:
         """
-        Load and preprocess an image for scene detection.
+        Load and preprocess an image for scene detection, using the cache if enabled.
         
         Args:
             image_path: Path to the image
@@ -252,23 +905,49 @@ class SceneDetector:
         Returns:
             The preprocessed image as a numpy array
         """
-        # Load the image
-        img = Image.open(image_path)
-        
-        # Resize the image
-        img = img.resize((224, 224))
+        if self.cache_dir is None:
+            return self._preprocess_image(image_path)
         
-        # Convert to RGB if needed
-        if img.mode != "RGB":
-            img = img.convert("RGB")
+        return load_cached_image(image_path, self.cache_dir, self._preprocess_image)
+    
+    def _preprocess_image(self, image_path: Path) -> np.ndarray:
+        """
+        Load and preprocess an image for scene detection.
         
-        # Convert to numpy array
-        img_array = np.array(img)
+        Args:
+            image_path: Path to the image
+            
+        Returns:
+            The preprocessed image as a float16 numpy array
+        """
+        # Decode and resize the image
+        img_array = decode_image(image_path)
         
         # Preprocess for TensorFlow models
+        import tensorflow as tf
+        
         img_array = tf.keras.applications.resnet50.preprocess_input(img_array)
         
-        return img_array
+        return img_array.astype(PREPROCESSED_DTYPE)
+    
+    def _build_scene_map(self, num_scenes: int, num_classes: int = 1000) -> np.ndarray:
+        """
+        Build the lookup table from ImageNet classes to scene labels.
+        
+        Args:
+            num_scenes: The number of scene labels
+            num_classes: The number of ImageNet classes
+            
+        Returns:
+            An array holding the scene index for each class, or -1 for classes
+            that do not map to a scene
+        """
+        # This is a simplified mapping: the first classes map to the scene
+        # label at the same position
+        scene_map = np.full(num_classes, -1, dtype=np.int32)
+        count = min(num_scenes, num_classes)
+        scene_map[:count] = np.arange(count, dtype=np.int32)
+        return scene_map
     
     def _map_to_scenes(self, class_probs: np.ndarray) -> Dict[str, float]:
         """
@@ -280,33 +959,29 @@ class SceneDetector:
         Returns:
             A dictionary mapping scene labels to confidence scores
         """
-        # This is a simplified mapping from ImageNet classes to scene categories
-        scene_probs = {}
-        
-        # Get the top ImageNet classes
-        top_indices = np.argsort(class_probs)[-10:][::-1]
+        if self._scene_map is None:
+            self._scene_map = self._build_scene_map(len(self._labels))
         
-        for idx in top_indices:
-            if idx < len(self._labels):
-                scene_label = self._labels[idx]
-                scene_probs[scene_label] = float(class_probs[idx])
+        # Sum the probabilities of the classes mapped to each scene
+        count = min(len(class_probs), len(self._scene_map))
+        scene_map = self._scene_map[:count]
+        mask = scene_map >= 0
+        scene_totals = np.bincount(
+            scene_map[mask],
+            weights=class_probs[:count][mask],
+            minlength=len(self._labels)
+        )
         
-        return scene_probs
+        return {self._labels[idx]: float(scene_totals[idx]) for idx in np.flatnonzero(scene_totals)}
     
-    def _get_scene_labels(self) -> List[str]:
+    def _get_scene_labels(self) -> np.ndarray:
         """
         Get the scene class labels.
         
         Returns:
-            A list of scene labels
+            An array of scene labels
         """
-        # This is a simplified list of scene labels
-        return [
-            "beach", "mountain", "forest", "city", "desert", "field", "lake", "ocean", "river",
-            "street", "sunset", "sunrise", "night", "indoor", "outdoor", "building", "house",
-            "office", "restaurant", "park", "garden", "playground", "stadium", "airport", "station",
-            "bridge", "harbor", "waterfall", "snow", "rain", "fog", "cloudy", "sunny"
-        ]
+        return scene_labels()
 
 
 class DetectionService:
@@ -318,7 +993,9 @@ class DetectionService:
         self,
         model_dir: Optional[Path] = None,
         object_threshold: float = 0.5,
-        scene_threshold: float = 0.5
+        scene_threshold: float = 0.5,
+        shared_backbone: bool = False,
+        cache_preprocessed: bool = False
     ) -> None:
         """
         Initialize the DetectionService.
@@ -327,23 +1004,52 @@ class DetectionService:
             model_dir: Directory containing the detection models
             object_threshold: Confidence threshold for object detection
             scene_threshold: Confidence threshold for scene detection
+            shared_backbone: Whether analyze_image runs a single forward pass of
+                the object detection model and derives scenes from its output,
+                instead of running both models. Ignored when the model directory
+                contains a scene detection model.
+            cache_preprocessed: Whether to cache preprocessed images on disk,
+                inside the model directory. Off by default, since cached images
+                are never evicted.
         """
         self.model_dir = model_dir or Path.home() / ".photo_organizer" / "models"
         
         # Create object and scene detectors
-        object_model_path = self.model_dir / "object_detection" if self.model_dir else None
-        scene_model_path = self.model_dir / "scene_detection" if self.model_dir else None
+        object_model_path = self._find_model_path("object_detection")
+        scene_model_path = self._find_model_path("scene_detection")
+        
+        # A configured scene model must always run, so scenes never come from
+        # the object detection model in its place
+        self.shared_backbone = shared_backbone and not scene_model_path.exists()
+        
+        # Preprocessing differs between the models, so each has its own cache
+        cache_dir = self.model_dir / PREPROCESS_CACHE_DIRNAME if cache_preprocessed else None
         
         self.object_detector = ObjectDetector(
             model_path=object_model_path,
-            confidence_threshold=object_threshold
+            confidence_threshold=object_threshold,
+            cache_dir=cache_dir / "object_detection" if cache_dir else None
         )
         
         self.scene_detector = SceneDetector(
             model_path=scene_model_path,
-            confidence_threshold=scene_threshold
+            confidence_threshold=scene_threshold,
+            cache_dir=cache_dir / "scene_detection" if cache_dir else None
         )
     
+    def _find_model_path(self, name: str) -> Path:
+        """
+        Get the path of a detection model, preferring TFLite and ONNX models.
+        
+        Args:
+            name: The model name within the model directory
+            
+        Returns:
+            The path of the .tflite or .onnx model if one exists, otherwise the
+            path of the Keras model
+        """
+        return find_model_path(self.model_dir, name)
+    
     def detect_objects(self, image_path: Path) -> List[ObjectInfo]:
         """
         Detect objects in an image.
@@ -378,6 +1084,112 @@ class DetectionService:
         Returns:
             A tuple of (objects, scenes)
         """
-        objects = self.detect_objects(image_path)
-        scenes = self.detect_scenes(image_path)
-        return objects, scenes
\ No newline at end of file
+        if not self.shared_backbone:
+            # Run the two models concurrently; TensorFlow releases the GIL
+            # while a model runs
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=2,
+                thread_name_prefix="Detection",
+            ) as executor:
+                objects = executor.submit(self.detect_objects, image_path)
+                scenes = executor.submit(self.detect_scenes, image_path)
+                return objects.result(), scenes.result()
+        
+        # Decode the image and run the backbone once, then apply both heads
+        try:
+            img = self.object_detector._load_and_preprocess_image(image_path)
+            class_probs = self.object_detector.predict(img)
+            return self.object_detector.classify(class_probs), self.scene_detector.classify(class_probs)
+        
+        except Exception as e:
+            raise ComputerVisionError(f"Failed to analyze {image_path}: {e}")
+    
+    def analyze_images(
+        self,
+        image_paths: List[Path],
+        batch_size: int = 32,
+        max_workers: int = 4
+    ) -> Dict[Path, Tuple[List[ObjectInfo], List[SceneInfo]]]:
+        """
+        Analyze many images, running the models on batches of images.
+        
+        Images are decoded on a thread pool, and the next batch is decoded
+        while the current one runs through the model.
+        
+        Args:
+            image_paths: Paths to the images
+            batch_size: Number of images per model call
+            max_workers: Maximum number of images decoded concurrently
+            
+        Returns:
+            A dictionary mapping each path to a tuple of (objects, scenes).
+            Images that could not be loaded are omitted.
+        """
+        results: Dict[Path, Tuple[List[ObjectInfo], List[SceneInfo]]] = {}
+        
+        # With a shared backbone only the object detection model runs
+        detectors = [self.object_detector]
+        if not self.shared_backbone:
+            detectors.append(self.scene_detector)
+        
+        batches = [image_paths[i:i + batch_size] for i in range(0, len(image_paths), batch_size)]
+        
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="DetectionDecode",
+        ) as executor:
+            def submit(batch_paths: List[Path]) -> List[concurrent.futures.Future]:
+                return [executor.submit(self._load_model_inputs, path, detectors) for path in batch_paths]
+            
+            pending = submit(batches[0]) if batches else []
+            for index, batch_paths in enumerate(batches):
+                inputs = [future.result() for future in pending]
+                
+                # Start decoding the next batch before running this one
+                if index + 1 < len(batches):
+                    pending = submit(batches[index + 1])
+                
+                loaded = [(path, imgs) for path, imgs in zip(batch_paths, inputs) if imgs is not None]
+                if not loaded:
+                    continue
+                
+                try:
+                    predictions = [
+                        detector.predict_batch(np.stack([imgs[i] for _, imgs in loaded]))
+                        for i, detector in enumerate(detectors)
+                    ]
+                except Exception as e:
+                    raise ComputerVisionError(f"Failed to analyze images: {e}")
+                
+                object_probs = predictions[0]
+                scene_probs = predictions[-1]
+                for row, (path, _) in enumerate(loaded):
+                    results[path] = (
+                        self.object_detector.classify(object_probs[row]),
+                        self.scene_detector.classify(scene_probs[row]),
+                    )
+        
+        return results
+    
+    def _load_model_inputs(
+        self,
+        image_path: Path,
+        detectors: List[Union[ObjectDetector, SceneDetector]]
+    ) -> Optional[Tuple[np.ndarray, ...]]:
+        """
+        Load and preprocess an image for each of the given detectors.
+        
+        Args:
+            image_path: Path to the image
+            detectors: The detectors whose models will be run
+            
+        Returns:
+            The preprocessed image for each detector, or None if the image
+            could not be loaded
+        """
+        try:
+            return tuple(detector._load_and_preprocess_image(image_path) for detector in detectors)
+        except Exception as e:
+            # Log the error but don't raise an exception
+            print(f"Warning: Failed to load {image_path}: {e}")
+            return None
\ No newline at end of file
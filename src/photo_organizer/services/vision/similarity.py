@@ -4,16 +4,187 @@ Image similarity analysis services.
 
 from __future__ import annotations
 
+import concurrent.futures
+import hashlib
+import json
+import mmap
 import os
+import tempfile
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Union
 
 import numpy as np
 import tensorflow as tf
 from PIL import Image
-from scipy.spatial.distance import cosine
 
 from photo_organizer.services.vision.base import ComputerVisionError
+from photo_organizer.services.vision.detection import (
+    KERAS_BACKEND,
+    ONNX_BACKEND,
+    TFLITE_BACKEND,
+    convert_to_int8_tflite,
+    find_model_path,
+    load_saved_model,
+    run_onnx_session,
+    run_tflite_interpreter,
+)
+
+
+# Input size of the feature extraction model
+MODEL_INPUT_SIZE = (224, 224)
+
+# Number of images run through the feature extraction model at once
+FEATURE_BATCH_SIZE = 64
+
+# Number of images decoded concurrently while the model runs
+DECODE_WORKERS = 4
+
+# Directory under the model directory holding cached image features
+FEATURE_CACHE_DIRNAME = ".feature_cache"
+
+# Data type of cached feature vectors
+CACHED_FEATURES_DTYPE = np.float16
+
+# Directory under the model directory holding the persistent feature index
+FEATURE_INDEX_DIRNAME = "index"
+
+# Number of feature rows compared against all images at once when clustering
+SIMILARITY_BLOCK_ROWS = 256
+
+
+def normalize_rows(features: np.ndarray) -> np.ndarray:
+    """
+    Scale each row of a feature matrix to unit length.
+    
+    Args:
+        features: The features, one row per image
+        
+    Returns:
+        The normalized features
+    """
+    features = np.asarray(features, dtype=np.float32)
+    return features / np.linalg.norm(features, axis=1, keepdims=True)
+
+
+def decode_and_preprocess(image_path: tf.Tensor) -> tf.Tensor:
+    """
+    Read, decode and preprocess one image inside a tf.data pipeline.
+    
+    tf.io.decode_image only decodes JPEG, PNG, GIF, BMP and WebP images, so
+    TIFF images fail here and must go through the PIL based extraction.
+    
+    Args:
+        image_path: The path to the image, as a string tensor
+        
+    Returns:
+        The preprocessed image as a float32 tensor
+    """
+    img = tf.io.decode_image(tf.io.read_file(image_path), channels=3, expand_animations=False)
+    img = tf.image.resize(img, MODEL_INPUT_SIZE)
+    return tf.keras.applications.mobilenet_v2.preprocess_input(img)
+
+
+def similar_pairs(features: np.ndarray, threshold: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find all pairs of images whose features are at least a threshold similar.
+    
+    faiss is an optional dependency. When it is installed, its inner-product
+    index finds the pairs. Otherwise the similarities are computed a block of
+    rows at a time, so the full N x N similarity matrix is never held in
+    memory, and each block is only compared with the images after it, so
+    every pair is computed once.
+    
+    Args:
+        features: Normalized features, one row per image
+        threshold: Similarity threshold (0-1)
+        
+    Returns:
+        The row and column indices of the similar pairs, with each pair
+        listed once and the row index first
+    """
+    features = np.ascontiguousarray(features, dtype=np.float32)
+    
+    try:
+        import faiss
+    except ImportError:
+        faiss = None
+    
+    if faiss is not None:
+        index = faiss.IndexFlatIP(features.shape[1])
+        index.add(features)
+        lims, _, neighbors = index.range_search(features, threshold)
+        rows = np.repeat(np.arange(len(features)), np.diff(lims))
+        neighbors = neighbors.astype(np.intp)
+        later = neighbors > rows
+        return rows[later], neighbors[later]
+    
+    rows, cols = [np.empty(0, dtype=np.intp)], [np.empty(0, dtype=np.intp)]
+    for start in range(0, len(features), SIMILARITY_BLOCK_ROWS):
+        # The block's rows and columns start at the same image, so the strict
+        # upper triangle holds the pairs with a later image
+        block = features[start:start + SIMILARITY_BLOCK_ROWS] @ features[start:].T
+        block_rows, block_cols = np.nonzero(np.triu(block >= threshold, k=1))
+        rows.append(block_rows + start)
+        cols.append(block_cols + start)
+    
+    return np.concatenate(rows), np.concatenate(cols)
+
+
+def connected_components(num_nodes: int, rows: np.ndarray, cols: np.ndarray) -> List[np.ndarray]:
+    """
+    Find the connected components of a graph.
+    
+    Args:
+        num_nodes: The number of nodes in the graph
+        rows: The first node of each edge
+        cols: The second node of each edge
+        
+    Returns:
+        The node indices of each component, in order of their first node
+    """
+    # Follow every edge in both directions
+    rows, cols = np.concatenate([rows, cols]), np.concatenate([cols, rows])
+    
+    # Propagate the smallest node index through each component, jumping to
+    # the label's own label to halve the remaining path every round
+    labels = np.arange(num_nodes)
+    while True:
+        new_labels = labels.copy()
+        np.minimum.at(new_labels, rows, labels[cols])
+        new_labels = new_labels[new_labels]
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+    
+    # Group the nodes by label; each label is the first node of its component
+    order = np.argsort(labels, kind="stable")
+    boundaries = np.flatnonzero(np.diff(labels[order])) + 1
+    return np.split(order, boundaries) if num_nodes else []
+
+
+def feature_cache_key(image_path: Path, model_version: str) -> str:
+    """
+    Get the feature cache key of an image file.
+    
+    The key hashes the full content of the file, so a copied or renamed
+    image reuses its cached features, together with the version of the
+    model that extracted them.
+    
+    Args:
+        image_path: Path to the image
+        model_version: Identifies the feature extraction model
+        
+    Returns:
+        The cache key as a hex string
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(image_path, "rb") as f:
+        # An empty file cannot be memory-mapped
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                digest.update(data)
+    digest.update(model_version.encode())
+    return digest.hexdigest()
 
 
 class FeatureExtractor:
@@ -21,24 +192,41 @@ class FeatureExtractor:
     Service for extracting features from images.
     """
     
-    def __init__(self, model_path: Optional[Path] = None) -> None:
+    def __init__(
+        self,
+        model_path: Optional[Path] = None,
+        jit_compile: bool = False,
+        cache_dir: Optional[Path] = None
+    ) -> None:
         """
         Initialize the FeatureExtractor.
         
         Args:
             model_path: Path to the feature extraction model
+            jit_compile: Whether to compile Keras models with XLA. This pays
+                off on GPUs, but XLA's CPU depthwise convolutions are slower
+                than TensorFlow's own kernels for MobileNetV2
+            cache_dir: Directory to cache extracted features in, or None to
+                disable caching
         """
         self.model_path = model_path
+        self.jit_compile = jit_compile
+        self.cache_dir = cache_dir
         self._model = None
+        self._backend = KERAS_BACKEND
+        self._infer = None
     
     def load_model(self) -> None:
         """Load the feature extraction model."""
         try:
+            self._infer = None
+            
             if self.model_path and self.model_path.exists():
                 # Load a saved model
-                self._model = tf.keras.models.load_model(str(self.model_path))
+                self._model, self._backend = load_saved_model(self.model_path)
             else:
                 # Use a pre-trained model
+                self._backend = KERAS_BACKEND
                 self._model = tf.keras.applications.MobileNetV2(
                     include_top=False,
                     weights="imagenet",
@@ -60,26 +248,259 @@ class FeatureExtractor:
             The extracted features as a numpy array
         """
         try:
+            return self._extract_features_batch([image_path])[0]
+        
+        except Exception as e:
+            raise ComputerVisionError(f"Failed to extract features from {image_path}: {e}")
+    
+    def extract_features_batch(self, image_paths: List[Path]) -> np.ndarray:
+        """
+        Extract features from several images with batched model calls.
+        
+        Args:
+            image_paths: Paths to the images
+            
+        Returns:
+            The normalized features, one row per image
+        """
+        try:
+            return self._extract_features_batch(image_paths)
+        
+        except Exception as e:
+            raise ComputerVisionError(f"Failed to extract features from {len(image_paths)} images: {e}")
+    
+    def extract_features_dataset(self, image_paths: List[Path]) -> np.ndarray:
+        """
+        Extract features from several images through a tf.data pipeline.
+        
+        Images are decoded and preprocessed on parallel tf.data workers and
+        prefetched, so loading the next batch overlaps with the model call.
+        Only formats TensorFlow can decode are supported (see
+        decode_and_preprocess); TIFF images raise ComputerVisionError.
+        
+        Args:
+            image_paths: Paths to the images
+            
+        Returns:
+            The normalized features, one row per image
+        """
+        try:
+            if not image_paths:
+                return np.empty((0, 0), dtype=np.float32)
+            
             # Load the model if not already loaded
             if self._model is None:
                 self.load_model()
             
-            # Load and preprocess the image
-            img = self._load_and_preprocess_image(image_path)
+            # Files are read in the per-image map, before batching
+            dataset = (
+                tf.data.Dataset.from_tensor_slices([str(path) for path in image_paths])
+                .map(decode_and_preprocess, num_parallel_calls=tf.data.AUTOTUNE)
+                .batch(FEATURE_BATCH_SIZE)
+                .prefetch(tf.data.AUTOTUNE)
+            )
             
-            # Extract features
-            features = self._model.predict(np.expand_dims(img, axis=0))
+            features = np.concatenate([
+                np.asarray(self._predict(batch.numpy())).reshape(len(batch), -1)
+                for batch in dataset
+            ])
             
-            # Flatten the features
-            features = features.flatten()
+            return normalize_rows(features)
+        
+        except Exception as e:
+            raise ComputerVisionError(f"Failed to extract features from {len(image_paths)} images: {e}")
+    
+    def _extract_features_batch(self, image_paths: List[Path]) -> np.ndarray:
+        """
+        Extract normalized features from several images, using the cache if enabled.
+        
+        Args:
+            image_paths: Paths to the images
             
-            # Normalize the features
-            features = features / np.linalg.norm(features)
+        Returns:
+            The normalized features, one row per image
+        """
+        if self.cache_dir is None or not image_paths:
+            return self._run_model(image_paths)
+        
+        model_version = self._model_version()
+        keys = [feature_cache_key(path, model_version) for path in image_paths]
+        features = [self._load_cached_features(key) for key in keys]
+        
+        # Run the model only on the images without cached features
+        misses = [i for i, cached in enumerate(features) if cached is None]
+        if misses:
+            computed = self._run_model([image_paths[i] for i in misses])
+            for i, row in zip(misses, computed):
+                features[i] = row
+                self._save_cached_features(keys[i], row)
+        
+        # Cached features are stored at reduced precision, so renormalize
+        return normalize_rows(np.stack(features))
+    
+    def _model_version(self) -> str:
+        """
+        Identify the feature extraction model for feature cache keys.
+        
+        Returns:
+            The model path and modification time, or the name of the
+            pre-trained model
+        """
+        if self.model_path and self.model_path.exists():
+            return f"{self.model_path}:{self.model_path.stat().st_mtime_ns}"
+        
+        return "mobilenet_v2_imagenet"
+    
+    def _load_cached_features(self, key: str) -> Optional[np.ndarray]:
+        """
+        Load cached features.
+        
+        Args:
+            key: The feature cache key of the image
+            
+        Returns:
+            The cached features, or None if they are not cached
+        """
+        cache_path = self.cache_dir / f"{key}.npy"
+        if not cache_path.exists():
+            return None
+        
+        try:
+            return np.load(cache_path).astype(np.float32)
+        except (OSError, ValueError):
+            # Treat a damaged cache entry as a miss so it is rebuilt
+            return None
+    
+    def _save_cached_features(self, key: str, features: np.ndarray) -> None:
+        """
+        Cache extracted features.
+        
+        Args:
+            key: The feature cache key of the image
+            features: The features to cache
+        """
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            
+            # Write to a temporary file first so concurrent readers never see
+            # a partially written entry
+            with tempfile.NamedTemporaryFile(dir=self.cache_dir, suffix=".tmp", delete=False) as f:
+                np.save(f, features.astype(CACHED_FEATURES_DTYPE))
+            os.replace(f.name, self.cache_dir / f"{key}.npy")
+        except OSError as e:
+            print(f"Warning: Failed to cache features {key}: {e}")
+    
+    def _run_model(self, image_paths: List[Path]) -> np.ndarray:
+        """
+        Extract normalized features from several images with the model.
+        
+        Args:
+            image_paths: Paths to the images
             
-            return features
+        Returns:
+            The normalized features, one row per image
+        """
+        if not image_paths:
+            return np.empty((0, 0), dtype=np.float32)
+        
+        # Load the model if not already loaded
+        if self._model is None:
+            self.load_model()
+        
+        chunks = [
+            image_paths[i:i + FEATURE_BATCH_SIZE] for i in range(0, len(image_paths), FEATURE_BATCH_SIZE)
+        ]
+        features = []
+        
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=DECODE_WORKERS,
+            thread_name_prefix="FeatureDecode",
+        ) as executor:
+            def submit(chunk_paths: List[Path]) -> List[concurrent.futures.Future]:
+                return [executor.submit(self._load_and_preprocess_image, path) for path in chunk_paths]
+            
+            pending = submit(chunks[0])
+            for index, chunk_paths in enumerate(chunks):
+                # Collect the preprocessed images into one preallocated batch
+                batch = np.empty((len(chunk_paths), *MODEL_INPUT_SIZE, 3), dtype=np.float32)
+                for i, future in enumerate(pending):
+                    batch[i] = future.result()
+                
+                # Start decoding the next batch before running this one
+                if index + 1 < len(chunks):
+                    pending = submit(chunks[index + 1])
+                
+                # Extract features, one row per image
+                features.append(np.asarray(self._predict(batch)).reshape(len(chunk_paths), -1))
+        
+        return normalize_rows(np.concatenate(features))
+    
+    def _predict(self, batch: np.ndarray) -> np.ndarray:
+        """
+        Run the feature extraction model on a batch of preprocessed images.
+        
+        Keras models run through a concrete function traced once per model,
+        which skips the per-call setup of model.predict, and optionally
+        compiled with XLA.
+        
+        Args:
+            batch: The preprocessed images, stacked along the first axis
+            
+        Returns:
+            The model output, one row per image
+        """
+        if self._backend == TFLITE_BACKEND:
+            # The interpreter's input tensor holds a single image
+            return np.concatenate([
+                run_tflite_interpreter(self._model, batch[i:i + 1]) for i in range(len(batch))
+            ])
+        if self._backend == ONNX_BACKEND:
+            return run_onnx_session(self._model, batch)
+        if not isinstance(self._model, tf.keras.Model):
+            return self._model.predict(batch, batch_size=FEATURE_BATCH_SIZE)
+        
+        if self._infer is None:
+            model = self._model
+            self._infer = tf.function(
+                lambda images: model(images, training=False),
+                input_signature=[tf.TensorSpec((None, *MODEL_INPUT_SIZE, 3), tf.float32)],
+                jit_compile=self.jit_compile,
+                autograph=False,
+            ).get_concrete_function()
+        
+        return np.concatenate([
+            self._infer(tf.constant(batch[start:start + FEATURE_BATCH_SIZE])).numpy()
+            for start in range(0, len(batch), FEATURE_BATCH_SIZE)
+        ])
+    
+    def convert_to_tflite(self, representative_paths: List[Path], output_path: Path) -> Path:
+        """
+        Convert the feature extraction model to an INT8-quantized TFLite model.
+        
+        Saving the result as feature_extraction.tflite in the model directory
+        makes ImageSimilarityService run it instead of the Keras model.
+        
+        Args:
+            representative_paths: Sample images used to calibrate the
+                quantization ranges
+            output_path: Path to save the .tflite model to
+            
+        Returns:
+            The path of the saved model
+        """
+        try:
+            # Load the model if not already loaded
+            if self._model is None:
+                self.load_model()
+            
+            if self._backend != KERAS_BACKEND:
+                raise ValueError(f"Only Keras models can be converted, not {self._backend} models")
+            
+            images = (self._load_and_preprocess_image(path) for path in representative_paths)
+            return convert_to_int8_tflite(self._model, images, output_path)
         
         except Exception as e:
-            raise ComputerVisionError(f"Failed to extract features from {image_path}: {e}")
+            raise ComputerVisionError(f"Failed to convert feature extraction model: {e}")
     
     def _load_and_preprocess_image(self, image_path: Path) -> np.ndarray:
         """
@@ -94,35 +515,241 @@ class FeatureExtractor:
         # Load the image
         img = Image.open(image_path)
         
+        # Let the JPEG decoder scale down while decoding, skipping pixels the
+        # resize would throw away; this does nothing for other formats
+        img.draft("RGB", MODEL_INPUT_SIZE)
+        
         # Resize the image
-        img = img.resize((224, 224))
+        img = img.resize(MODEL_INPUT_SIZE)
         
         # Convert to RGB if needed
         if img.mode != "RGB":
             img = img.convert("RGB")
         
-        # Convert to numpy array
-        img_array = np.array(img)
-        
-        # Preprocess for TensorFlow models
-        img_array = tf.keras.applications.mobilenet_v2.preprocess_input(img_array)
+        # Scale pixels to [-1, 1] as MobileNetV2 expects, in place on one
+        # float32 copy rather than going through the Keras preprocess_input op
+        img_array = np.asarray(img, dtype=np.float32)
+        img_array *= 1.0 / 127.5
+        img_array -= 1.0
         
         return img_array
 
 
+class FeatureIndex:
+    """
+    Persistent store of image features for a library of images.
+    
+    Features are kept as one float16 matrix in a .npy file, memory-mapped for
+    queries, with the image each row belongs to recorded in a JSON lines
+    file. An image is looked up by path and is only a hit while its size and
+    modification time are unchanged, so repeated queries over the same
+    library neither decode nor hash the image files. Each write drops the
+    rows of images that are indexed again.
+    """
+    
+    def __init__(self, index_dir: Path, model_version: str) -> None:
+        """
+        Initialize the FeatureIndex, loading any existing index.
+        
+        Args:
+            index_dir: Directory holding the index files
+            model_version: Version of the model the features come from; an
+                index built with another model is discarded
+        """
+        self.index_dir = index_dir
+        self.model_version = model_version
+        self.features: Optional[np.ndarray] = None
+        self._entries: Dict[str, Tuple[int, int, int]] = {}
+        
+        self._load()
+    
+    @property
+    def features_path(self) -> Path:
+        """Get the path of the feature matrix file."""
+        return self.index_dir / "features.f16.npy"
+    
+    @property
+    def paths_path(self) -> Path:
+        """Get the path of the indexed image list."""
+        return self.index_dir / "paths.jsonl"
+    
+    def __len__(self) -> int:
+        """Get the number of indexed images."""
+        return len(self._entries)
+    
+    def lookup(self, image_paths: List[Path]) -> np.ndarray:
+        """
+        Find the feature rows of images.
+        
+        Args:
+            image_paths: Paths to the images
+            
+        Returns:
+            The feature row of each image, or -1 for images that are not
+            indexed or have changed since they were indexed
+        """
+        rows = np.full(len(image_paths), -1, dtype=np.intp)
+        if not self._entries:
+            return rows
+        
+        for i, image_path in enumerate(image_paths):
+            entry = self._entries.get(os.path.abspath(image_path))
+            if entry is None:
+                continue
+            
+            row, size, mtime_ns = entry
+            try:
+                stat = os.stat(image_path)
+            except OSError:
+                continue
+            if stat.st_size == size and stat.st_mtime_ns == mtime_ns:
+                rows[i] = row
+        
+        return rows
+    
+    def add(self, image_paths: List[Path], features: np.ndarray) -> None:
+        """
+        Add the features of images to the index.
+        
+        Args:
+            image_paths: Paths to the images
+            features: The features of the images, one row per image
+        """
+        if not image_paths:
+            return
+        
+        try:
+            self.index_dir.mkdir(parents=True, exist_ok=True)
+            
+            entries = []
+            for image_path in image_paths:
+                stat = os.stat(image_path)
+                entries.append((os.path.abspath(image_path), stat.st_size, stat.st_mtime_ns))
+            
+            if self.features is not None and self.features.shape[1] != features.shape[1]:
+                raise ValueError(
+                    f"Feature size {features.shape[1]} does not match the index ({self.features.shape[1]})"
+                )
+            
+            # Rows of images that are being indexed again are dropped, so the
+            # index only grows with the number of distinct images
+            new_paths = {path for path, _, _ in entries}
+            kept = sorted(
+                (row, path, size, mtime_ns)
+                for path, (row, size, mtime_ns) in self._entries.items()
+                if path not in new_paths
+            )
+            kept_rows = np.array([row for row, _, _, _ in kept], dtype=np.intp)
+            
+            # Write the new matrix and image list next to the old ones and
+            # swap them in, so readers never see a partially written file
+            tmp_features_path = self.index_dir / "features.f16.tmp.npy"
+            rewritten = np.lib.format.open_memmap(
+                tmp_features_path, mode="w+", dtype=CACHED_FEATURES_DTYPE,
+                shape=(len(kept) + len(features), features.shape[1])
+            )
+            if kept:
+                rewritten[:len(kept)] = self.features[kept_rows]
+            rewritten[len(kept):] = features
+            rewritten.flush()
+            del rewritten
+            
+            entries = [(path, size, mtime_ns) for _, path, size, mtime_ns in kept] + entries
+            lines = [json.dumps({"model": self.model_version})] + [
+                json.dumps({"path": path, "size": size, "mtime_ns": mtime_ns})
+                for path, size, mtime_ns in entries
+            ]
+            tmp_paths_path = self.index_dir / "paths.tmp.jsonl"
+            with open(tmp_paths_path, "w", encoding="utf-8") as f:
+                f.write("".join(line + "\n" for line in lines))
+            
+            # The old image list is removed first, so an interrupted swap
+            # leaves an unreadable index rather than rows matched to the
+            # wrong images
+            self.features = None
+            self.paths_path.unlink(missing_ok=True)
+            os.replace(tmp_features_path, self.features_path)
+            os.replace(tmp_paths_path, self.paths_path)
+            
+            self._entries = {
+                path: (row, size, mtime_ns)
+                for row, (path, size, mtime_ns) in enumerate(entries)
+            }
+        
+        except (OSError, ValueError) as e:
+            print(f"Warning: Failed to index features of {len(image_paths)} images: {e}")
+        
+        finally:
+            self._open_features()
+    
+    def _load(self) -> None:
+        """Load the index from disk, starting empty if it is missing or stale."""
+        self._open_features()
+        if self.features is None:
+            return
+        
+        try:
+            with open(self.paths_path, encoding="utf-8") as f:
+                header = json.loads(f.readline() or "{}")
+                if header.get("model") != self.model_version:
+                    self.features = None
+                    return
+                
+                # Later entries for the same image replace earlier ones; rows
+                # past the end of the matrix are ignored
+                for row, line in enumerate(f):
+                    if row >= len(self.features):
+                        break
+                    entry = json.loads(line)
+                    self._entries[entry["path"]] = (row, entry["size"], entry["mtime_ns"])
+        
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Warning: Failed to load feature index {self.index_dir}: {e}")
+            self.features = None
+            self._entries = {}
+    
+    def _open_features(self) -> None:
+        """Memory-map the feature matrix, if there is one."""
+        self.features = None
+        if not self.features_path.exists():
+            return
+        
+        try:
+            self.features = np.load(self.features_path, mmap_mode="r")
+        except (OSError, ValueError) as e:
+            print(f"Warning: Failed to open feature index {self.features_path}: {e}")
+
+
 class SimilarityAnalyzer:
     """
     Service for analyzing similarity between images.
     """
     
-    def __init__(self, feature_extractor: Optional[FeatureExtractor] = None) -> None:
+    def __init__(
+        self,
+        feature_extractor: Optional[FeatureExtractor] = None,
+        feature_index: Optional[FeatureIndex] = None
+    ) -> None:
         """
         Initialize the SimilarityAnalyzer.
         
         Args:
             feature_extractor: The feature extractor to use
+            feature_index: Index to look up and store features in, or None to
+                extract features on every call
         """
         self.feature_extractor = feature_extractor or FeatureExtractor()
+        self.feature_index = feature_index
+    
+    def index_add(self, image_paths: List[Path]) -> None:
+        """
+        Extract and index the features of images that are not yet indexed.
+        
+        Args:
+            image_paths: Paths to the images
+        """
+        if self.feature_index is not None:
+            self._get_features(image_paths)
     
     def compute_similarity(self, image_path1: Path, image_path2: Path) -> float:
         """
@@ -137,16 +764,10 @@ class SimilarityAnalyzer:
         """
         try:
             # Extract features from both images
-            features1 = self.feature_extractor.extract_features(image_path1)
-            features2 = self.feature_extractor.extract_features(image_path2)
+            features = normalize_rows(self._get_features([image_path1, image_path2]))
             
-            # Calculate cosine similarity
-            similarity = 1 - cosine(features1, features2)
-            
-            # Ensure the similarity is between 0 and 1
-            similarity = max(0, min(1, similarity))
-            
-            return float(similarity)
+            # Calculate cosine similarity, kept between 0 and 1
+            return float(np.clip(features[0] @ features[1], 0, 1))
         
         except Exception as e:
             raise ComputerVisionError(f"Failed to compute similarity between {image_path1} and {image_path2}: {e}")
@@ -166,25 +787,22 @@ class SimilarityAnalyzer:
             A list of tuples (image_path, similarity) for similar images
         """
         try:
-            # Extract features from the target image
-            target_features = self.feature_extractor.extract_features(target_image)
-            
-            # Compare with each image
-            similar_images = []
-            for path in image_paths:
-                if path == target_image:
-                    continue
-                
-                # Extract features
-                features = self.feature_extractor.extract_features(path)
-                
-                # Calculate similarity
-                similarity = 1 - cosine(target_features, features)
-                similarity = max(0, min(1, similarity))
-                
-                # Add to results if above threshold
-                if similarity >= threshold:
-                    similar_images.append((path, similarity))
+            candidates = [path for path in image_paths if path != target_image]
+            
+            # Extract features for the target and all candidates at once
+            features = self._get_features([target_image] + candidates)
+            
+            # With normalized rows, one matrix-vector product gives the cosine
+            # similarity of every candidate to the target
+            features = normalize_rows(features)
+            similarities = np.clip(features[1:] @ features[0], 0, 1)
+            
+            # Keep the images above the threshold
+            similar_images = [
+                (path, float(similarity))
+                for path, similarity in zip(candidates, similarities)
+                if similarity >= threshold
+            ]
             
             # Sort by similarity (highest first)
             similar_images.sort(key=lambda x: x[1], reverse=True)
@@ -208,46 +826,59 @@ class SimilarityAnalyzer:
             A list of clusters, where each cluster is a list of image paths
         """
         try:
-            # Extract features for all images
-            features_map = {}
-            for path in image_paths:
-                features = self.feature_extractor.extract_features(path)
-                features_map[path] = features
-            
-            # Initialize clusters
-            clusters = []
-            remaining_images = set(image_paths)
-            
-            # Process each image
-            while remaining_images:
-                # Take the first remaining image as a seed
-                seed = next(iter(remaining_images))
-                remaining_images.remove(seed)
-                
-                # Create a new cluster with the seed
-                cluster = [seed]
-                seed_features = features_map[seed]
-                
-                # Find similar images
-                for path in list(remaining_images):
-                    features = features_map[path]
-                    
-                    # Calculate similarity
-                    similarity = 1 - cosine(seed_features, features)
-                    similarity = max(0, min(1, similarity))
-                    
-                    # Add to cluster if above threshold
-                    if similarity >= threshold:
-                        cluster.append(path)
-                        remaining_images.remove(path)
-                
-                # Add the cluster to the results
-                clusters.append(cluster)
+            # Each image is clustered once, in first-seen order
+            image_paths = list(dict.fromkeys(image_paths))
+            if not image_paths:
+                return []
+            
+            # Extract features for all images at once
+            features = normalize_rows(self._get_features(image_paths))
             
-            return clusters
+            # Link every pair of similar images and cluster the linked groups
+            rows, cols = similar_pairs(features, threshold)
+            
+            return [
+                [image_paths[i] for i in cluster]
+                for cluster in connected_components(len(image_paths), rows, cols)
+            ]
         
         except Exception as e:
             raise ComputerVisionError(f"Failed to cluster images: {e}")
+    
+    def _get_features(self, image_paths: List[Path]) -> np.ndarray:
+        """
+        Get the features of images, from the feature index where possible.
+        
+        Args:
+            image_paths: Paths to the images
+            
+        Returns:
+            The features, one row per image
+        """
+        if self.feature_index is None:
+            return self.feature_extractor.extract_features_batch(image_paths)
+        
+        rows = self.feature_index.lookup(image_paths)
+        hits = rows >= 0
+        if len(rows) and hits.all():
+            # Only the final product needs float32
+            return self.feature_index.features[rows].astype(np.float32)
+        
+        # Copy the hits out first, since adding to the index renumbers its rows
+        hit_features = self.feature_index.features[rows[hits]] if hits.any() else None
+        
+        # Extract and index each image that is not indexed yet, once
+        missing = list(dict.fromkeys(path for path, hit in zip(image_paths, hits) if not hit))
+        extracted = self.feature_extractor.extract_features_batch(missing)
+        self.feature_index.add(missing, extracted)
+        
+        positions = {path: i for i, path in enumerate(missing)}
+        features = np.empty((len(image_paths), extracted.shape[1]), dtype=np.float32)
+        features[~hits] = extracted[[positions[path] for path, hit in zip(image_paths, hits) if not hit]]
+        if hit_features is not None:
+            features[hits] = hit_features
+        
+        return features
 
 
 class ImageSimilarityService:
@@ -255,21 +886,43 @@ class ImageSimilarityService:
     Service for image similarity analysis.
     """
     
-    def __init__(self, model_dir: Optional[Path] = None) -> None:
+    def __init__(self, model_dir: Optional[Path] = None, cache_features: bool = False) -> None:
         """
         Initialize the ImageSimilarityService.
         
         Args:
             model_dir: Directory containing the feature extraction model
+            cache_features: Whether to cache extracted features under model_dir,
+                both per image and in a feature index of every image seen. Off by
+                default, since cached features are never evicted
         """
         self.model_dir = model_dir or Path.home() / ".photo_organizer" / "models"
         
         # Create feature extractor
-        model_path = self.model_dir / "feature_extraction" if self.model_dir else None
-        self.feature_extractor = FeatureExtractor(model_path=model_path)
+        model_path = find_model_path(self.model_dir, "feature_extraction") if self.model_dir else None
+        cache_dir = self.model_dir / FEATURE_CACHE_DIRNAME if cache_features else None
+        self.feature_extractor = FeatureExtractor(model_path=model_path, cache_dir=cache_dir)
+        
+        # Open the feature index
+        self.feature_index = (
+            FeatureIndex(self.model_dir / FEATURE_INDEX_DIRNAME, self.feature_extractor._model_version())
+            if cache_features else None
+        )
         
         # Create similarity analyzer
-        self.similarity_analyzer = SimilarityAnalyzer(feature_extractor=self.feature_extractor)
+        self.similarity_analyzer = SimilarityAnalyzer(
+            feature_extractor=self.feature_extractor,
+            feature_index=self.feature_index
+        )
+    
+    def index_add(self, image_paths: List[Path]) -> None:
+        """
+        Add images to the feature index, so later queries skip extraction.
+        
+        Args:
+            image_paths: Paths to the images
+        """
+        self.similarity_analyzer.index_add(image_paths)
     
     def compute_similarity(self, image_path1: Path, image_path2: Path) -> float:
         """
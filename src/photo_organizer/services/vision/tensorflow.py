@@ -13,12 +13,19 @@ import tensorflow as tf
 from PIL import Image
 
 from photo_organizer.services.vision.base import (
+    LANDMARK_NAMES,
     ComputerVisionError,
     ComputerVisionService,
     FaceInfo,
     ObjectInfo,
     SceneInfo,
 )
+from photo_organizer.services.vision.detection import top_k_above_threshold
+
+
+# Number of top object and scene predictions considered per image
+OBJECT_TOP_K = 5
+SCENE_TOP_K = 3
 
 
 class TensorFlowVisionService(ComputerVisionService):
@@ -81,38 +88,49 @@ class TensorFlowVisionService(ComputerVisionService):
             # Run inference
             predictions = self._object_detection_model.predict(np.expand_dims(image, axis=0))
             
-            # Process the predictions
-            objects = []
-            if isinstance(predictions, list):
-                # For models that return multiple outputs
-                class_probs = predictions[0][0]
-                boxes = predictions[1][0] if len(predictions) > 1 else None
-            else:
-                # For models that return a single output
-                class_probs = predictions[0]
-                boxes = None
+            return self._objects_from_predictions(predictions)
+        
+        except Exception as e:
+            raise ComputerVisionError(f"Failed to detect objects in {image_path}: {e}")
+    
+    def _objects_from_predictions(self, predictions) -> List[ObjectInfo]:
+        """
+        Turn object detection model output into detected objects.
+        
+        Args:
+            predictions: The output of the object detection model for one image
             
-            # Get the top predictions
-            top_indices = np.argsort(class_probs)[-5:]  # Top 5 predictions
+        Returns:
+            A list of detected objects
+        """
+        objects = []
+        if isinstance(predictions, list):
+            # For models that return multiple outputs
+            class_probs = predictions[0][0]
+            boxes = predictions[1][0] if len(predictions) > 1 else None
+        else:
+            # For models that return a single output
+            class_probs = predictions[0]
+            boxes = None
+        
+        # Get the top predictions above the threshold, most confident first
+        top_indices, confidences = top_k_above_threshold(
+            np.asarray(class_probs).ravel(), OBJECT_TOP_K, self.object_detection_threshold
+        )
+        
+        for idx, confidence in zip(top_indices, confidences):
+            label = self._object_labels[idx] if idx < len(self._object_labels) else f"Class_{idx}"
             
-            for idx in top_indices:
-                confidence = float(class_probs[idx])
-                if confidence >= self.object_detection_threshold:
-                    label = self._object_labels[idx] if idx < len(self._object_labels) else f"Class_{idx}"
-                    
-                    # Create bounding box if available
-                    bbox = None
-                    if boxes is not None and idx < len(boxes):
-                        # Convert from [y1, x1, y2, x2] to [x, y, width, height]
-                        y1, x1, y2, x2 = boxes[idx]
-                        bbox = (float(x1), float(y1), float(x2 - x1), float(y2 - y1))
-                    
-                    objects.append(ObjectInfo(label=label, confidence=confidence, bounding_box=bbox))
+            # Create bounding box if available
+            bbox = None
+            if boxes is not None and idx < len(boxes):
+                # Convert from [y1, x1, y2, x2] to [x, y, width, height]
+                y1, x1, y2, x2 = boxes[idx]
+                bbox = (float(x1), float(y1), float(x2 - x1), float(y2 - y1))
             
-            return objects
+            objects.append(ObjectInfo(label=label, confidence=float(confidence), bounding_box=bbox))
         
-        except Exception as e:
-            raise ComputerVisionError(f"Failed to detect objects in {image_path}: {e}")
+        return objects
     
     def detect_scenes(self, image_path: Path) -> List[SceneInfo]:
         """
@@ -135,24 +153,35 @@ class TensorFlowVisionService(ComputerVisionService):
             # Run inference
             predictions = self._scene_detection_model.predict(np.expand_dims(image, axis=0))
             
-            # Process the predictions
-            scenes = []
-            class_probs = predictions[0]
-            
-            # Get the top predictions
-            top_indices = np.argsort(class_probs)[-3:]  # Top 3 predictions
-            
-            for idx in top_indices:
-                confidence = float(class_probs[idx])
-                if confidence >= self.scene_detection_threshold:
-                    label = self._scene_labels[idx] if idx < len(self._scene_labels) else f"Scene_{idx}"
-                    scenes.append(SceneInfo(label=label, confidence=confidence))
-            
-            return scenes
+            return self._scenes_from_predictions(predictions)
         
         except Exception as e:
             raise ComputerVisionError(f"Failed to detect scenes in {image_path}: {e}")
     
+    def _scenes_from_predictions(self, predictions) -> List[SceneInfo]:
+        """
+        Turn scene detection model output into detected scenes.
+        
+        Args:
+            predictions: The output of the scene detection model for one image
+            
+        Returns:
+            A list of detected scenes
+        """
+        scenes = []
+        class_probs = predictions[0]
+        
+        # Get the top predictions above the threshold, most confident first
+        top_indices, confidences = top_k_above_threshold(
+            np.asarray(class_probs).ravel(), SCENE_TOP_K, self.scene_detection_threshold
+        )
+        
+        for idx, confidence in zip(top_indices, confidences):
+            label = self._scene_labels[idx] if idx < len(self._scene_labels) else f"Scene_{idx}"
+            scenes.append(SceneInfo(label=label, confidence=float(confidence)))
+        
+        return scenes
+    
     def detect_faces(self, image_path: Path) -> List[FaceInfo]:
         """
         Detect faces in an image using TensorFlow.
@@ -204,9 +233,8 @@ class TensorFlowVisionService(ComputerVisionService):
                     if landmarks is not None and i < len(landmarks):
                         face_landmarks = {}
                         landmark_points = landmarks[i].reshape(-1, 2)
-                        landmark_names = ["left_eye", "right_eye", "nose", "left_mouth", "right_mouth"]
                         
-                        for j, name in enumerate(landmark_names):
+                        for j, name in enumerate(LANDMARK_NAMES):
                             if j < len(landmark_points):
                                 face_landmarks[name] = (float(landmark_points[j][0]), float(landmark_points[j][1]))
                     
@@ -233,31 +261,51 @@ class TensorFlowVisionService(ComputerVisionService):
         """
         try:
             # Combine object and scene detection results to generate tags
-            objects = self.detect_objects(image_path)
-            scenes = self.detect_scenes(image_path)
-            
-            # Extract labels from objects and scenes
-            object_labels = [obj.label.lower() for obj in objects]
-            scene_labels = [scene.label.lower() for scene in scenes]
-            
-            # Combine and deduplicate tags
-            tags = list(set(object_labels + scene_labels))
+            object_predictions, scene_predictions = self._predict_heads(image_path)
+            objects = self._objects_from_predictions(object_predictions)
+            scenes = self._scenes_from_predictions(scene_predictions)
             
-            # Sort by confidence (highest first)
-            tag_confidence = {}
-            for obj in objects:
-                tag_confidence[obj.label.lower()] = obj.confidence
+            # Gather the labels and confidences of objects and scenes
+            detections = objects + scenes
+            labels = np.array([detection.label.lower() for detection in detections], dtype=object)
+            confidences = np.array([detection.confidence for detection in detections], dtype=np.float64)
             
-            for scene in scenes:
-                tag_confidence[scene.label.lower()] = scene.confidence
+            # Sort by confidence (highest first) and deduplicate, so each tag
+            # keeps its most confident position
+            order = np.argsort(-confidences, kind="stable")
             
-            tags.sort(key=lambda tag: tag_confidence.get(tag, 0), reverse=True)
-            
-            return tags
+            return list(dict.fromkeys(labels[order]))
         
         except Exception as e:
             raise ComputerVisionError(f"Failed to generate tags for {image_path}: {e}")
     
+    def _predict_heads(self, image_path: Path) -> Tuple[object, object]:
+        """
+        Run the object and scene detection models on one decoded image.
+        
+        Both models take the same 224x224 input, so the image is loaded and
+        preprocessed once for the two of them.
+        
+        Args:
+            image_path: The path to the image
+            
+        Returns:
+            A tuple of (object predictions, scene predictions)
+        """
+        # Load the models if not already loaded
+        if self._object_detection_model is None:
+            self._load_object_detection_model()
+        if self._scene_detection_model is None:
+            self._load_scene_detection_model()
+        
+        # Load and preprocess the image
+        batch = np.expand_dims(self._load_and_preprocess_image(image_path, (224, 224)), axis=0)
+        
+        return (
+            self._object_detection_model.predict(batch),
+            self._scene_detection_model.predict(batch),
+        )
+    
     def analyze_similarity(self, image_path1: Path, image_path2: Path) -> float:
         """
         Analyze the similarity between two images using TensorFlow.
@@ -436,6 +484,10 @@ class TensorFlowVisionService(ComputerVisionService):
         # Load the image
         img = Image.open(image_path)
         
+        # Let the JPEG decoder scale down while decoding, skipping pixels the
+        # resize would throw away; this does nothing for other formats
+        img.draft("RGB", target_size)
+        
         # Resize the image
         img = img.resize(target_size)
         
@@ -2,11 +2,7 @@
 Pytest configuration file for the Photo Organizer application.
 """
 
-import os
-import sys
-from pathlib import Path
-
-# Add the src directory to the Python path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+# The src directory is put on the Python path by the pythonpath setting in
+# pyproject.toml
 
 # Define fixtures here if needed
\ No newline at end of file
@@ -3,8 +3,6 @@ Test dataset for the Photo Organizer application.
 """
 
 import os
-import shutil
-import tempfile
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
@@ -107,17 +105,12 @@ class TestDataset:
 
 
 @pytest.fixture
-def test_dataset() -> Tuple[Path, Dict[str, List[Path]]]:
+def test_dataset(tmp_path: Path) -> Tuple[Path, Dict[str, List[Path]]]:
     """Create a temporary test dataset."""
-    # Create a temporary directory
-    temp_dir = Path(tempfile.mkdtemp())
+    dataset_dir = tmp_path / "dataset"
+    dataset_dir.mkdir()
     
-    try:
-        # Create test dataset
-        dataset = TestDataset.create_test_dataset(temp_dir)
-        
-        yield temp_dir, dataset
-        
-    finally:
-        # Clean up
-        shutil.rmtree(temp_dir)
\ No newline at end of file
+    # Create test dataset
+    dataset = TestDataset.create_test_dataset(dataset_dir)
+    
+    return dataset_dir, dataset
\ No newline at end of file
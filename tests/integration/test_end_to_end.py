@@ -3,8 +3,6 @@ End-to-end tests for the Photo Organizer application.
 """
 
 import os
-import shutil
-import tempfile
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
@@ -18,33 +16,22 @@ class TestEndToEnd:
     """End-to-end tests for the Photo Organizer application."""
     
     @pytest.fixture
-    def test_images_dir(self) -> Path:
+    def test_images_dir(self, tmp_path: Path) -> Path:
         """Create a temporary directory with test images."""
-        # Create a temporary directory
-        temp_dir = Path(tempfile.mkdtemp())
+        images_dir = tmp_path / "images"
+        images_dir.mkdir()
         
-        try:
-            # Create test images
-            self._create_test_images(temp_dir)
-            
-            yield temp_dir
-            
-        finally:
-            # Clean up
-            shutil.rmtree(temp_dir)
+        # Create test images
+        self._create_test_images(images_dir)
+        
+        return images_dir
     
     @pytest.fixture
-    def output_dir(self) -> Path:
+    def output_dir(self, tmp_path: Path) -> Path:
         """Create a temporary output directory."""
-        # Create a temporary directory
-        temp_dir = Path(tempfile.mkdtemp())
-        
-        try:
-            yield temp_dir
-            
-        finally:
-            # Clean up
-            shutil.rmtree(temp_dir)
+        output_dir = tmp_path / "output"
+        output_dir.mkdir()
+        return output_dir
     
     def _create_test_images(self, directory: Path) -> None:
         """
@@ -3,7 +3,6 @@ Error handling tests for the Photo Organizer application.
 """
 
 import os
-import shutil
 import tempfile
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
@@ -37,17 +36,11 @@ class TestErrorHandling:
             os.unlink(path)
     
     @pytest.fixture
-    def output_dir(self) -> Path:
+    def output_dir(self, tmp_path: Path) -> Path:
         """Create a temporary output directory."""
-        # Create a temporary directory
-        temp_dir = Path(tempfile.mkdtemp())
-        
-        try:
-            yield temp_dir
-            
-        finally:
-            # Clean up
-            shutil.rmtree(temp_dir)
+        output_dir = tmp_path / "output"
+        output_dir.mkdir()
+        return output_dir
     
     def test_corrupted_image(self, corrupted_image: Path, output_dir: Path) -> None:
         """Test handling of corrupted images."""
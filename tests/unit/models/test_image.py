@@ -9,7 +9,13 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
-from photo_organizer.models.image import GeoLocation, Image, ImageFormat, ImageMetadata
+from photo_organizer.models.image import (
+    GeoLocation,
+    Image,
+    ImageFormat,
+    ImageMetadata,
+    format_timestamp,
+)
 
 
 class TestImageFormat:
@@ -89,6 +95,23 @@ class TestImageMetadata:
         assert metadata.formatted_timestamp is None
 
 
+class TestFormatTimestamp:
+    """Tests for the format_timestamp function."""
+
+    @pytest.mark.parametrize(
+        "timestamp, expected",
+        [
+            (datetime(2025, 2, 8, 15, 15), "2/8/2025 3:15pm"),
+            (datetime(2025, 12, 31, 0, 5), "12/31/2025 12:05am"),
+            (datetime(2025, 1, 1, 12, 0), "1/1/2025 12:00pm"),
+            (datetime(2025, 7, 4, 9, 30), "7/4/2025 9:30am"),
+        ],
+    )
+    def test_format_timestamp(self, timestamp, expected) -> None:
+        """Test formatting timestamps around midnight and noon."""
+        assert format_timestamp(timestamp) == expected
+
+
 @pytest.fixture
 def mock_image_file(tmp_path) -> Path:
     """Create a mock image file for testing."""
@@ -149,6 +149,16 @@ class TestFileMappingService:
         assert mapping3.timestamp == datetime(2025, 2, 10, 8, 45)
         assert mapping3.geolocation == "Grand Canyon National Park"
 
+    def test_create_file_mappings_shares_strings(self, sample_images):
+        """Test that mappings in the same category share one category string."""
+        service = FileMappingService()
+        
+        file_mappings = service.create_file_mappings(sample_images)
+        
+        mapping1 = next(m for m in file_mappings if m.original_path == "/input/path/img1.jpg")
+        mapping2 = next(m for m in file_mappings if m.original_path == "/input/path/img2.jpg")
+        assert mapping1.category is mapping2.category
+
     def test_get_category_from_path(self):
         """Test getting a category from a path."""
         service = FileMappingService()
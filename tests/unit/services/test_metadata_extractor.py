@@ -3,8 +3,11 @@ Unit tests for the MetadataExtractor service.
 """
 
 import datetime
+import io
+import struct
+from fractions import Fraction
 from pathlib import Path
-from unittest.mock import MagicMock, mock_open, patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -47,6 +50,23 @@ class TestExifMetadataExtractor:
             assert metadata.iso == 100
             assert metadata.focal_length == 50.0
 
+    def test_extract_metadata_timestamp_only(self) -> None:
+        """Test extracting only the timestamp from an image file."""
+        extractor = ExifMetadataExtractor()
+        
+        timestamp = datetime.datetime(2025, 2, 8, 15, 15)
+        
+        with patch.object(extractor, "extract_timestamp", return_value=timestamp), \
+             patch.object(extractor, "extract_geolocation") as mock_geolocation, \
+             patch.object(extractor, "_extract_camera_info") as mock_camera_info:
+            metadata = extractor.extract_metadata(Path("test.jpg"), want={"timestamp"})
+            
+            assert metadata.timestamp == timestamp
+            assert metadata.geolocation is None
+            assert metadata.camera_make is None
+            mock_geolocation.assert_not_called()
+            mock_camera_info.assert_not_called()
+
     def test_extract_metadata_error(self) -> None:
         """Test extracting metadata with an error."""
         extractor = ExifMetadataExtractor()
@@ -62,13 +82,12 @@ class TestExifMetadataExtractor:
         """Test extracting a timestamp from an image file."""
         extractor = ExifMetadataExtractor()
         
-        # Mock exifread.process_file to return tags with a timestamp
+        # Mock _read_tags to return tags with a timestamp
         mock_tags = {
             "EXIF DateTimeOriginal": "2025:02:08 15:15:00"
         }
         
-        with patch("exifread.process_file", return_value=mock_tags), \
-             patch("builtins.open", mock_open()):
+        with patch.object(extractor, "_read_tags", return_value=mock_tags):
             timestamp = extractor.extract_timestamp(Path("test.jpg"))
             
             assert timestamp == datetime.datetime(2025, 2, 8, 15, 15)
@@ -77,13 +96,12 @@ class TestExifMetadataExtractor:
         """Test extracting a timestamp with fallback tags."""
         extractor = ExifMetadataExtractor()
         
-        # Mock exifread.process_file to return tags with a timestamp in a different tag
+        # Mock _read_tags to return tags with a timestamp in a different tag
         mock_tags = {
             "Image DateTime": "2025:02:08 15:15:00"
         }
         
-        with patch("exifread.process_file", return_value=mock_tags), \
-             patch("builtins.open", mock_open()):
+        with patch.object(extractor, "_read_tags", return_value=mock_tags):
             timestamp = extractor.extract_timestamp(Path("test.jpg"))
             
             assert timestamp == datetime.datetime(2025, 2, 8, 15, 15)
@@ -92,9 +110,8 @@ class TestExifMetadataExtractor:
         """Test extracting a timestamp with no timestamp tags."""
         extractor = ExifMetadataExtractor()
         
-        # Mock exifread.process_file to return empty tags
-        with patch("exifread.process_file", return_value={}), \
-             patch("builtins.open", mock_open()):
+        # Mock _read_tags to return empty tags
+        with patch.object(extractor, "_read_tags", return_value={}):
             timestamp = extractor.extract_timestamp(Path("test.jpg"))
             
             assert timestamp is None
@@ -103,8 +120,8 @@ class TestExifMetadataExtractor:
         """Test extracting a timestamp with an error."""
         extractor = ExifMetadataExtractor()
         
-        # Mock open to raise an exception
-        with patch("builtins.open", side_effect=IOError("Test error")), \
+        # Mock _read_tags to raise an exception
+        with patch.object(extractor, "_read_tags", side_effect=IOError("Test error")), \
              patch("builtins.print"):  # Suppress print output
             timestamp = extractor.extract_timestamp(Path("test.jpg"))
             
@@ -114,7 +131,7 @@ class TestExifMetadataExtractor:
         """Test extracting geolocation data from an image file."""
         extractor = ExifMetadataExtractor()
         
-        # Mock exifread.process_file to return tags with GPS data
+        # Mock _read_tags to return tags with GPS data
         mock_tags = {
             "GPS GPSLatitude": "[38, 53, 51.72]",
             "GPS GPSLatitudeRef": "N",
@@ -122,8 +139,7 @@ class TestExifMetadataExtractor:
             "GPS GPSLongitudeRef": "W"
         }
         
-        with patch("exifread.process_file", return_value=mock_tags), \
-             patch("builtins.open", mock_open()):
+        with patch.object(extractor, "_read_tags", return_value=mock_tags):
             geolocation = extractor.extract_geolocation(Path("test.jpg"))
             
             assert geolocation is not None
@@ -134,9 +150,8 @@ class TestExifMetadataExtractor:
         """Test extracting geolocation data with no GPS tags."""
         extractor = ExifMetadataExtractor()
         
-        # Mock exifread.process_file to return empty tags
-        with patch("exifread.process_file", return_value={}), \
-             patch("builtins.open", mock_open()):
+        # Mock _read_tags to return empty tags
+        with patch.object(extractor, "_read_tags", return_value={}):
             geolocation = extractor.extract_geolocation(Path("test.jpg"))
             
             assert geolocation is None
@@ -145,8 +160,8 @@ class TestExifMetadataExtractor:
         """Test extracting geolocation data with an error."""
         extractor = ExifMetadataExtractor()
         
-        # Mock open to raise an exception
-        with patch("builtins.open", side_effect=IOError("Test error")), \
+        # Mock _read_tags to raise an exception
+        with patch.object(extractor, "_read_tags", side_effect=IOError("Test error")), \
              patch("builtins.print"):  # Suppress print output
             geolocation = extractor.extract_geolocation(Path("test.jpg"))
             
@@ -191,6 +206,16 @@ class TestExifMetadataExtractor:
         
         assert degrees == 38.0
 
+    def test_convert_to_degrees_tag_values(self) -> None:
+        """Test converting GPS coordinates from parsed exifread rationals."""
+        extractor = ExifMetadataExtractor()
+        
+        # exifread tags expose the parsed rationals through their values
+        value = MagicMock(values=[Fraction(38), Fraction(53), Fraction(5172, 100)])
+        degrees = extractor._convert_to_degrees(value)
+        
+        assert abs(degrees - 38.8977) < 0.001
+
     def test_parse_rational(self) -> None:
         """Test parsing a rational number string."""
         extractor = ExifMetadataExtractor()
@@ -208,7 +233,7 @@ class TestExifMetadataExtractor:
         """Test extracting camera information from an image file."""
         extractor = ExifMetadataExtractor()
         
-        # Mock exifread.process_file to return tags with camera info
+        # Mock _read_tags to return tags with camera info
         mock_tags = {
             "Image Make": "Canon",
             "Image Model": "EOS R5",
@@ -218,8 +243,7 @@ class TestExifMetadataExtractor:
             "EXIF FocalLength": "50"
         }
         
-        with patch("exifread.process_file", return_value=mock_tags), \
-             patch("builtins.open", mock_open()):
+        with patch.object(extractor, "_read_tags", return_value=mock_tags):
             camera_info = extractor._extract_camera_info(Path("test.jpg"))
             
             assert camera_info is not None
@@ -234,9 +258,8 @@ class TestExifMetadataExtractor:
         """Test extracting camera information with no camera tags."""
         extractor = ExifMetadataExtractor()
         
-        # Mock exifread.process_file to return empty tags
-        with patch("exifread.process_file", return_value={}), \
-             patch("builtins.open", mock_open()):
+        # Mock _read_tags to return empty tags
+        with patch.object(extractor, "_read_tags", return_value={}):
             camera_info = extractor._extract_camera_info(Path("test.jpg"))
             
             assert camera_info is None
@@ -245,9 +268,73 @@ class TestExifMetadataExtractor:
         """Test extracting camera information with an error."""
         extractor = ExifMetadataExtractor()
         
-        # Mock open to raise an exception
-        with patch("builtins.open", side_effect=IOError("Test error")), \
+        # Mock _read_tags to raise an exception
+        with patch.object(extractor, "_read_tags", side_effect=IOError("Test error")), \
              patch("builtins.print"):  # Suppress print output
             camera_info = extractor._extract_camera_info(Path("test.jpg"))
             
-            assert camera_info is None
\ No newline at end of file
+            assert camera_info is None
+
+    def test_extract_metadata_batch(self) -> None:
+        """Test extracting metadata from several image files at once."""
+        extractor = ExifMetadataExtractor()
+        
+        # Mock _process_exif to return tags with a timestamp and camera info
+        mock_tags = {
+            "EXIF DateTimeOriginal": "2025:02:08 15:15:00",
+            "Image Make": "Canon"
+        }
+        paths = [Path("a.jpg"), Path("b.jpg")]
+        
+        with patch.object(extractor, "_prefetch_exif", return_value=b"data"), \
+             patch.object(extractor, "_process_exif", return_value=mock_tags):
+            results = extractor.extract_metadata_batch(paths)
+            
+            assert set(results) == set(paths)
+            for metadata in results.values():
+                assert metadata.timestamp == datetime.datetime(2025, 2, 8, 15, 15)
+                assert metadata.camera_make == "Canon"
+                assert metadata.geolocation is None
+
+    def test_extract_metadata_batch_error(self) -> None:
+        """Test that unreadable files are omitted from batch results."""
+        extractor = ExifMetadataExtractor()
+        
+        with patch.object(extractor, "_prefetch_exif", side_effect=IOError("Test error")), \
+             patch("builtins.print"):  # Suppress print output
+            results = extractor.extract_metadata_batch([Path("test.jpg")])
+            
+            assert results == {}
+
+    def test_locate_app1_jpeg(self) -> None:
+        """Test locating the EXIF APP1 segment of a JPEG file."""
+        extractor = ExifMetadataExtractor()
+        
+        # Minimal JPEG: SOI, an APP0 segment, the EXIF APP1 segment, then SOS
+        tiff = b"II*\x00\x08\x00\x00\x00"
+        app0 = b"\xff\xe0" + struct.pack(">H", 6) + b"JFIF"
+        app1 = b"\xff\xe1" + struct.pack(">H", 2 + 6 + len(tiff)) + b"Exif\x00\x00" + tiff
+        jpeg = b"\xff\xd8" + app0 + app1 + b"\xff\xda\x00\x02"
+        
+        assert extractor._locate_exif_block(io.BytesIO(jpeg)) == tiff
+        
+        # No APP1 segment before the image data
+        jpeg = b"\xff\xd8" + app0 + b"\xff\xda\x00\x02"
+        assert extractor._locate_exif_block(io.BytesIO(jpeg)) is None
+
+    def test_locate_png_exif(self) -> None:
+        """Test locating the eXIf chunk of a PNG file."""
+        extractor = ExifMetadataExtractor()
+        
+        tiff = b"MM\x00*\x00\x00\x00\x08"
+        ihdr = struct.pack(">I4s", 13, b"IHDR") + b"\x00" * 13 + b"\x00" * 4
+        exif = struct.pack(">I4s", len(tiff), b"eXIf") + tiff + b"\x00" * 4
+        png = b"\x89PNG\r\n\x1a\n" + ihdr + exif
+        
+        assert extractor._locate_exif_block(io.BytesIO(png)) == tiff
+
+    def test_locate_exif_block_unknown_format(self) -> None:
+        """Test that unknown containers fall back to a full-file parse."""
+        extractor = ExifMetadataExtractor()
+        
+        assert extractor._locate_exif_block(io.BytesIO(b"GIF89a\x00\x00")) is None
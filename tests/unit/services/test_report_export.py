@@ -160,4 +160,28 @@ class TestReportExportService:
         service = ReportExportService()
         
         with pytest.raises(ValueError):
-            service.export_report(sample_report, "UNSUPPORTED", "/output/report.txt")
\ No newline at end of file
+            service.export_report(sample_report, "UNSUPPORTED", "/output/report.txt")
+
+    def test_append_folder_structure_html(self, sample_folder_structure):
+        """Test rendering a nested folder structure into a single list of lines."""
+        service = ReportExportService()
+        
+        lines = []
+        service._append_folder_structure_html(sample_folder_structure, lines)
+        
+        assert lines[0] == "  <div class='folder'>"
+        assert lines[-1] == "  </div>"
+        assert lines.count("  <div class='folder'>") == 4
+        assert lines.count("  </div>") == 4
+        assert lines.index("    <h3>Beach/</h3>") < lines.index("    <h3>Mountains/</h3>")
+        assert "      <li class='file'>beach1.jpg</li>" in lines
+
+    def test_export_report_matches_formatted_content(self, sample_report, tmp_path):
+        """Test that chunked export writes exactly the formatted report."""
+        service = ReportExportService()
+        
+        output_path = tmp_path / "report.html"
+        with patch("photo_organizer.services.report_export.REPORT_WRITE_CHUNK_LINES", 7):
+            service.export_report(sample_report, ReportFormat.HTML, str(output_path))
+        
+        assert output_path.read_text(encoding="utf-8") == service._format_report_html(sample_report)
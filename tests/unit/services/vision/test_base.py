@@ -2,13 +2,22 @@
 Unit tests for the base computer vision service.
 """
 
+import copy
+import pickle
+from dataclasses import FrozenInstanceError, asdict
+
+import numpy as np
 import pytest
 
 from photo_organizer.services.vision.base import (
+    DETECTION_DTYPE,
+    LANDMARK_NAMES,
     ComputerVisionError,
+    FaceBatch,
     FaceInfo,
     ObjectInfo,
     SceneInfo,
+    as_object_infos,
 )
 
 
@@ -30,6 +39,29 @@ class TestObjectInfo:
         assert obj.confidence == 0.85
         assert obj.bounding_box == bbox
 
+    def test_frozen(self) -> None:
+        """Test that ObjectInfo objects are immutable and hashable."""
+        obj = ObjectInfo(label="cat", confidence=0.95)
+        
+        with pytest.raises(FrozenInstanceError):
+            obj.label = "dog"
+        
+        assert len({obj, ObjectInfo(label="cat", confidence=0.95)}) == 1
+
+
+class TestAsObjectInfos:
+    """Tests for the as_object_infos function."""
+
+    def test_as_object_infos(self) -> None:
+        """Test converting a detection array to ObjectInfo objects."""
+        detections = np.array([("cat", 0.5), ("dog", 0.25)], dtype=DETECTION_DTYPE)
+        
+        assert as_object_infos(detections) == [
+            ObjectInfo(label="cat", confidence=0.5),
+            ObjectInfo(label="dog", confidence=0.25),
+        ]
+        assert as_object_infos(np.empty(0, dtype=DETECTION_DTYPE)) == []
+
 
 class TestSceneInfo:
     """Tests for the SceneInfo class."""
@@ -65,6 +97,23 @@ class TestFaceInfo:
         assert face.confidence == 0.9
         assert face.bounding_box == bbox
         assert face.landmarks == landmarks
+        assert face.landmarks_array.shape == (len(LANDMARK_NAMES), 2)
+        assert tuple(face.landmarks_array[0]) == (15.0, 25.0)
+
+    def test_hash_with_landmarks(self) -> None:
+        """Test hashing a FaceInfo object with landmarks."""
+        bbox = (10.0, 20.0, 30.0, 40.0)
+        landmarks = {"left_eye": (15.0, 25.0), "nose": (25.0, 30.0)}
+        face = FaceInfo(confidence=0.9, bounding_box=bbox, landmarks=landmarks)
+        same_face = FaceInfo(confidence=0.9, bounding_box=bbox, landmarks=dict(landmarks))
+        
+        assert hash(face) == hash(same_face)
+        assert len({face, same_face}) == 1
+        
+        # Faces with landmarks can still be copied and pickled
+        assert pickle.loads(pickle.dumps(face)) == face
+        assert copy.deepcopy(face) == face
+        assert asdict(face)["landmarks"] == landmarks
 
 
 class TestComputerVisionError:
@@ -73,4 +122,46 @@ class TestComputerVisionError:
     def test_init(self) -> None:
         """Test initializing a ComputerVisionError object."""
         error = ComputerVisionError("Test error")
-        assert str(error) == "Test error"
\ No newline at end of file
+        assert str(error) == "Test error"
+
+
+class TestFaceBatch:
+    """Tests for the FaceBatch class."""
+
+    def test_from_faces(self) -> None:
+        """Test creating a FaceBatch from detected faces."""
+        landmarks = {
+            "left_eye": (15.0, 25.0),
+            "right_eye": (35.0, 25.0),
+            "nose": (25.0, 30.0),
+            "left_mouth": (20.0, 40.0),
+            "right_mouth": (30.0, 40.0)
+        }
+        faces = [
+            FaceInfo(confidence=0.9, bounding_box=(10.0, 20.0, 30.0, 40.0), landmarks=landmarks),
+            FaceInfo(confidence=0.8, bounding_box=(50.0, 60.0, 70.0, 80.0)),
+        ]
+        
+        batch = FaceBatch.from_faces(faces)
+        
+        assert len(batch) == 2
+        assert batch.confidences.shape == (2,)
+        assert batch.bounding_boxes.shape == (2, 4)
+        assert batch.landmarks.shape == (2, len(LANDMARK_NAMES), 2)
+        assert batch.landmarks.dtype == np.float32
+        assert tuple(batch.landmarks[0][LANDMARK_NAMES.index("nose")]) == (25.0, 30.0)
+        assert np.isnan(batch.landmarks[1]).all()
+        
+        # Round trip back to FaceInfo objects
+        assert batch.to_faces() == [
+            FaceInfo(confidence=pytest.approx(0.9), bounding_box=(10.0, 20.0, 30.0, 40.0), landmarks=landmarks),
+            FaceInfo(confidence=pytest.approx(0.8), bounding_box=(50.0, 60.0, 70.0, 80.0)),
+        ]
+
+    def test_from_faces_empty(self) -> None:
+        """Test creating a FaceBatch from no faces."""
+        batch = FaceBatch.from_faces([])
+        
+        assert len(batch) == 0
+        assert batch.bounding_boxes.shape == (0, 4)
+        assert batch.to_faces() == []
@@ -2,23 +2,147 @@
 Unit tests for the object and scene detection services.
 """
 
+import os
+import subprocess
+import sys
+import threading
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
 
 import numpy as np
 import pytest
+import tensorflow as tf
+from PIL import Image
 
-from photo_organizer.services.vision.base import ComputerVisionError, ObjectInfo, SceneInfo
+from photo_organizer.services.vision.base import (
+    DETECTION_DTYPE,
+    ComputerVisionError,
+    ObjectInfo,
+    SceneInfo,
+)
 from photo_organizer.services.vision.detection import (
     DetectionService,
     ObjectDetector,
     SceneDetector,
+    preprocess_cache_key,
+    run_tflite_interpreter,
+    top_k_above_threshold,
 )
 
 
+@pytest.fixture(autouse=True)
+def clear_model_caches():
+    """Make every test load its models instead of reusing cached ones."""
+    ObjectDetector._MODEL_CACHE.clear()
+    SceneDetector._MODEL_CACHE.clear()
+    yield
+    ObjectDetector._MODEL_CACHE.clear()
+    SceneDetector._MODEL_CACHE.clear()
+
+
+@pytest.fixture(scope="module")
+def tiny_jpeg(tmp_path_factory):
+    """Create a small black JPEG image shared by the tests in this module."""
+    path = tmp_path_factory.mktemp("images") / "tiny.jpg"
+    Image.fromarray(np.zeros((32, 32, 3), dtype=np.uint8)).save(path, "JPEG", quality=10)
+    return path
+
+
+@pytest.fixture(scope="module")
+def object_detector():
+    """Create an ObjectDetector shared by the tests in this module."""
+    return ObjectDetector()
+
+
+@pytest.fixture(scope="module")
+def scene_detector():
+    """Create a SceneDetector shared by the tests in this module."""
+    return SceneDetector()
+
+
+@pytest.fixture(scope="module")
+def detection_service(tmp_path_factory):
+    """Create a DetectionService shared by the tests in this module."""
+    return DetectionService(
+        model_dir=tmp_path_factory.mktemp("models"),
+        shared_backbone=True
+    )
+
+
+def make_mock_interpreter(output: np.ndarray) -> Mock:
+    """Create a mock uint8-quantized TFLite interpreter returning an output."""
+    interpreter = Mock(spec_set=[
+        "allocate_tensors", "get_input_details", "get_output_details", "set_tensor", "invoke", "get_tensor"
+    ])
+    interpreter.get_input_details.return_value = [
+        {"index": 0, "dtype": np.uint8, "quantization": (1.0 / 128, 128)}
+    ]
+    interpreter.get_output_details.return_value = [
+        {"index": 1, "dtype": np.uint8, "quantization": (1.0 / 255, 0)}
+    ]
+    interpreter.get_tensor.return_value = output
+    return interpreter
+
+
+class TestLazyImport:
+    """Tests for importing the detection module without TensorFlow."""
+
+    def test_no_tf_import_at_module_load(self) -> None:
+        """Test that importing the detection module does not import TensorFlow."""
+        src_dir = Path(__file__).parents[4] / "src"
+        code = (
+            "import sys\n"
+            f"sys.path.insert(0, {str(src_dir)!r})\n"
+            "import photo_organizer.services.vision.detection\n"
+            "assert 'tensorflow' not in sys.modules\n"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+
+class TestRunTfliteInterpreter:
+    """Tests for the run_tflite_interpreter function."""
+
+    def test_quantizes_input_and_dequantizes_output(self) -> None:
+        """Test that float values are converted to and from uint8."""
+        interpreter = make_mock_interpreter(np.array([[0, 255]], dtype=np.uint8))
+        
+        batch = np.array([[-1.0, 0.0, 1.0]], dtype=np.float32)
+        output = run_tflite_interpreter(interpreter, batch)
+        
+        index, quantized = interpreter.set_tensor.call_args[0]
+        assert index == 0
+        assert quantized.dtype == np.uint8
+        assert quantized.tolist() == [[0, 128, 255]]
+        interpreter.invoke.assert_called_once()
+        interpreter.get_tensor.assert_called_once_with(1)
+        assert output.dtype == np.float32
+        assert output.tolist() == [[0.0, 1.0]]
+
+
+class TestTopKAboveThreshold:
+    """Tests for the top_k_above_threshold function."""
+
+    def test_top_k_above_threshold(self) -> None:
+        """Test selecting the most confident classes above a threshold."""
+        probs = np.array([0.1, 0.2, 0.9, 0.3, 0.8], dtype=np.float32)
+        
+        indices, values = top_k_above_threshold(probs, 10, 0.5)
+        assert indices.tolist() == [2, 4]
+        np.testing.assert_allclose(values, [0.9, 0.8])
+        
+        indices, values = top_k_above_threshold(probs, 1, 0.5)
+        assert indices.tolist() == [2]
+        
+        indices, values = top_k_above_threshold(probs, 0, 0.5)
+        assert len(indices) == 0 and len(values) == 0
+
+
 class TestObjectDetector:
     """Tests for the ObjectDetector class."""
 
+    pytestmark = pytest.mark.heavy
+
     def test_init(self, tmp_path) -> None:
         """Test initializing the detector."""
         # Test with default parameters
@@ -72,6 +196,98 @@ class TestObjectDetector:
         mock_mobilenet.assert_called_once_with(weights="imagenet")
         assert len(detector._labels) > 0
 
+    @patch.object(tf.lite, "Interpreter")
+    def test_load_model_tflite(self, mock_interpreter, tmp_path) -> None:
+        """Test loading a quantized TFLite model."""
+        model_path = tmp_path / "object_detection.tflite"
+        model_path.touch()
+        
+        detector = ObjectDetector(model_path=model_path)
+        detector.load_model()
+        
+        mock_interpreter.assert_called_once_with(model_path=str(model_path), num_threads=os.cpu_count())
+        mock_interpreter.return_value.allocate_tensors.assert_called_once()
+        assert detector._model is mock_interpreter.return_value
+        assert detector._backend == "tflite"
+        assert len(detector._labels) > 0
+
+    def test_load_model_onnx(self, tmp_path) -> None:
+        """Test loading an ONNX model into an ONNX Runtime session."""
+        model_path = tmp_path / "object_detection.onnx"
+        model_path.touch()
+        
+        mock_onnxruntime = Mock(spec_set=["SessionOptions", "GraphOptimizationLevel", "InferenceSession"])
+        with patch.dict(sys.modules, {"onnxruntime": mock_onnxruntime}):
+            detector = ObjectDetector(model_path=model_path)
+            detector.load_model()
+        
+        mock_onnxruntime.InferenceSession.assert_called_once_with(
+            str(model_path),
+            sess_options=mock_onnxruntime.SessionOptions.return_value,
+            providers=["CPUExecutionProvider"]
+        )
+        assert (
+            mock_onnxruntime.SessionOptions.return_value.graph_optimization_level
+            == mock_onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        )
+        assert detector._model is mock_onnxruntime.InferenceSession.return_value
+        assert detector._backend == "onnx"
+
+    @patch("photo_organizer.services.vision.detection.ObjectDetector._load_and_preprocess_image")
+    def test_detect_onnx(self, mock_preprocess, object_detector, monkeypatch, tmp_path) -> None:
+        """Test detecting objects with an ONNX Runtime session."""
+        mock_preprocess.return_value = np.zeros((224, 224, 3))
+        
+        session = Mock(spec_set=["get_inputs", "run"])
+        session.get_inputs.return_value = [SimpleNamespace(name="input_1")]
+        session.run.return_value = [np.array([[0.1, 0.2, 0.9, 0.3, 0.8]], dtype=np.float32)]
+        
+        monkeypatch.setattr(object_detector, "_model", session)
+        monkeypatch.setattr(object_detector, "_backend", "onnx")
+        monkeypatch.setattr(object_detector, "_labels", ["background", "person", "cat", "dog", "car"])
+        
+        objects = object_detector.detect(tmp_path / "test.jpg")
+        
+        output_names, feeds = session.run.call_args[0]
+        assert output_names is None
+        assert feeds["input_1"].dtype == np.float32
+        assert feeds["input_1"].shape == (1, 224, 224, 3)
+        assert [obj.label for obj in objects] == ["cat", "car"]
+
+    def test_load_model_onnx_not_installed(self, tmp_path) -> None:
+        """Test loading an ONNX model without onnxruntime installed."""
+        model_path = tmp_path / "object_detection.onnx"
+        model_path.touch()
+        
+        detector = ObjectDetector(model_path=model_path)
+        with patch.dict(sys.modules, {"onnxruntime": None}):
+            with pytest.raises(ComputerVisionError) as excinfo:
+                detector.load_model()
+        
+        assert "Failed to load object detection model" in str(excinfo.value)
+
+    @patch("tensorflow.keras.applications.MobileNetV2")
+    def test_load_model_cached(self, mock_mobilenet) -> None:
+        """Test that detectors share a loaded model."""
+        first = ObjectDetector()
+        first.load_model()
+        second = ObjectDetector()
+        second.load_model()
+        
+        mock_mobilenet.assert_called_once_with(weights="imagenet")
+        assert second._model is first._model
+
+    @patch.object(tf.lite, "Interpreter")
+    def test_load_model_tflite_not_cached(self, mock_interpreter, tmp_path) -> None:
+        """Test that each detector gets its own TFLite interpreter."""
+        model_path = tmp_path / "object_detection.tflite"
+        model_path.touch()
+        
+        ObjectDetector(model_path=model_path).load_model()
+        ObjectDetector(model_path=model_path).load_model()
+        
+        assert mock_interpreter.call_count == 2
+
     @patch("tensorflow.keras.models.load_model")
     def test_load_model_error(self, mock_load_model) -> None:
         """Test loading a model with an error."""
@@ -87,13 +303,11 @@ class TestObjectDetector:
         
         assert "Failed to load object detection model" in str(excinfo.value)
 
-    @patch("tensorflow.keras.models.load_model")
     @patch("photo_organizer.services.vision.detection.ObjectDetector._load_and_preprocess_image")
-    def test_detect(self, mock_preprocess, mock_load_model, tmp_path) -> None:
+    def test_detect(self, mock_preprocess, tmp_path) -> None:
         """Test detecting objects in an image."""
         # Create a mock model
-        mock_model = MagicMock()
-        mock_load_model.return_value = mock_model
+        mock_model = Mock(spec_set=["predict"])
         
         # Mock the model prediction
         mock_predictions = [
@@ -104,8 +318,9 @@ class TestObjectDetector:
         # Mock image preprocessing
         mock_preprocess.return_value = np.zeros((224, 224, 3))
         
-        # Create the detector
+        # Create the detector with the mock model already loaded
         detector = ObjectDetector()
+        detector._model = mock_model
         
         # Mock the object labels
         detector._labels = ["background", "person", "cat", "dog", "car"]
@@ -124,6 +339,85 @@ class TestObjectDetector:
         assert objects[1].label == "car"
         assert objects[1].confidence == 0.8
 
+    @patch("photo_organizer.services.vision.detection.ObjectDetector._load_and_preprocess_image")
+    def test_detect_array(self, mock_preprocess, object_detector, monkeypatch, tmp_path) -> None:
+        """Test detecting objects in an image as a structured array."""
+        mock_preprocess.return_value = np.zeros((224, 224, 3))
+        
+        model = Mock(spec_set=["predict"])
+        model.predict.return_value = np.array([[0.1, 0.2, 0.9, 0.3, 0.8]])
+        monkeypatch.setattr(object_detector, "_model", model)
+        monkeypatch.setattr(object_detector, "_labels", ["background", "person", "cat", "dog"])
+        
+        detections = object_detector.detect_array(tmp_path / "test.jpg")
+        
+        assert detections.dtype == DETECTION_DTYPE
+        assert list(detections["label"]) == ["cat", "Class_4"]
+        np.testing.assert_allclose(detections["confidence"], [0.9, 0.8])
+        
+        # Detections below the threshold give an empty array
+        monkeypatch.setattr(object_detector, "confidence_threshold", 0.95)
+        assert len(object_detector.detect_array(tmp_path / "test.jpg")) == 0
+
+    @patch("photo_organizer.services.vision.detection.ObjectDetector._load_and_preprocess_image")
+    def test_detect_top_k(self, mock_preprocess, object_detector, monkeypatch, tmp_path) -> None:
+        """Test that only the most confident detections are returned, in order."""
+        mock_preprocess.return_value = np.zeros((224, 224, 3))
+        
+        class_probs = np.zeros(1000)
+        class_probs[[7, 42, 500, 999]] = [0.6, 0.95, 0.4, 0.8]
+        
+        model = Mock(spec_set=["predict"])
+        model.predict.return_value = np.array([class_probs])
+        monkeypatch.setattr(object_detector, "_model", model)
+        monkeypatch.setattr(object_detector, "_labels", ["person", "cat"])
+        monkeypatch.setattr(object_detector, "max_detections", 2)
+        
+        objects = object_detector.detect(tmp_path / "test.jpg")
+        
+        # Labels beyond the label list fall back to the class index
+        assert [obj.label for obj in objects] == ["Class_42", "Class_999"]
+        assert [obj.confidence for obj in objects] == [0.95, 0.8]
+        
+        # Detections below the threshold are dropped even within the top k
+        monkeypatch.setattr(object_detector, "max_detections", 2000)
+        objects = object_detector.detect(tmp_path / "test.jpg")
+        assert [obj.label for obj in objects] == ["Class_42", "Class_999", "Class_7"]
+
+    def test_classify_prediction_row(self, object_detector, monkeypatch) -> None:
+        """Test classifying a (1, num_classes) prediction row and a zero detection limit."""
+        class_probs = np.zeros((1, 1000), dtype=np.float32)
+        class_probs[0, [1, 3]] = [0.75, 0.5]
+        monkeypatch.setattr(object_detector, "_labels", ["person", "cat", "dog", "car"])
+        
+        objects = object_detector.classify(class_probs)
+        assert [obj.label for obj in objects] == ["cat", "car"]
+        assert [obj.confidence for obj in objects] == [0.75, 0.5]
+        
+        monkeypatch.setattr(object_detector, "max_detections", 0)
+        assert object_detector.classify(class_probs) == []
+
+    @patch.object(tf.lite, "Interpreter")
+    @patch("photo_organizer.services.vision.detection.ObjectDetector._load_and_preprocess_image")
+    def test_detect_tflite(self, mock_preprocess, mock_interpreter, tmp_path) -> None:
+        """Test detecting objects with a quantized TFLite model."""
+        model_path = tmp_path / "object_detection.tflite"
+        model_path.touch()
+        
+        interpreter = make_mock_interpreter(np.array([[25, 51, 230, 76, 204]], dtype=np.uint8))
+        mock_interpreter.return_value = interpreter
+        mock_preprocess.return_value = np.zeros((224, 224, 3))
+        
+        detector = ObjectDetector(model_path=model_path)
+        detector.load_model()
+        detector._labels = ["background", "person", "cat", "dog", "car"]
+        
+        objects = detector.detect(tmp_path / "test.jpg")
+        
+        interpreter.invoke.assert_called_once()
+        assert [obj.label for obj in objects] == ["cat", "car"]
+        assert objects[0].confidence == pytest.approx(230 / 255)
+
     @patch("tensorflow.keras.models.load_model")
     @patch("photo_organizer.services.vision.detection.ObjectDetector._load_and_preprocess_image")
     def test_detect_error(self, mock_preprocess, mock_load_model, tmp_path) -> None:
@@ -143,51 +437,104 @@ class TestObjectDetector:
         
         assert "Failed to detect objects" in str(excinfo.value)
 
-    def test_load_and_preprocess_image(self, tmp_path) -> None:
+    def test_load_and_preprocess_image(self, tiny_jpeg, object_detector) -> None:
         """Test loading and preprocessing an image."""
-        # This test would require a real image file, so we'll mock it
-        detector = ObjectDetector()
+        result = object_detector._load_and_preprocess_image(tiny_jpeg)
         
-        with patch("PIL.Image.open") as mock_open, \
-             patch("numpy.array") as mock_array, \
-             patch("tensorflow.keras.applications.mobilenet_v2.preprocess_input") as mock_preprocess:
-            
-            # Mock the image operations
-            mock_img = MagicMock()
-            mock_img.mode = "RGB"
-            mock_img.resize.return_value = mock_img
-            mock_open.return_value = mock_img
-            
-            mock_array.return_value = np.zeros((224, 224, 3))
-            mock_preprocess.return_value = np.zeros((224, 224, 3))
-            
-            # Call the method
-            image_path = tmp_path / "test.jpg"
-            result = detector._load_and_preprocess_image(image_path)
-            
-            # Check that the operations were performed
-            mock_open.assert_called_once_with(image_path)
-            mock_img.resize.assert_called_once_with((224, 224))
-            mock_array.assert_called_once()
-            mock_preprocess.assert_called_once()
-            
-            # Check the result
-            assert result.shape == (224, 224, 3)
-
-    def test_get_imagenet_labels(self) -> None:
+        # Black pixels map to -1.0 after MobileNetV2 preprocessing
+        assert result.shape == (224, 224, 3)
+        assert result.dtype == np.float16
+        np.testing.assert_allclose(result, -1.0, atol=0.05)
+
+    def test_load_and_preprocess_image_gpu(self, object_detector, tmp_path) -> None:
+        """Test decoding and resizing an image with TensorFlow when a GPU is available."""
+        image_path = tmp_path / "test.png"
+        Image.new("RGB", (32, 24), color=(255, 0, 0)).save(image_path)
+        
+        with patch("photo_organizer.services.vision.detection.gpu_available", return_value=True), \
+             patch("PIL.Image.open") as mock_open, \
+             patch.object(tf.image, "resize", wraps=tf.image.resize) as mock_resize:
+            result = object_detector._load_and_preprocess_image(image_path)
+        
+        mock_open.assert_not_called()
+        mock_resize.assert_called_once()
+        assert mock_resize.call_args[0][1] == (224, 224)
+        assert mock_resize.call_args[1]["method"] == "bilinear"
+        
+        # Red pixels map to 1.0 in the red channel and -1.0 elsewhere
+        assert result.shape == (224, 224, 3)
+        np.testing.assert_allclose(result[112, 112], [1.0, -1.0, -1.0])
+
+    def test_load_and_preprocess_image_gpu_tiff(self, object_detector, tmp_path) -> None:
+        """Test that TIFF images are decoded with PIL even when a GPU is available."""
+        image_path = tmp_path / "test.tif"
+        Image.new("RGB", (32, 24), color=(255, 0, 0)).save(image_path)
+        
+        with patch("photo_organizer.services.vision.detection.gpu_available", return_value=True), \
+             patch.object(tf.io, "decode_image") as mock_decode:
+            result = object_detector._load_and_preprocess_image(image_path)
+        
+        mock_decode.assert_not_called()
+        assert result.shape == (224, 224, 3)
+        np.testing.assert_allclose(result[112, 112], [1.0, -1.0, -1.0], atol=0.01)
+
+    def test_load_and_preprocess_image_cache_hit(self, tiny_jpeg, tmp_path) -> None:
+        """Test that a cached image is not decoded again."""
+        image_path = tiny_jpeg
+        cache_dir = tmp_path / "cache"
+        detector = ObjectDetector(cache_dir=cache_dir)
+        
+        # The first load decodes the image and fills the cache
+        first = detector._load_and_preprocess_image(image_path)
+        assert len(list(cache_dir.glob("*.npy"))) == 1
+        
+        # The second load reads the cache without opening the image
+        with patch("PIL.Image.open") as mock_open:
+            second = detector._load_and_preprocess_image(image_path)
+        
+        mock_open.assert_not_called()
+        assert second.dtype == np.float16
+        assert second.shape == (224, 224, 3)
+        np.testing.assert_array_equal(first, second)
+
+    def test_load_and_preprocess_image_cache_rebuilds_damaged_entry(self, tiny_jpeg, tmp_path) -> None:
+        """Test that an unreadable cache entry is replaced."""
+        image_path = tiny_jpeg
+        cache_dir = tmp_path / "cache"
+        cache_dir.mkdir()
+        cache_path = cache_dir / f"{preprocess_cache_key(image_path)}.npy"
+        cache_path.write_bytes(b"not an array")
+        
+        detector = ObjectDetector(cache_dir=cache_dir)
+        img = detector._load_and_preprocess_image(image_path)
+        
+        assert img.shape == (224, 224, 3)
+        assert np.load(cache_path).dtype == np.float16
+
+    def test_get_imagenet_labels(self, object_detector) -> None:
         """Test getting ImageNet labels."""
-        detector = ObjectDetector()
-        labels = detector._get_imagenet_labels()
+        labels = object_detector._get_imagenet_labels()
         
         assert len(labels) > 0
         assert "person" in labels
         assert "cat" in labels
         assert "dog" in labels
 
+    def test_get_imagenet_labels_cached(self, object_detector) -> None:
+        """Test that the labels are built once and shared between detectors."""
+        labels = object_detector._get_imagenet_labels()
+        
+        assert ObjectDetector()._get_imagenet_labels() is labels
+        assert labels.dtype == object
+        assert not labels.flags.writeable
+        assert list(labels[np.array([0, 15])]) == ["person", "cat"]
+
 
 class TestSceneDetector:
     """Tests for the SceneDetector class."""
 
+    pytestmark = pytest.mark.heavy
+
     def test_init(self, tmp_path) -> None:
         """Test initializing the detector."""
         # Test with default parameters
@@ -240,15 +587,27 @@ class TestSceneDetector:
         # Check that the pre-trained model was loaded
         mock_resnet.assert_called_once_with(weights="imagenet")
         assert len(detector._labels) > 0
+        assert detector._scene_map.max() == len(detector._labels) - 1
+
+    @patch.object(tf.lite, "Interpreter")
+    def test_load_model_tflite(self, mock_interpreter, tmp_path) -> None:
+        """Test loading a quantized TFLite model."""
+        model_path = tmp_path / "scene_detection.tflite"
+        model_path.touch()
+        
+        detector = SceneDetector(model_path=model_path)
+        detector.load_model()
+        
+        mock_interpreter.assert_called_once_with(model_path=str(model_path), num_threads=os.cpu_count())
+        assert detector._model is mock_interpreter.return_value
+        assert detector._backend == "tflite"
 
-    @patch("tensorflow.keras.models.load_model")
     @patch("photo_organizer.services.vision.detection.SceneDetector._load_and_preprocess_image")
     @patch("photo_organizer.services.vision.detection.SceneDetector._map_to_scenes")
-    def test_detect(self, mock_map_to_scenes, mock_preprocess, mock_load_model, tmp_path) -> None:
+    def test_detect(self, mock_map_to_scenes, mock_preprocess, tmp_path) -> None:
         """Test detecting scenes in an image."""
         # Create a mock model
-        mock_model = MagicMock()
-        mock_load_model.return_value = mock_model
+        mock_model = Mock(spec_set=["predict"])
         
         # Mock the model prediction
         mock_predictions = [
@@ -266,8 +625,9 @@ class TestSceneDetector:
             "mountain": 0.3
         }
         
-        # Create the detector
+        # Create the detector with the mock model already loaded
         detector = SceneDetector()
+        detector._model = mock_model
         
         # Test with a mock image
         image_path = tmp_path / "test.jpg"
@@ -284,12 +644,13 @@ class TestSceneDetector:
         assert scenes[1].label == "forest"
         assert scenes[1].confidence == 0.8
 
-    def test_map_to_scenes(self) -> None:
+    def test_map_to_scenes(self, scene_detector, monkeypatch) -> None:
         """Test mapping ImageNet classes to scene categories."""
-        detector = SceneDetector()
-        
-        # Mock the labels
-        detector._labels = ["beach", "mountain", "forest", "city", "desert"]
+        # Mock the labels and map the first five classes to them
+        monkeypatch.setattr(scene_detector, "_labels", ["beach", "mountain", "forest", "city", "desert"])
+        monkeypatch.setattr(
+            scene_detector, "_scene_map", np.array([0, 1, 2, 3, 4, -1, -1, -1, -1, -1], dtype=np.int32)
+        )
         
         # Create mock class probabilities
         class_probs = np.zeros(10)
@@ -298,17 +659,32 @@ class TestSceneDetector:
         class_probs[9] = 0.7  # out of range
         
         # Map to scenes
-        scene_probs = detector._map_to_scenes(class_probs)
+        scene_probs = scene_detector._map_to_scenes(class_probs)
         
         # Check the mapping
         assert len(scene_probs) == 2
         assert scene_probs["beach"] == 0.9
         assert scene_probs["forest"] == 0.8
 
-    def test_get_scene_labels(self) -> None:
+    def test_map_to_scenes_combines_classes(self, scene_detector, monkeypatch) -> None:
+        """Test that classes mapped to the same scene add up."""
+        monkeypatch.setattr(scene_detector, "_labels", ["beach", "forest"])
+        monkeypatch.setattr(scene_detector, "_scene_map", np.array([0, 1, 0, -1], dtype=np.int32))
+        
+        scene_probs = scene_detector._map_to_scenes(np.array([0.25, 0.5, 0.125, 0.125]))
+        
+        assert scene_probs == {"beach": 0.375, "forest": 0.5}
+
+    def test_build_scene_map(self, scene_detector) -> None:
+        """Test building the class-to-scene lookup table."""
+        scene_map = scene_detector._build_scene_map(3, num_classes=5)
+        
+        assert scene_map.dtype == np.int32
+        assert scene_map.tolist() == [0, 1, 2, -1, -1]
+
+    def test_get_scene_labels(self, scene_detector) -> None:
         """Test getting scene labels."""
-        detector = SceneDetector()
-        labels = detector._get_scene_labels()
+        labels = scene_detector._get_scene_labels()
         
         assert len(labels) > 0
         assert "beach" in labels
@@ -326,20 +702,42 @@ class TestDetectionService:
         assert service.model_dir == Path.home() / ".photo_organizer" / "models"
         assert isinstance(service.object_detector, ObjectDetector)
         assert isinstance(service.scene_detector, SceneDetector)
+        assert not service.shared_backbone
+        assert service.object_detector.cache_dir is None
+        assert service.scene_detector.cache_dir is None
         
         # Test with custom parameters
         model_dir = tmp_path / "models"
         service = DetectionService(
             model_dir=model_dir,
             object_threshold=0.6,
-            scene_threshold=0.7
+            scene_threshold=0.7,
+            cache_preprocessed=True
         )
         assert service.model_dir == model_dir
         assert service.object_detector.confidence_threshold == 0.6
         assert service.scene_detector.confidence_threshold == 0.7
+        assert service.object_detector.cache_dir == model_dir / ".preproc_cache" / "object_detection"
+        assert service.scene_detector.cache_dir == model_dir / ".preproc_cache" / "scene_detection"
+
+    def test_init_prefers_tflite_and_onnx_models(self, tmp_path) -> None:
+        """Test that TFLite and ONNX models are used when present."""
+        model_dir = tmp_path / "models"
+        model_dir.mkdir()
+        (model_dir / "object_detection.tflite").touch()
+        
+        service = DetectionService(model_dir=model_dir)
+        
+        assert service.object_detector.model_path == model_dir / "object_detection.tflite"
+        assert service.scene_detector.model_path == model_dir / "scene_detection"
+        
+        # ONNX models are used when there is no TFLite model
+        (model_dir / "scene_detection.onnx").touch()
+        service = DetectionService(model_dir=model_dir)
+        assert service.scene_detector.model_path == model_dir / "scene_detection.onnx"
 
     @patch("photo_organizer.services.vision.detection.ObjectDetector.detect")
-    def test_detect_objects(self, mock_detect, tmp_path) -> None:
+    def test_detect_objects(self, mock_detect, detection_service, tmp_path) -> None:
         """Test detecting objects."""
         # Create mock objects
         mock_objects = [
@@ -348,12 +746,9 @@ class TestDetectionService:
         ]
         mock_detect.return_value = mock_objects
         
-        # Create the service
-        service = DetectionService()
-        
         # Test with a mock image
         image_path = tmp_path / "test.jpg"
-        objects = service.detect_objects(image_path)
+        objects = detection_service.detect_objects(image_path)
         
         # Check that the detector was used
         mock_detect.assert_called_once_with(image_path)
@@ -362,7 +757,7 @@ class TestDetectionService:
         assert objects == mock_objects
 
     @patch("photo_organizer.services.vision.detection.SceneDetector.detect")
-    def test_detect_scenes(self, mock_detect, tmp_path) -> None:
+    def test_detect_scenes(self, mock_detect, detection_service, tmp_path) -> None:
         """Test detecting scenes."""
         # Create mock scenes
         mock_scenes = [
@@ -371,12 +766,9 @@ class TestDetectionService:
         ]
         mock_detect.return_value = mock_scenes
         
-        # Create the service
-        service = DetectionService()
-        
         # Test with a mock image
         image_path = tmp_path / "test.jpg"
-        scenes = service.detect_scenes(image_path)
+        scenes = detection_service.detect_scenes(image_path)
         
         # Check that the detector was used
         mock_detect.assert_called_once_with(image_path)
@@ -384,10 +776,52 @@ class TestDetectionService:
         # Check the detected scenes
         assert scenes == mock_scenes
 
+    @patch("photo_organizer.services.vision.detection.ObjectDetector._load_and_preprocess_image")
+    @patch("photo_organizer.services.vision.detection.ObjectDetector.predict")
+    @patch("photo_organizer.services.vision.detection.SceneDetector.predict")
+    def test_analyze_image(
+        self, mock_scene_predict, mock_object_predict, mock_preprocess, detection_service, monkeypatch, tmp_path
+    ) -> None:
+        """Test analyzing an image with a single backbone pass."""
+        # The backbone returns class probabilities for both heads
+        class_probs = np.zeros(1000)
+        class_probs[0] = 0.9
+        class_probs[2] = 0.7
+        mock_object_predict.return_value = class_probs
+        mock_preprocess.return_value = np.zeros((224, 224, 3))
+        
+        monkeypatch.setattr(detection_service.object_detector, "_labels", ["cat", "dog", "car"])
+        
+        # Test with a mock image
+        image_path = tmp_path / "test.jpg"
+        objects, scenes = detection_service.analyze_image(image_path)
+        
+        # Check that the image was decoded and the backbone run once
+        mock_preprocess.assert_called_once_with(image_path)
+        mock_object_predict.assert_called_once()
+        mock_scene_predict.assert_not_called()
+        
+        # Check the detected objects and scenes
+        assert objects == [
+            ObjectInfo(label="cat", confidence=0.9),
+            ObjectInfo(label="car", confidence=0.7)
+        ]
+        assert [scene.label for scene in scenes] == ["beach", "forest"]
+
+    @patch("photo_organizer.services.vision.detection.ObjectDetector._load_and_preprocess_image")
+    def test_analyze_image_error(self, mock_preprocess, detection_service, tmp_path) -> None:
+        """Test analyzing an image with an error."""
+        mock_preprocess.side_effect = Exception("Test error")
+        
+        with pytest.raises(ComputerVisionError) as excinfo:
+            detection_service.analyze_image(tmp_path / "test.jpg")
+        
+        assert "Failed to analyze" in str(excinfo.value)
+
     @patch("photo_organizer.services.vision.detection.ObjectDetector.detect")
     @patch("photo_organizer.services.vision.detection.SceneDetector.detect")
-    def test_analyze_image(self, mock_detect_scenes, mock_detect_objects, tmp_path) -> None:
-        """Test analyzing an image."""
+    def test_analyze_image_separate_models(self, mock_detect_scenes, mock_detect_objects, tmp_path) -> None:
+        """Test analyzing an image with separate object and scene models."""
         # Create mock objects and scenes
         mock_objects = [
             ObjectInfo(label="cat", confidence=0.9),
@@ -401,7 +835,7 @@ class TestDetectionService:
         mock_detect_scenes.return_value = mock_scenes
         
         # Create the service
-        service = DetectionService()
+        service = DetectionService(shared_backbone=False)
         
         # Test with a mock image
         image_path = tmp_path / "test.jpg"
@@ -413,4 +847,109 @@ class TestDetectionService:
         
         # Check the detected objects and scenes
         assert objects == mock_objects
-        assert scenes == mock_scenes
\ No newline at end of file
+        assert scenes == mock_scenes
+
+    def test_analyze_image_separate_models_concurrent(self, tmp_path) -> None:
+        """Test that separate object and scene models run concurrently."""
+        # Each detector waits for the other, so this only passes if both run at once
+        barrier = threading.Barrier(2, timeout=5)
+        
+        def detect(image_path):
+            barrier.wait()
+            return []
+        
+        service = DetectionService(shared_backbone=False)
+        with patch.object(service.object_detector, "detect", side_effect=detect), \
+             patch.object(service.scene_detector, "detect", side_effect=detect):
+            objects, scenes = service.analyze_image(tmp_path / "test.jpg")
+        
+        assert objects == []
+        assert scenes == []
+
+    def test_analyze_image_custom_scene_model(self, tmp_path) -> None:
+        """Test that a scene model in the model directory is used even with a shared backbone."""
+        model_dir = tmp_path / "models"
+        model_dir.mkdir()
+        (model_dir / "scene_detection.tflite").touch()
+        
+        service = DetectionService(model_dir=model_dir, shared_backbone=True)
+        assert not service.shared_backbone
+        
+        scenes = [SceneInfo(label="beach", confidence=0.9)]
+        with patch.object(service.object_detector, "detect", return_value=[]), \
+             patch.object(service.scene_detector, "detect", return_value=scenes) as mock_detect_scenes:
+            assert service.analyze_image(tmp_path / "test.jpg") == ([], scenes)
+        
+        mock_detect_scenes.assert_called_once_with(tmp_path / "test.jpg")
+        assert service.scene_detector.model_path == model_dir / "scene_detection.tflite"
+
+    @patch("photo_organizer.services.vision.detection.ObjectDetector._load_and_preprocess_image")
+    def test_analyze_images(self, mock_preprocess, detection_service, monkeypatch, tmp_path) -> None:
+        """Test that a batch of images runs through the model in one call."""
+        mock_preprocess.return_value = np.zeros((224, 224, 3))
+        
+        class_probs = np.zeros((3, 1000))
+        class_probs[:, 1] = [0.9, 0.2, 0.8]
+        
+        model = Mock(spec_set=["predict"])
+        model.predict.return_value = class_probs
+        monkeypatch.setattr(detection_service.object_detector, "_model", model)
+        monkeypatch.setattr(detection_service.object_detector, "_labels", ["cat", "dog"])
+        
+        image_paths = [tmp_path / f"test{i}.jpg" for i in range(3)]
+        results = detection_service.analyze_images(image_paths)
+        
+        # Check that the model was called once for all images
+        model.predict.assert_called_once()
+        batch = model.predict.call_args[0][0]
+        assert batch.shape == (3, 224, 224, 3)
+        
+        # Check the results for each image
+        assert list(results) == image_paths
+        assert results[image_paths[0]][0] == [ObjectInfo(label="dog", confidence=0.9)]
+        assert results[image_paths[1]][0] == []
+        assert [scene.label for scene in results[image_paths[2]][1]] == ["mountain"]
+
+    @patch("photo_organizer.services.vision.detection.ObjectDetector._load_and_preprocess_image")
+    def test_analyze_images_batches(self, mock_preprocess, detection_service, monkeypatch, tmp_path) -> None:
+        """Test splitting images into batches and skipping unreadable images."""
+        bad_path = tmp_path / "bad.jpg"
+        
+        def preprocess(path):
+            if path == bad_path:
+                raise OSError("cannot identify image file")
+            return np.zeros((224, 224, 3))
+        
+        mock_preprocess.side_effect = preprocess
+        
+        model = Mock(spec_set=["predict"])
+        model.predict.side_effect = lambda batch: np.zeros((len(batch), 1000))
+        monkeypatch.setattr(detection_service.object_detector, "_model", model)
+        
+        image_paths = [tmp_path / "a.jpg", bad_path, tmp_path / "b.jpg", tmp_path / "c.jpg"]
+        results = detection_service.analyze_images(image_paths, batch_size=2)
+        
+        # The bad image is left out of its batch and of the results
+        batch_sizes = [len(call[0][0]) for call in model.predict.call_args_list]
+        assert batch_sizes == [1, 2]
+        assert set(results) == {tmp_path / "a.jpg", tmp_path / "b.jpg", tmp_path / "c.jpg"}
+
+    @patch("photo_organizer.services.vision.detection.ObjectDetector._load_and_preprocess_image")
+    @patch("photo_organizer.services.vision.detection.SceneDetector._load_and_preprocess_image")
+    def test_analyze_images_separate_models(self, mock_scene_preprocess, mock_object_preprocess, tmp_path) -> None:
+        """Test analyzing images with separate object and scene models."""
+        mock_object_preprocess.return_value = np.zeros((224, 224, 3))
+        mock_scene_preprocess.return_value = np.ones((224, 224, 3))
+        
+        service = DetectionService(shared_backbone=False)
+        service.object_detector._model = Mock(spec_set=["predict"])
+        service.object_detector._model.predict.return_value = np.zeros((2, 1000))
+        service.scene_detector._model = Mock(spec_set=["predict"])
+        service.scene_detector._model.predict.return_value = np.zeros((2, 1000))
+        
+        results = service.analyze_images([tmp_path / "a.jpg", tmp_path / "b.jpg"])
+        
+        # Each model gets its own preprocessed batch
+        assert service.object_detector._model.predict.call_args[0][0].max() == 0
+        assert service.scene_detector._model.predict.call_args[0][0].min() == 1
+        assert len(results) == 2
@@ -2,17 +2,23 @@
 Unit tests for the image similarity analysis services.
 """
 
+import os
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import numpy as np
 import pytest
+import tensorflow as tf
+from PIL import Image
 
 from photo_organizer.services.vision.base import ComputerVisionError
 from photo_organizer.services.vision.similarity import (
     FeatureExtractor,
+    FeatureIndex,
     ImageSimilarityService,
     SimilarityAnalyzer,
+    connected_components,
+    similar_pairs,
 )
 
 
@@ -24,6 +30,7 @@ class TestFeatureExtractor:
         # Test with default parameters
         extractor = FeatureExtractor()
         assert extractor.model_path is None
+        assert extractor.jit_compile is False
         assert extractor._model is None
         
         # Test with custom parameters
@@ -65,6 +72,44 @@ class TestFeatureExtractor:
         assert mock_mobilenet.call_args[1]["weights"] == "imagenet"
         assert mock_mobilenet.call_args[1]["pooling"] == "avg"
 
+    @patch.object(tf.lite, "Interpreter")
+    def test_load_model_tflite(self, mock_interpreter, tmp_path) -> None:
+        """Test loading a quantized TFLite model."""
+        model_path = tmp_path / "feature_extraction.tflite"
+        model_path.touch()
+        
+        extractor = FeatureExtractor(model_path=model_path)
+        extractor.load_model()
+        
+        mock_interpreter.assert_called_once_with(model_path=str(model_path), num_threads=os.cpu_count())
+        assert extractor._model is mock_interpreter.return_value
+        assert extractor._backend == "tflite"
+
+    @patch.object(tf.lite, "Interpreter")
+    @patch("photo_organizer.services.vision.similarity.FeatureExtractor._load_and_preprocess_image")
+    def test_extract_features_tflite(self, mock_preprocess, mock_interpreter, tmp_path) -> None:
+        """Test extracting features with a quantized TFLite model."""
+        model_path = tmp_path / "feature_extraction.tflite"
+        model_path.touch()
+        
+        # Mock a uint8-quantized interpreter
+        interpreter = mock_interpreter.return_value
+        interpreter.get_input_details.return_value = [
+            {"index": 0, "dtype": np.uint8, "quantization": (1.0 / 128, 128)}
+        ]
+        interpreter.get_output_details.return_value = [
+            {"index": 1, "dtype": np.uint8, "quantization": (0.5, 0)}
+        ]
+        interpreter.get_tensor.return_value = np.array([[6, 8]], dtype=np.uint8)
+        mock_preprocess.return_value = np.zeros((224, 224, 3))
+        
+        extractor = FeatureExtractor(model_path=model_path)
+        features = extractor.extract_features_batch([tmp_path / "a.jpg", tmp_path / "b.jpg"])
+        
+        # Check that each image was run through the interpreter
+        assert interpreter.invoke.call_count == 2
+        np.testing.assert_allclose(features, [[0.6, 0.8], [0.6, 0.8]])
+
     @patch("tensorflow.keras.models.load_model")
     def test_load_model_error(self, mock_load_model) -> None:
         """Test loading a model with an error."""
@@ -80,13 +125,11 @@ class TestFeatureExtractor:
         
         assert "Failed to load feature extraction model" in str(excinfo.value)
 
-    @patch("tensorflow.keras.models.load_model")
     @patch("photo_organizer.services.vision.similarity.FeatureExtractor._load_and_preprocess_image")
-    def test_extract_features(self, mock_preprocess, mock_load_model, tmp_path) -> None:
+    def test_extract_features(self, mock_preprocess, tmp_path) -> None:
         """Test extracting features from an image."""
         # Create a mock model
         mock_model = MagicMock()
-        mock_load_model.return_value = mock_model
         
         # Mock the model prediction
         mock_model.predict.return_value = np.array([[0.1, 0.2, 0.3]])
@@ -94,8 +137,9 @@ class TestFeatureExtractor:
         # Mock image preprocessing
         mock_preprocess.return_value = np.zeros((224, 224, 3))
         
-        # Create the extractor
+        # Create the extractor with the mock model already loaded
         extractor = FeatureExtractor()
+        extractor._model = mock_model
         
         # Test with a mock image
         image_path = tmp_path / "test.jpg"
@@ -127,36 +171,190 @@ class TestFeatureExtractor:
         
         assert "Failed to extract features" in str(excinfo.value)
 
-    def test_load_and_preprocess_image(self, tmp_path) -> None:
-        """Test loading and preprocessing an image."""
-        # This test would require a real image file, so we'll mock it
+    @patch("photo_organizer.services.vision.similarity.FeatureExtractor._load_and_preprocess_image")
+    def test_extract_features_batch(self, mock_preprocess, tmp_path) -> None:
+        """Test extracting features from several images in one model call."""
+        mock_preprocess.return_value = np.zeros((224, 224, 3))
+        
+        # Use a mock model
+        extractor = FeatureExtractor()
+        extractor._model = MagicMock()
+        extractor._model.predict.return_value = np.array([[3.0, 4.0], [0.0, 2.0], [1.0, 0.0]])
+        
+        image_paths = [tmp_path / "a.jpg", tmp_path / "b.jpg", tmp_path / "c.jpg"]
+        features = extractor.extract_features_batch(image_paths)
+        
+        # Check that the images were run through the model as one batch
+        extractor._model.predict.assert_called_once()
+        assert extractor._model.predict.call_args[0][0].shape == (3, 224, 224, 3)
+        assert mock_preprocess.call_count == 3
+        
+        # Check that each row is normalized
+        np.testing.assert_allclose(features, [[0.6, 0.8], [0.0, 1.0], [1.0, 0.0]])
+
+    @patch("photo_organizer.services.vision.similarity.FeatureExtractor._load_and_preprocess_image")
+    def test_extract_features_keras_model(self, mock_preprocess, tmp_path) -> None:
+        """Test that a Keras model is loaded once and traced once across calls."""
+        mock_preprocess.return_value = np.ones((224, 224, 3))
+        
+        # A tiny Keras model standing in for MobileNetV2
+        model = tf.keras.Sequential([
+            tf.keras.Input(shape=(224, 224, 3)),
+            tf.keras.layers.GlobalAveragePooling2D(),
+        ])
+        
         extractor = FeatureExtractor()
         
-        with patch("PIL.Image.open") as mock_open, \
-             patch("numpy.array") as mock_array, \
-             patch("tensorflow.keras.applications.mobilenet_v2.preprocess_input") as mock_preprocess:
+        def load_model():
+            extractor._model = model
+            extractor._infer = None
+        
+        with patch.object(extractor, "load_model", side_effect=load_model) as mock_load_model:
+            features = extractor.extract_features(tmp_path / "a.jpg")
+            infer = extractor._infer
+            extractor.extract_features_batch([tmp_path / "b.jpg", tmp_path / "c.jpg"])
+        
+        mock_load_model.assert_called_once()
+        assert extractor._infer is infer
+        np.testing.assert_allclose(features, np.full(3, 1 / np.sqrt(3)), rtol=1e-6)
+
+    @patch("photo_organizer.services.vision.similarity.FeatureExtractor._load_and_preprocess_image")
+    def test_extract_features_jit_compile(self, mock_preprocess, tmp_path) -> None:
+        """Test extracting features with an XLA-compiled Keras model."""
+        mock_preprocess.return_value = np.ones((224, 224, 3))
+        
+        extractor = FeatureExtractor(jit_compile=True)
+        extractor._model = tf.keras.Sequential([
+            tf.keras.Input(shape=(224, 224, 3)),
+            tf.keras.layers.GlobalAveragePooling2D(),
+        ])
+        
+        features = extractor.extract_features(tmp_path / "a.jpg")
+        
+        np.testing.assert_allclose(features, np.full(3, 1 / np.sqrt(3)), rtol=1e-6)
+
+    def test_extract_features_batch_chunks(self, tmp_path) -> None:
+        """Test that large batches run through the model in order, one chunk at a time."""
+        image_paths = [tmp_path / f"{i}.jpg" for i in range(5)]
+        
+        def preprocess(path):
+            return np.full((224, 224, 3), float(path.stem))
+        
+        # Use a mock model whose features encode the image index
+        extractor = FeatureExtractor()
+        extractor._model = MagicMock()
+        extractor._model.predict.side_effect = lambda batch, batch_size: np.stack(
+            [np.ones(len(batch)), batch[:, 0, 0, 0]], axis=1
+        )
+        
+        with patch("photo_organizer.services.vision.similarity.FEATURE_BATCH_SIZE", 2), \
+             patch.object(extractor, "_load_and_preprocess_image", side_effect=preprocess):
+            features = extractor.extract_features_batch(image_paths)
+        
+        assert [call[0][0].shape[0] for call in extractor._model.predict.call_args_list] == [2, 2, 1]
+        np.testing.assert_allclose(features[:, 1] / features[:, 0], [0, 1, 2, 3, 4])
+
+    def test_extract_features_cached(self, tmp_path) -> None:
+        """Test that cached features skip the model on repeat calls."""
+        image_paths = [tmp_path / "a.jpg", tmp_path / "b.jpg", tmp_path / "copy_of_a.jpg"]
+        image_paths[0].write_bytes(b"image a")
+        image_paths[1].write_bytes(b"image b")
+        image_paths[2].write_bytes(b"image a")
+        
+        # Use a mock model
+        extractor = FeatureExtractor(cache_dir=tmp_path / "cache")
+        extractor._model = MagicMock()
+        extractor._model.predict.return_value = np.array([[3.0, 4.0]])
+        
+        with patch.object(extractor, "_load_and_preprocess_image", return_value=np.zeros((224, 224, 3))):
+            features = extractor.extract_features(image_paths[0])
             
-            # Mock the image operations
-            mock_img = MagicMock()
-            mock_img.mode = "RGB"
-            mock_img.resize.return_value = mock_img
-            mock_open.return_value = mock_img
+            # Check that the same path, and a copy of the same file, are cached
+            extractor._model.predict.reset_mock()
+            np.testing.assert_allclose(extractor.extract_features(image_paths[0]), features, rtol=1e-3)
+            np.testing.assert_allclose(extractor.extract_features(image_paths[2]), features, rtol=1e-3)
+            extractor._model.predict.assert_not_called()
             
-            mock_array.return_value = np.zeros((224, 224, 3))
-            mock_preprocess.return_value = np.zeros((224, 224, 3))
+            # Check that only the uncached image is run through the model
+            extractor._model.predict.return_value = np.array([[0.0, 2.0]])
+            features = extractor.extract_features_batch(image_paths)
+            assert extractor._model.predict.call_args[0][0].shape == (1, 224, 224, 3)
+        
+        np.testing.assert_allclose(features, [[0.6, 0.8], [0.0, 1.0], [0.6, 0.8]], rtol=1e-3)
+        assert len(list((tmp_path / "cache").glob("*.npy"))) == 2
+
+    def test_extract_features_dataset(self, tmp_path) -> None:
+        """Test extracting features from image files through a tf.data pipeline."""
+        image_paths = []
+        for i, color in enumerate([(255, 0, 0), (0, 0, 255)]):
+            path = tmp_path / f"image{i}.png"
+            Image.new("RGB", (32, 16), color).save(path)
+            image_paths.append(path)
+        
+        # Use a mock model that returns the mean of each color channel
+        extractor = FeatureExtractor()
+        extractor._model = MagicMock()
+        extractor._model.predict.side_effect = lambda batch, batch_size: batch.mean(axis=(1, 2))
+        
+        features = extractor.extract_features_dataset(image_paths)
+        
+        # Check that the images were resized and scaled to [-1, 1]
+        batch = extractor._model.predict.call_args[0][0]
+        assert batch.shape == (2, 224, 224, 3)
+        np.testing.assert_allclose(batch[0, 0, 0], [1.0, -1.0, -1.0])
+        
+        # Check that each row is normalized
+        np.testing.assert_allclose(features * np.sqrt(3), [[1.0, -1.0, -1.0], [-1.0, -1.0, 1.0]], rtol=1e-6)
+
+    def test_extract_features_dataset_error(self, tmp_path) -> None:
+        """Test extracting features from a missing image through a tf.data pipeline."""
+        extractor = FeatureExtractor()
+        extractor._model = MagicMock()
+        
+        with pytest.raises(ComputerVisionError) as excinfo:
+            extractor.extract_features_dataset([tmp_path / "missing.jpg"])
+        
+        assert "Failed to extract features" in str(excinfo.value)
+
+    def test_load_and_preprocess_image_scaled_jpeg_decode(self, tmp_path) -> None:
+        """Test that a large JPEG is decoded at reduced size before resizing."""
+        image_path = tmp_path / "large.jpg"
+        Image.new("RGB", (1600, 1200), (255, 255, 255)).save(image_path)
+        
+        extractor = FeatureExtractor()
+        
+        decoded_sizes = []
+        original_resize = Image.Image.resize
+        
+        def resize(img, *args, **kwargs):
+            decoded_sizes.append(img.size)
+            return original_resize(img, *args, **kwargs)
+        
+        with patch.object(Image.Image, "resize", autospec=True, side_effect=resize):
+            result = extractor._load_and_preprocess_image(image_path)
+        
+        # 1600x1200 scales down by 4 and still covers the 224x224 input
+        assert decoded_sizes == [(400, 300)]
+        assert result.shape == (224, 224, 3)
+        np.testing.assert_allclose(result, 1.0, atol=0.02)
+
+    def test_load_and_preprocess_image(self, tmp_path) -> None:
+        """Test loading and preprocessing an image."""
+        extractor = FeatureExtractor()
+        
+        with patch("PIL.Image.open") as mock_open:
+            mock_open.return_value = Image.new("RGB", (300, 200), (255, 0, 51))
             
             # Call the method
             image_path = tmp_path / "test.jpg"
             result = extractor._load_and_preprocess_image(image_path)
-            
-            # Check that the operations were performed
-            mock_open.assert_called_once_with(image_path)
-            mock_img.resize.assert_called_once_with((224, 224))
-            mock_array.assert_called_once()
-            mock_preprocess.assert_called_once()
-            
-            # Check the result
-            assert result.shape == (224, 224, 3)
+        
+        mock_open.assert_called_once_with(image_path)
+        
+        # Check the result is resized and scaled to [-1, 1]
+        assert result.shape == (224, 224, 3)
+        assert result.dtype == np.float32
+        np.testing.assert_allclose(result[0, 0], [1.0, -1.0, -0.6], atol=1e-6)
 
 
 class TestSimilarityAnalyzer:
@@ -178,11 +376,11 @@ class TestSimilarityAnalyzer:
         # Create a mock feature extractor
         feature_extractor = MagicMock(spec=FeatureExtractor)
         
-        # Mock the extract_features method
-        feature_extractor.extract_features.side_effect = [
-            np.array([0.1, 0.2, 0.3]),  # Features for image 1
-            np.array([0.2, 0.3, 0.4])   # Features for image 2
-        ]
+        # Mock the extract_features_batch method
+        feature_extractor.extract_features_batch.return_value = np.array([
+            [0.1, 0.2, 0.3],  # Features for image 1
+            [0.2, 0.3, 0.4]   # Features for image 2
+        ])
         
         # Create the analyzer
         analyzer = SimilarityAnalyzer(feature_extractor=feature_extractor)
@@ -192,10 +390,8 @@ class TestSimilarityAnalyzer:
         image_path2 = tmp_path / "test2.jpg"
         similarity = analyzer.compute_similarity(image_path1, image_path2)
         
-        # Check that the feature extractor was used
-        assert feature_extractor.extract_features.call_count == 2
-        feature_extractor.extract_features.assert_any_call(image_path1)
-        feature_extractor.extract_features.assert_any_call(image_path2)
+        # Check that the feature extractor was used once for both images
+        feature_extractor.extract_features_batch.assert_called_once_with([image_path1, image_path2])
         
         # Check the similarity score
         assert 0 <= similarity <= 1
@@ -206,8 +402,8 @@ class TestSimilarityAnalyzer:
         # Create a mock feature extractor
         feature_extractor = MagicMock(spec=FeatureExtractor)
         
-        # Mock the extract_features method to raise an exception
-        feature_extractor.extract_features.side_effect = Exception("Test error")
+        # Mock the extract_features_batch method to raise an exception
+        feature_extractor.extract_features_batch.side_effect = Exception("Test error")
         
         # Create the analyzer
         analyzer = SimilarityAnalyzer(feature_extractor=feature_extractor)
@@ -227,14 +423,13 @@ class TestSimilarityAnalyzer:
         # Create a mock feature extractor
         feature_extractor = MagicMock(spec=FeatureExtractor)
         
-        # Mock the extract_features method
-        target_features = np.array([0.1, 0.2, 0.3])
-        feature_extractor.extract_features.side_effect = [
-            target_features,                # Features for target image
-            np.array([0.11, 0.21, 0.31]),   # Features for similar image 1
-            np.array([0.5, 0.6, 0.7]),      # Features for dissimilar image
-            np.array([0.12, 0.22, 0.32])    # Features for similar image 2
-        ]
+        # Mock the extract_features_batch method
+        feature_extractor.extract_features_batch.return_value = np.array([
+            [1.0, 0.0, 0.0],      # Features for target image
+            [0.99, 0.1, 0.0],     # Features for similar image 1
+            [0.0, 1.0, 0.0],      # Features for dissimilar image
+            [0.98, 0.0, 0.1]      # Features for similar image 2
+        ])
         
         # Create the analyzer
         analyzer = SimilarityAnalyzer(feature_extractor=feature_extractor)
@@ -248,8 +443,8 @@ class TestSimilarityAnalyzer:
         ]
         similar_images = analyzer.find_similar_images(target_image, image_paths, threshold=0.8)
         
-        # Check that the feature extractor was used
-        assert feature_extractor.extract_features.call_count == 4
+        # Check that the feature extractor was used once for all images
+        feature_extractor.extract_features_batch.assert_called_once_with([target_image] + image_paths)
         
         # Check the similar images
         assert len(similar_images) == 2
@@ -273,16 +468,16 @@ class TestSimilarityAnalyzer:
         
         # Mock the extract_features method to create two clusters
         features = {
-            image_paths[0]: np.array([0.1, 0.2, 0.3]),
-            image_paths[1]: np.array([0.11, 0.21, 0.31]),
-            image_paths[2]: np.array([0.5, 0.6, 0.7]),
-            image_paths[3]: np.array([0.51, 0.61, 0.71])
+            image_paths[0]: np.array([1.0, 0.0, 0.0]),
+            image_paths[1]: np.array([0.99, 0.1, 0.0]),
+            image_paths[2]: np.array([0.0, 1.0, 0.0]),
+            image_paths[3]: np.array([0.1, 0.99, 0.0])
         }
         
-        def mock_extract_features(path):
-            return features[path]
+        def mock_extract_features_batch(paths):
+            return np.array([features[path] for path in paths])
         
-        feature_extractor.extract_features.side_effect = mock_extract_features
+        feature_extractor.extract_features_batch.side_effect = mock_extract_features_batch
         
         # Create the analyzer
         analyzer = SimilarityAnalyzer(feature_extractor=feature_extractor)
@@ -290,8 +485,8 @@ class TestSimilarityAnalyzer:
         # Test clustering
         clusters = analyzer.cluster_images(image_paths, threshold=0.8)
         
-        # Check that the feature extractor was used
-        assert feature_extractor.extract_features.call_count == 4
+        # Check that the feature extractor was used once for all images
+        feature_extractor.extract_features_batch.assert_called_once_with(image_paths)
         
         # Check the clusters
         assert len(clusters) == 2
@@ -307,6 +502,134 @@ class TestSimilarityAnalyzer:
             assert image_paths[2] in clusters[0]
             assert image_paths[3] in clusters[0]
 
+    def test_cluster_images_components(self, tmp_path) -> None:
+        """Test that clusters are exactly the groups of linked similar images."""
+        feature_extractor = MagicMock(spec=FeatureExtractor)
+        image_paths = [tmp_path / f"image{i}.jpg" for i in range(5)]
+        
+        # Images 0-1 and 2-3 are similar pairs, image 4 matches neither
+        feature_extractor.extract_features_batch.return_value = np.array([
+            [1.0, 0.0, 0.0],
+            [0.9, 0.1, 0.0],
+            [0.0, 1.0, 0.0],
+            [0.1, 0.9, 0.0],
+            [0.0, 0.0, 1.0],
+        ])
+        
+        analyzer = SimilarityAnalyzer(feature_extractor=feature_extractor)
+        clusters = analyzer.cluster_images(image_paths, threshold=0.8)
+        
+        assert set(map(frozenset, clusters)) == {
+            frozenset(image_paths[0:2]),
+            frozenset(image_paths[2:4]),
+            frozenset(image_paths[4:5]),
+        }
+
+
+class TestSimilarPairs:
+    """Tests for the similar_pairs function."""
+
+    def test_similar_pairs(self) -> None:
+        """Test finding similar pairs across several blocks of rows."""
+        features = np.array([[1.0, 0.0], [0.0, 1.0], [1.0, 0.0], [0.6, 0.8]])
+        
+        with patch("photo_organizer.services.vision.similarity.SIMILARITY_BLOCK_ROWS", 3):
+            rows, cols = similar_pairs(features, 0.75)
+        
+        pairs = sorted(zip(rows.tolist(), cols.tolist()))
+        assert pairs == [(0, 2), (1, 3)]
+
+    def test_similar_pairs_single_image(self) -> None:
+        """Test that an image is not paired with itself."""
+        rows, cols = similar_pairs(np.array([[1.0, 0.0]]), 0.5)
+        
+        assert len(rows) == 0 and len(cols) == 0
+
+
+class TestConnectedComponents:
+    """Tests for the connected_components function."""
+
+    def test_connected_components(self) -> None:
+        """Test that components include nodes reached through other nodes."""
+        rows = np.array([0, 3, 1, 5])
+        cols = np.array([3, 4, 2, 4])
+        
+        components = connected_components(7, rows, cols)
+        
+        assert [component.tolist() for component in components] == [[0, 3, 4, 5], [1, 2], [6]]
+
+    def test_connected_components_chain(self) -> None:
+        """Test that a long chain of nodes forms a single component."""
+        rows = np.arange(99, 0, -1)
+        cols = rows - 1
+        
+        components = connected_components(100, rows, cols)
+        
+        assert [component.tolist() for component in components] == [list(range(100))]
+
+    def test_connected_components_empty(self) -> None:
+        """Test finding the components of an empty graph."""
+        empty = np.empty(0, dtype=np.intp)
+        assert connected_components(0, empty, empty) == []
+
+
+class TestFeatureIndex:
+    """Tests for the FeatureIndex class."""
+
+    def test_add_and_lookup(self, tmp_path) -> None:
+        """Test that indexed features persist across index instances."""
+        image_paths = [tmp_path / f"{i}.jpg" for i in range(3)]
+        for image_path in image_paths:
+            image_path.write_bytes(image_path.name.encode())
+        
+        index = FeatureIndex(tmp_path / "index", "v1")
+        assert list(index.lookup(image_paths)) == [-1, -1, -1]
+        
+        index.add(image_paths[:2], np.array([[1.0, 0.0], [0.0, 1.0]]))
+        index.add(image_paths[2:], np.array([[0.5, 0.5]]))
+        
+        # Reopen the index from disk
+        index = FeatureIndex(tmp_path / "index", "v1")
+        rows = index.lookup(image_paths)
+        
+        assert len(index) == 3
+        assert index.features.dtype == np.float16
+        np.testing.assert_array_equal(index.features[rows], [[1.0, 0.0], [0.0, 1.0], [0.5, 0.5]])
+
+    def test_lookup_stale(self, tmp_path) -> None:
+        """Test that changed images and other model versions miss the index."""
+        image_path = tmp_path / "test.jpg"
+        image_path.write_bytes(b"old")
+        
+        index = FeatureIndex(tmp_path / "index", "v1")
+        index.add([image_path], np.array([[1.0, 0.0]]))
+        
+        assert list(FeatureIndex(tmp_path / "index", "v2").lookup([image_path])) == [-1]
+        
+        image_path.write_bytes(b"changed")
+        assert list(index.lookup([image_path])) == [-1]
+
+    def test_add_compacts_superseded_rows(self, tmp_path) -> None:
+        """Test that indexing an image again replaces its row."""
+        image_paths = [tmp_path / f"{i}.jpg" for i in range(2)]
+        for image_path in image_paths:
+            image_path.write_bytes(image_path.name.encode())
+        
+        index = FeatureIndex(tmp_path / "index", "v1")
+        index.add(image_paths, np.array([[1.0, 0.0], [0.0, 1.0]]))
+        
+        image_paths[0].write_bytes(b"changed")
+        index.add(image_paths[:1], np.array([[0.5, 0.5]]))
+        
+        # Reopen the index from disk
+        index = FeatureIndex(tmp_path / "index", "v1")
+        rows = index.lookup(image_paths)
+        
+        assert len(index) == 2
+        assert index.features.shape == (2, 2)
+        assert len(index.paths_path.read_text().splitlines()) == 3
+        np.testing.assert_array_equal(index.features[rows], [[0.5, 0.5], [0.0, 1.0]])
+
 
 class TestImageSimilarityService:
     """Tests for the ImageSimilarityService class."""
@@ -324,6 +647,67 @@ class TestImageSimilarityService:
         service = ImageSimilarityService(model_dir=model_dir)
         assert service.model_dir == model_dir
         assert service.feature_extractor.model_path == model_dir / "feature_extraction"
+        assert service.feature_extractor.cache_dir is None
+        assert service.feature_index is None
+        
+        # Test with caching enabled
+        service = ImageSimilarityService(model_dir=model_dir, cache_features=True)
+        assert service.feature_extractor.cache_dir == model_dir / ".feature_cache"
+        assert service.feature_index.index_dir == model_dir / "index"
+
+    def test_find_similar_images_uses_index(self, tmp_path) -> None:
+        """Test that repeated queries read features from the index."""
+        image_paths = [tmp_path / f"{i}.jpg" for i in range(3)]
+        for image_path in image_paths:
+            image_path.write_bytes(image_path.name.encode())
+        
+        service = ImageSimilarityService(model_dir=tmp_path / "models", cache_features=True)
+        features = np.array([[1.0, 0.0], [0.96, 0.28], [0.0, 1.0]])
+        
+        with patch.object(
+            service.feature_extractor, "extract_features_batch", return_value=features
+        ) as mock_extract:
+            first = service.find_similar_images(image_paths[0], image_paths, threshold=0.8)
+            second = service.find_similar_images(image_paths[0], image_paths, threshold=0.8)
+        
+        mock_extract.assert_called_once_with(image_paths)
+        assert [path for path, _ in first] == [path for path, _ in second] == [image_paths[1]]
+        assert second[0][1] == pytest.approx(0.96, abs=1e-3)
+
+    def test_get_features_reindexes_stale_entry(self, tmp_path) -> None:
+        """Test that indexed images keep their features when a changed image is indexed again."""
+        image_paths = [tmp_path / "a.jpg", tmp_path / "b.jpg"]
+        for image_path in image_paths:
+            image_path.write_bytes(image_path.name.encode())
+        
+        service = ImageSimilarityService(model_dir=tmp_path / "models", cache_features=True)
+        analyzer = service.similarity_analyzer
+        
+        with patch.object(
+            service.feature_extractor, "extract_features_batch",
+            return_value=np.array([[1.0, 0.0], [0.0, 1.0]])
+        ):
+            analyzer._get_features(image_paths)
+        
+        image_paths[0].write_bytes(b"changed")
+        with patch.object(
+            service.feature_extractor, "extract_features_batch",
+            return_value=np.array([[0.5, 0.5]])
+        ) as mock_extract:
+            features = analyzer._get_features(image_paths)
+        
+        mock_extract.assert_called_once_with(image_paths[:1])
+        np.testing.assert_array_equal(features, [[0.5, 0.5], [0.0, 1.0]])
+
+    def test_init_prefers_tflite_model(self, tmp_path) -> None:
+        """Test that a TFLite feature extraction model is used when present."""
+        model_dir = tmp_path / "models"
+        model_dir.mkdir()
+        (model_dir / "feature_extraction.tflite").touch()
+        
+        service = ImageSimilarityService(model_dir=model_dir)
+        
+        assert service.feature_extractor.model_path == model_dir / "feature_extraction.tflite"
 
     @patch("photo_organizer.services.vision.similarity.SimilarityAnalyzer.compute_similarity")
     def test_compute_similarity(self, mock_compute, tmp_path) -> None:
@@ -8,7 +8,7 @@ from unittest.mock import MagicMock, patch
 import numpy as np
 import pytest
 
-from photo_organizer.services.vision.base import ComputerVisionError, FaceInfo, ObjectInfo, SceneInfo
+from photo_organizer.services.vision.base import ComputerVisionError, FaceInfo
 from photo_organizer.services.vision.tensorflow import TensorFlowVisionService
 
 
@@ -151,32 +151,26 @@ class TestTensorFlowVisionService:
         assert faces[1].confidence == 0.8
         assert faces[1].bounding_box == (120.0, 100.0, 30.0, 50.0)  # (x, y, width, height)
 
-    @patch("photo_organizer.services.vision.tensorflow.TensorFlowVisionService.detect_objects")
-    @patch("photo_organizer.services.vision.tensorflow.TensorFlowVisionService.detect_scenes")
-    def test_generate_tags(self, mock_detect_scenes, mock_detect_objects, tmp_path) -> None:
+    @patch("photo_organizer.services.vision.tensorflow.TensorFlowVisionService._predict_heads")
+    def test_generate_tags(self, mock_predict_heads, tmp_path) -> None:
         """Test generating tags for an image."""
-        # Mock object detection
-        mock_detect_objects.return_value = [
-            ObjectInfo(label="Cat", confidence=0.9),
-            ObjectInfo(label="Dog", confidence=0.8)
-        ]
-        
-        # Mock scene detection
-        mock_detect_scenes.return_value = [
-            SceneInfo(label="Indoor", confidence=0.7),
-            SceneInfo(label="Living Room", confidence=0.6)
-        ]
+        # Mock the object and scene model outputs
+        mock_predict_heads.return_value = (
+            np.array([[0.9, 0.1, 0.8]]),
+            np.array([[0.2, 0.7, 0.6]])
+        )
         
         # Create the service
         service = TensorFlowVisionService(model_dir=tmp_path / "models")
+        service._object_labels = ["Cat", "Bird", "Dog"]
+        service._scene_labels = ["Beach", "Indoor", "Living Room"]
         
         # Test with a mock image
         image_path = tmp_path / "test.jpg"
         tags = service.generate_tags(image_path)
         
-        # Check that the detection methods were called
-        mock_detect_objects.assert_called_once_with(image_path)
-        mock_detect_scenes.assert_called_once_with(image_path)
+        # Check that both models ran in a single call
+        mock_predict_heads.assert_called_once_with(image_path)
         
         # Check the generated tags
         assert len(tags) == 4
@@ -191,6 +185,47 @@ class TestTensorFlowVisionService:
         assert tags[2] == "indoor"
         assert tags[3] == "living room"  # Lowest confidence
 
+    def test_generate_tags_deduplicates(self, tmp_path) -> None:
+        """Test that a tag found as an object and a scene appears once."""
+        service = TensorFlowVisionService(model_dir=tmp_path / "models")
+        service._object_labels = ["Cat", "Dog"]
+        service._scene_labels = ["Indoor", "Dog"]
+        
+        with patch.object(service, "_predict_heads", return_value=(
+            np.array([[0.6, 0.7]]),
+            np.array([[0.65, 0.9]])
+        )):
+            tags = service.generate_tags(tmp_path / "test.jpg")
+        
+        assert tags == ["dog", "indoor", "cat"]
+
+    def test_objects_from_predictions(self, tmp_path) -> None:
+        """Test turning model output into objects, most confident first."""
+        service = TensorFlowVisionService(model_dir=tmp_path / "models")
+        service._object_labels = ["background", "person", "cat", "dog", "car"]
+        
+        objects = service._objects_from_predictions(np.array([[0.1, 0.2, 0.9, 0.3, 0.8]]))
+        
+        assert [obj.label for obj in objects] == ["cat", "car"]
+        assert [obj.confidence for obj in objects] == [0.9, 0.8]
+
+    @patch("photo_organizer.services.vision.tensorflow.TensorFlowVisionService._load_and_preprocess_image")
+    def test_predict_heads(self, mock_preprocess, tmp_path) -> None:
+        """Test that the image is preprocessed once for both models."""
+        mock_preprocess.return_value = np.zeros((224, 224, 3))
+        
+        service = TensorFlowVisionService(model_dir=tmp_path / "models")
+        service._object_detection_model = MagicMock()
+        service._scene_detection_model = MagicMock()
+        
+        image_path = tmp_path / "test.jpg"
+        object_predictions, scene_predictions = service._predict_heads(image_path)
+        
+        mock_preprocess.assert_called_once_with(image_path, (224, 224))
+        assert object_predictions is service._object_detection_model.predict.return_value
+        assert scene_predictions is service._scene_detection_model.predict.return_value
+        assert service._object_detection_model.predict.call_args[0][0].shape == (1, 224, 224, 3)
+
     @patch("tensorflow.keras.applications.MobileNetV2")
     @patch("photo_organizer.services.vision.tensorflow.TensorFlowVisionService._load_and_preprocess_image")
     def test_analyze_similarity(self, mock_preprocess, mock_mobilenet, tmp_path) -> None:
@@ -2,25 +2,47 @@
 Unit tests for the ApplicationCore class.
 """
 
+import copy
 import os
 import time
+import uuid
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import DEFAULT, MagicMock, patch
 
 import pytest
 
 from photo_organizer.core import ApplicationCore
-from photo_organizer.models.category import Category
 from photo_organizer.models.category_tree import CategoryTree
 from photo_organizer.models.image import Image
 from photo_organizer.services.reporting import ReportFormat
 from photo_organizer.ui.cli_progress import CLIProgressReporter, ProcessingStage
 
 
+# Service classes that ApplicationCore constructs
+SERVICE_CLASSES = (
+    "FileSystemManager",
+    "FileOperationsService",
+    "ImageAnalysisService",
+    "CategorizationService",
+    "ReportingService",
+    "ReportExportService",
+    "FileMappingService",
+)
+
+
+@pytest.fixture(scope="session")
+def _reporter_template():
+    """Create the spec'd progress reporter mock once per session."""
+    return MagicMock(spec=CLIProgressReporter)
+
+
 @pytest.fixture
-def mock_progress_reporter():
+def mock_progress_reporter(_reporter_template):
     """Create a mock progress reporter."""
-    reporter = MagicMock(spec=CLIProgressReporter)
+    # Copies share their child mocks, so clear anything an earlier test
+    # recorded or configured on them
+    reporter = copy.copy(_reporter_template)
+    reporter.reset_mock(return_value=True, side_effect=True)
     reporter.errors = []
     return reporter
 
@@ -28,20 +50,46 @@ def mock_progress_reporter():
 @pytest.fixture
 def core(mock_progress_reporter):
     """Create an ApplicationCore instance with mock services."""
-    core = ApplicationCore(mock_progress_reporter)
-    
-    # Mock services
-    core.file_system_manager = MagicMock()
-    core.file_operations = MagicMock()
-    core.analysis_service = MagicMock()
-    core.categorization_service = MagicMock()
-    core.reporting_service = MagicMock()
-    core.report_export_service = MagicMock()
-    core.file_mapping_service = MagicMock()
+    # Mock the service classes so the real services, and the models they
+    # load, are never constructed
+    with patch.multiple("photo_organizer.core", **{name: DEFAULT for name in SERVICE_CLASSES}):
+        core = ApplicationCore(mock_progress_reporter)
     
     return core
 
 
+@pytest.fixture(scope="module")
+def _image_template():
+    """Create the spec'd image mock once per module."""
+    return MagicMock(spec=Image)
+
+
+@pytest.fixture
+def three_images(_image_template):
+    """Create three distinct image mocks named image1 to image3."""
+    images = [copy.copy(_image_template) for _ in range(3)]
+    for i, image in enumerate(images, start=1):
+        image.path = Path(f"image{i}.jpg")
+        image.id = f"image{i}"
+    return images
+
+
+@pytest.fixture(autouse=True)
+def deterministic_uuid(monkeypatch):
+    """Make generated filenames use a fixed unique id."""
+    monkeypatch.setattr(uuid, "uuid4", lambda: "12345678-1234-5678-1234-567812345678")
+
+
+@pytest.fixture
+def fs_mocks(monkeypatch):
+    """Replace the filesystem checks made while processing images."""
+    exists = MagicMock(return_value=True)
+    makedirs = MagicMock()
+    monkeypatch.setattr("photo_organizer.core.os.path.exists", exists)
+    monkeypatch.setattr("photo_organizer.core.os.makedirs", makedirs)
+    return exists, makedirs
+
+
 class TestApplicationCore:
     """Tests for the ApplicationCore class."""
 
@@ -109,46 +157,35 @@ class TestApplicationCore:
         with pytest.raises(ValueError, match="Output path exists but is not a directory"):
             core._validate_paths(["input.jpg"], "output.txt")
 
-    def test_is_image_file(self, core) -> None:
+    @pytest.mark.parametrize("name, expected", [
+        ("image.jpg", True),
+        ("image.jpeg", True),
+        ("image.png", True),
+        ("image.gif", True),
+        ("image.bmp", True),
+        ("image.tiff", True),
+        ("image.tif", True),
+        ("image.webp", True),
+        ("document.txt", False),
+        ("archive.zip", False),
+    ])
+    def test_is_image_file(self, name, expected) -> None:
         """Test checking if a file is an image."""
-        assert core._is_image_file(Path("image.jpg"))
-        assert core._is_image_file(Path("image.jpeg"))
-        assert core._is_image_file(Path("image.png"))
-        assert core._is_image_file(Path("image.gif"))
-        assert core._is_image_file(Path("image.bmp"))
-        assert core._is_image_file(Path("image.tiff"))
-        assert core._is_image_file(Path("image.tif"))
-        assert core._is_image_file(Path("image.webp"))
-        assert not core._is_image_file(Path("document.txt"))
-        assert not core._is_image_file(Path("archive.zip"))
+        assert ApplicationCore._is_image_file(Path(name)) is expected
 
-    @patch("os.path.exists")
-    @patch("os.makedirs")
-    @patch("time.time")
-    def test_process_images_success(self, mock_time, mock_makedirs, mock_exists, core) -> None:
+    def test_process_images_success(self, fs_mocks, three_images, monkeypatch, core) -> None:
         """Test processing images successfully."""
-        # Mock path validation
-        mock_exists.return_value = True
+        _, mock_makedirs = fs_mocks
         
         # Mock time
-        mock_time.side_effect = [0, 100]  # Start time, end time
+        times = iter([0, 100])  # Start time, end time
+        monkeypatch.setattr("photo_organizer.core.time.time", lambda: next(times))
         
         # Mock scanning
         core._scan_input_paths = MagicMock(return_value=["image1.jpg", "image2.jpg", "image3.jpg"])
         
         # Mock analysis
-        image1 = MagicMock(spec=Image)
-        image1.path = Path("image1.jpg")
-        image1.id = "image1"
-        
-        image2 = MagicMock(spec=Image)
-        image2.path = Path("image2.jpg")
-        image2.id = "image2"
-        
-        image3 = MagicMock(spec=Image)
-        image3.path = Path("image3.jpg")
-        image3.id = "image3"
-        
+        image1, image2, image3 = three_images
         core._analyze_images = MagicMock(return_value=[image1, image2, image3])
         
         # Mock categorization
@@ -177,13 +214,16 @@ class TestApplicationCore:
         assert result == report
         
         # Check that all stages were started
-        core.progress_reporter.start_stage.assert_any_call(ProcessingStage.INITIALIZING)
-        core.progress_reporter.start_stage.assert_any_call(ProcessingStage.SCANNING)
-        core.progress_reporter.start_stage.assert_any_call(ProcessingStage.ANALYZING)
-        core.progress_reporter.start_stage.assert_any_call(ProcessingStage.CATEGORIZING)
-        core.progress_reporter.start_stage.assert_any_call(ProcessingStage.ORGANIZING)
-        core.progress_reporter.start_stage.assert_any_call(ProcessingStage.REPORTING)
-        core.progress_reporter.start_stage.assert_any_call(ProcessingStage.COMPLETED)
+        started_stages = {call.args[0] for call in core.progress_reporter.start_stage.call_args_list}
+        assert started_stages >= {
+            ProcessingStage.INITIALIZING,
+            ProcessingStage.SCANNING,
+            ProcessingStage.ANALYZING,
+            ProcessingStage.CATEGORIZING,
+            ProcessingStage.ORGANIZING,
+            ProcessingStage.REPORTING,
+            ProcessingStage.COMPLETED,
+        }
         
         # Check that output directory was created
         mock_makedirs.assert_called_once_with("output", exist_ok=True)
@@ -206,12 +246,8 @@ class TestApplicationCore:
         # Check that report was exported
         core._export_report.assert_called_once_with(report, ReportFormat.HTML, None, "output")
 
-    @patch("os.path.exists")
-    def test_process_images_no_images(self, mock_exists, core) -> None:
+    def test_process_images_no_images(self, fs_mocks, core) -> None:
         """Test processing with no images found."""
-        # Mock path validation
-        mock_exists.return_value = True
-        
         # Mock scanning
         core._scan_input_paths = MagicMock(return_value=[])
         
@@ -225,12 +261,8 @@ class TestApplicationCore:
         # Check warning
         core.progress_reporter.log_warning.assert_called_once_with("No image files found in input paths")
 
-    @patch("os.path.exists")
-    def test_process_images_canceled(self, mock_exists, core) -> None:
+    def test_process_images_canceled(self, fs_mocks, core) -> None:
         """Test processing with cancellation."""
-        # Mock path validation
-        mock_exists.return_value = True
-        
         # Mock scanning
         core._scan_input_paths = MagicMock(return_value=["image1.jpg", "image2.jpg"])
         
@@ -247,10 +279,10 @@ class TestApplicationCore:
         # Check info message
         core.progress_reporter.log_info.assert_any_call("Operation canceled")
 
-    @patch("os.path.exists")
-    def test_process_images_error(self, mock_exists, core) -> None:
+    def test_process_images_error(self, fs_mocks, core) -> None:
         """Test processing with an error."""
         # Mock path validation
+        mock_exists, _ = fs_mocks
         mock_exists.side_effect = Exception("Test error")
         
         # Process images
@@ -266,16 +298,14 @@ class TestApplicationCore:
     def test_generate_filename(self, core) -> None:
         """Test generating a filename."""
         # Create mock image and category
-        image = MagicMock(spec=Image)
-        image.path = Path("image.jpg")
-        image.content_tags = ["dog", "beach"]
+        image = MagicMock(path=Path("image.jpg"), content_tags=["dog", "beach"])
         
-        category = MagicMock(spec=Category)
+        # A mock's name argument names the mock, so set the attribute after
+        category = MagicMock()
         category.name = "Vacation"
         
         # Generate filename
-        with patch("uuid.uuid4", return_value="12345678-1234-5678-1234-567812345678"):
-            filename = core._generate_filename(image, category)
+        filename = core._generate_filename(image, category)
         
         # Check filename
         assert filename.startswith("vacation_dog_12345678")
@@ -284,16 +314,13 @@ class TestApplicationCore:
     def test_generate_filename_no_tags(self, core) -> None:
         """Test generating a filename with no content tags."""
         # Create mock image and category
-        image = MagicMock(spec=Image)
-        image.path = Path("image.jpg")
-        image.content_tags = []
+        image = MagicMock(path=Path("image.jpg"), content_tags=[])
         
-        category = MagicMock(spec=Category)
+        category = MagicMock()
         category.name = "Vacation"
         
         # Generate filename
-        with patch("uuid.uuid4", return_value="12345678-1234-5678-1234-567812345678"):
-            filename = core._generate_filename(image, category)
+        filename = core._generate_filename(image, category)
         
         # Check filename
         assert filename.startswith("vacation_12345678")
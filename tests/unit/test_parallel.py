@@ -28,6 +28,43 @@ def failing_function(x):
     raise ValueError(f"Error processing {x}")
 
 
+class FakeClock:
+    """Clock that advances when slept on instead of waiting."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self._lock = threading.Lock()
+
+    def sleep(self, seconds: float) -> None:
+        """Advance the clock by a number of seconds."""
+        with self._lock:
+            self.now += seconds
+
+
+@pytest.fixture(scope="module")
+def _executor():
+    """Create one thread pool shared by the worker pools in this module."""
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+    yield executor
+    executor.shutdown()
+
+
+@pytest.fixture
+def pool_factory(_executor):
+    """Create worker pools that run on the shared thread pool."""
+    def make_pool(**kwargs):
+        return WorkerPool(shared_executor=_executor, **kwargs)
+    return make_pool
+
+
+@pytest.fixture
+def fake_clock(monkeypatch):
+    """Replace time.sleep with a fake clock for the duration of a test."""
+    clock = FakeClock()
+    monkeypatch.setattr(time, "sleep", clock.sleep)
+    return clock
+
+
 class TestWorkerPool:
     """Tests for the WorkerPool class."""
 
@@ -45,34 +82,32 @@ class TestWorkerPool:
         assert not pool.canceled
         assert not pool.paused
 
-    def test_map(self) -> None:
+    def test_map(self, pool_factory) -> None:
         """Test mapping a function over items."""
-        pool = WorkerPool(max_workers=2)
+        pool = pool_factory()
         
-        results = pool.map(square, [1, 2, 3, 4, 5])
+        results = pool.map(square, [1, 2])
         
-        assert sorted(results) == [1, 4, 9, 16, 25]
-        assert len(pool.futures) == 5
-        assert len(pool.results) == 5
+        assert sorted(results) == [1, 4]
+        assert len(pool.futures) == 2
+        assert len(pool.results) == 2
         assert pool.errors == []
 
-    def test_map_with_progress(self) -> None:
+    def test_map_with_progress(self, pool_factory, fake_clock) -> None:
         """Test mapping with progress callback."""
         progress_callback = MagicMock()
-        pool = WorkerPool(max_workers=2, progress_callback=progress_callback)
+        pool = pool_factory(progress_callback=progress_callback)
         
-        pool.map(slow_square, [1, 2, 3, 4, 5])
+        pool.map(slow_square, [1, 2])
         
-        assert progress_callback.call_count == 5
-        progress_callback.assert_any_call(1, 5)
-        progress_callback.assert_any_call(2, 5)
-        progress_callback.assert_any_call(3, 5)
-        progress_callback.assert_any_call(4, 5)
-        progress_callback.assert_any_call(5, 5)
+        assert fake_clock.now == pytest.approx(0.02)
+        assert progress_callback.call_count == 2
+        progress_callback.assert_any_call(1, 2)
+        progress_callback.assert_any_call(2, 2)
 
-    def test_map_with_errors(self) -> None:
+    def test_map_with_errors(self, pool_factory) -> None:
         """Test mapping with errors."""
-        pool = WorkerPool(max_workers=2)
+        pool = pool_factory()
         
         results = pool.map(failing_function, [1, 2, 3])
         
@@ -80,55 +115,69 @@ class TestWorkerPool:
         assert len(pool.errors) == 3
         assert all(isinstance(error[1], ValueError) for error in pool.errors)
 
-    def test_cancel(self) -> None:
+    def test_cancel(self, pool_factory, _executor) -> None:
         """Test canceling tasks."""
-        pool = WorkerPool(max_workers=2)
+        pool = pool_factory()
         
-        # Start a thread to cancel after a short delay
-        def cancel_thread():
-            time.sleep(0.02)
-            pool.cancel()
+        # Cancel from the progress callback once two items are done
+        def progress_callback(done, total):
+            if done == 2:
+                pool.cancel()
         
-        thread = threading.Thread(target=cancel_thread)
-        thread.start()
-        
-        # Map a slow function
-        results = pool.map(slow_square, [1, 2, 3, 4, 5])
+        pool.progress_callback = progress_callback
         
-        # Wait for the cancel thread to finish
-        thread.join()
+        results = pool.map(square, list(range(10)))
         
-        # Check that not all items were processed
-        assert len(results) < 5
+        # Check that processing stopped at the cancellation
         assert pool.canceled
+        assert len(results) == 2
+        
+        # Check that the shared thread pool was left running
+        assert _executor.submit(square, 3).result() == 9
 
     def test_pause_resume(self) -> None:
         """Test pausing and resuming tasks."""
-        pool = WorkerPool(max_workers=1)
+        processed = []
+        first_done = threading.Event()
+        started = threading.Event()
+        release = threading.Event()
+        
+        def progress_callback(done, total):
+            if done == 1:
+                first_done.set()
+        
+        pool = WorkerPool(max_workers=1, progress_callback=progress_callback)
+        
+        # Pause while the first item is running, so the rest wait for resume
+        def recording_square(x):
+            if x == 1:
+                started.set()
+                release.wait(timeout=5)
+            processed.append(x)
+            return x * x
+        
+        processed_while_paused = []
         
-        # Start a thread to pause and resume after short delays
         def pause_resume_thread():
-            time.sleep(0.01)
+            started.wait(timeout=5)
             pool.pause()
-            time.sleep(0.02)
+            release.set()
+            first_done.wait(timeout=5)
+            processed_while_paused.extend(processed)
             pool.resume()
         
         thread = threading.Thread(target=pause_resume_thread)
         thread.start()
         
-        # Map a slow function
-        start_time = time.time()
-        results = pool.map(slow_square, [1, 2, 3])
-        elapsed_time = time.time() - start_time
+        results = pool.map(recording_square, [1, 2, 3])
         
         # Wait for the pause/resume thread to finish
         thread.join()
         
-        # Check that all items were processed
+        # Check that nothing else ran while paused, and all items ran after
+        assert processed_while_paused == [1]
+        assert processed == [1, 2, 3]
         assert sorted(results) == [1, 4, 9]
-        
-        # Check that the processing took longer due to the pause
-        assert elapsed_time > 0.03
 
 
 class TestTaskScheduler:
@@ -154,87 +203,65 @@ class TestTaskScheduler:
         assert "test" in scheduler.worker_pools
         assert len(scheduler.worker_pools["test"].results) == 5
 
-    def test_process_batch_with_progress(self) -> None:
+    def test_process_batch_with_progress(self, fake_clock) -> None:
         """Test processing a batch with progress callback."""
         progress_callback = MagicMock()
         scheduler = TaskScheduler(max_workers=2, progress_callback=progress_callback)
         
-        scheduler.process_batch("test", slow_square, [1, 2, 3, 4, 5])
+        scheduler.process_batch("test", slow_square, [1, 2])
         
-        assert progress_callback.call_count == 5
-        progress_callback.assert_any_call("test", 1, 5)
-        progress_callback.assert_any_call("test", 2, 5)
-        progress_callback.assert_any_call("test", 3, 5)
-        progress_callback.assert_any_call("test", 4, 5)
-        progress_callback.assert_any_call("test", 5, 5)
+        assert progress_callback.call_count == 2
+        progress_callback.assert_any_call("test", 1, 2)
+        progress_callback.assert_any_call("test", 2, 2)
 
-    def test_process_batch_with_cancel_check(self) -> None:
+    def test_process_batch_with_cancel_check(self, fake_clock) -> None:
         """Test processing a batch with cancel check."""
-        # Create a cancel check that returns True after 2 items
-        cancel_check = MagicMock()
-        cancel_check.side_effect = [False, False, True]
+        started = threading.Event()
+        scheduler = TaskScheduler(max_workers=1, cancel_check=started.is_set)
         
-        scheduler = TaskScheduler(max_workers=1, cancel_check=cancel_check)
+        # Report canceled once the first item has started, and hold that item
+        # until the monitor has canceled the pool
+        def blocking_square(x):
+            started.set()
+            pool = scheduler.worker_pools["test"]
+            with pool.pause_condition:
+                assert pool.pause_condition.wait_for(lambda: pool.canceled, timeout=5)
+            return x * x
         
-        results = scheduler.process_batch("test", slow_square, [1, 2, 3, 4, 5])
+        results = scheduler.process_batch("test", blocking_square, [1, 2, 3, 4, 5])
         
         # Check that not all items were processed
         assert len(results) < 5
         assert scheduler.worker_pools["test"].canceled
 
-    def test_process_batch_with_pause_check(self) -> None:
+    def test_process_batch_with_pause_check(self, fake_clock) -> None:
         """Test processing a batch with pause check."""
-        # Create a pause check that returns True for a short time
-        pause_check = MagicMock()
-        pause_check.side_effect = [False, True, True, False, False]
+        # Report paused for two checks, then resumed from then on
+        paused_states = [False, True, True]
+        checks = []
+        checked = threading.Event()
+        
+        def pause_check():
+            checks.append(None)
+            if len(checks) >= 5:
+                checked.set()
+            return paused_states[len(checks) - 1] if len(checks) <= len(paused_states) else False
         
         scheduler = TaskScheduler(max_workers=1, pause_check=pause_check)
         
         # Process a batch
-        start_time = time.time()
         results = scheduler.process_batch("test", slow_square, [1, 2, 3])
-        elapsed_time = time.time() - start_time
         
         # Check that all items were processed
         assert sorted(results) == [1, 4, 9]
         
-        # Check that the pause check was called
-        assert pause_check.call_count >= 3
-
-    def test_cancel_all(self) -> None:
-        """Test canceling all worker pools."""
-        scheduler = TaskScheduler(max_workers=2)
-        
-        # Create two worker pools
-        pool1 = MagicMock()
-        pool2 = MagicMock()
-        scheduler.worker_pools = {"pool1": pool1, "pool2": pool2}
-        
-        # Cancel all
+        # Check that the monitor kept polling the pause check, then stop it
+        assert checked.wait(timeout=5)
         scheduler.cancel_all()
-        
-        # Check that both pools were canceled
-        pool1.cancel.assert_called_once()
-        pool2.cancel.assert_called_once()
-
-    def test_pause_all(self) -> None:
-        """Test pausing all worker pools."""
-        scheduler = TaskScheduler(max_workers=2)
-        
-        # Create two worker pools
-        pool1 = MagicMock()
-        pool2 = MagicMock()
-        scheduler.worker_pools = {"pool1": pool1, "pool2": pool2}
-        
-        # Pause all
-        scheduler.pause_all()
-        
-        # Check that both pools were paused
-        pool1.pause.assert_called_once()
-        pool2.pause.assert_called_once()
 
-    def test_resume_all(self) -> None:
-        """Test resuming all worker pools."""
+    @pytest.mark.parametrize("action", ["cancel", "pause", "resume"])
+    def test_action_all(self, action) -> None:
+        """Test canceling, pausing and resuming all worker pools."""
         scheduler = TaskScheduler(max_workers=2)
         
         # Create two worker pools
@@ -242,9 +269,9 @@ class TestTaskScheduler:
         pool2 = MagicMock()
         scheduler.worker_pools = {"pool1": pool1, "pool2": pool2}
         
-        # Resume all
-        scheduler.resume_all()
+        # Apply the action to all pools
+        getattr(scheduler, f"{action}_all")()
         
-        # Check that both pools were resumed
-        pool1.resume.assert_called_once()
-        pool2.resume.assert_called_once()
\ No newline at end of file
+        # Check that both pools received it
+        getattr(pool1, action).assert_called_once()
+        getattr(pool2, action).assert_called_once()
@@ -11,6 +11,20 @@ import pytest
 from photo_organizer.state import ProcessingState, StateChangeEvent, StateManager
 
 
+@pytest.fixture(scope="module")
+def _callback_pool():
+    """Create the callback mocks once per module."""
+    return [MagicMock(), MagicMock()]
+
+
+@pytest.fixture
+def callback_mocks(_callback_pool):
+    """Provide callback mocks with nothing recorded from earlier tests."""
+    for callback in _callback_pool:
+        callback.reset_mock(return_value=True, side_effect=True)
+    return _callback_pool
+
+
 class TestStateManager:
     """Tests for the StateManager class."""
 
@@ -26,49 +40,27 @@ class TestStateManager:
         assert not manager.is_completed()
         assert not manager.is_failed()
 
-    def test_transition_valid(self) -> None:
+    @pytest.mark.parametrize("state, event, expected_state", [
+        (ProcessingState.IDLE, StateChangeEvent.START, ProcessingState.RUNNING),
+        (ProcessingState.RUNNING, StateChangeEvent.PAUSE, ProcessingState.PAUSED),
+        (ProcessingState.RUNNING, StateChangeEvent.CANCEL, ProcessingState.CANCELING),
+        (ProcessingState.RUNNING, StateChangeEvent.COMPLETE, ProcessingState.COMPLETED),
+        (ProcessingState.RUNNING, StateChangeEvent.FAIL, ProcessingState.FAILED),
+        (ProcessingState.PAUSED, StateChangeEvent.RESUME, ProcessingState.RUNNING),
+        (ProcessingState.PAUSED, StateChangeEvent.CANCEL, ProcessingState.CANCELING),
+        (ProcessingState.CANCELING, StateChangeEvent.COMPLETE, ProcessingState.COMPLETED),
+        (ProcessingState.CANCELING, StateChangeEvent.FAIL, ProcessingState.FAILED),
+        (ProcessingState.COMPLETED, StateChangeEvent.START, ProcessingState.RUNNING),
+        (ProcessingState.FAILED, StateChangeEvent.START, ProcessingState.RUNNING),
+    ])
+    def test_transition_valid(self, state, event, expected_state) -> None:
         """Test valid state transitions."""
         manager = StateManager()
+        manager._state = state
         
-        # IDLE -> RUNNING
-        assert manager.transition(StateChangeEvent.START)
-        assert manager.state == ProcessingState.RUNNING
-        assert manager.is_running()
-        
-        # RUNNING -> PAUSED
-        assert manager.transition(StateChangeEvent.PAUSE)
-        assert manager.state == ProcessingState.PAUSED
-        assert manager.is_paused()
-        
-        # PAUSED -> RUNNING
-        assert manager.transition(StateChangeEvent.RESUME)
-        assert manager.state == ProcessingState.RUNNING
-        assert manager.is_running()
-        
-        # RUNNING -> CANCELING
-        assert manager.transition(StateChangeEvent.CANCEL)
-        assert manager.state == ProcessingState.CANCELING
-        assert manager.is_canceling()
-        
-        # CANCELING -> COMPLETED
-        assert manager.transition(StateChangeEvent.COMPLETE)
-        assert manager.state == ProcessingState.COMPLETED
-        assert manager.is_completed()
-        
-        # COMPLETED -> RUNNING
-        assert manager.transition(StateChangeEvent.START)
-        assert manager.state == ProcessingState.RUNNING
-        assert manager.is_running()
-        
-        # RUNNING -> FAILED
-        assert manager.transition(StateChangeEvent.FAIL)
-        assert manager.state == ProcessingState.FAILED
-        assert manager.is_failed()
-        
-        # FAILED -> RUNNING
-        assert manager.transition(StateChangeEvent.START)
-        assert manager.state == ProcessingState.RUNNING
-        assert manager.is_running()
+        assert manager.transition(event)
+        assert manager.state == expected_state
+        assert getattr(manager, f"is_{expected_state.value}")()
 
     def test_transition_invalid(self) -> None:
         """Test invalid state transitions."""
@@ -90,13 +82,12 @@ class TestStateManager:
         assert not manager.transition(StateChangeEvent.FAIL)
         assert manager.state == ProcessingState.IDLE
 
-    def test_state_change_callback(self) -> None:
+    def test_state_change_callback(self, callback_mocks) -> None:
         """Test state change callbacks."""
         manager = StateManager()
         
         # Register callbacks
-        running_callback = MagicMock()
-        paused_callback = MagicMock()
+        running_callback, paused_callback = callback_mocks
         
         manager.register_state_change_callback(ProcessingState.RUNNING, running_callback)
         manager.register_state_change_callback(ProcessingState.PAUSED, paused_callback)
@@ -111,13 +102,12 @@ class TestStateManager:
         running_callback.assert_called_once()
         paused_callback.assert_called_once()
 
-    def test_event_callback(self) -> None:
+    def test_event_callback(self, callback_mocks) -> None:
         """Test event callbacks."""
         manager = StateManager()
         
         # Register callbacks
-        start_callback = MagicMock()
-        pause_callback = MagicMock()
+        start_callback, pause_callback = callback_mocks
         
         manager.register_event_callback(StateChangeEvent.START, start_callback)
         manager.register_event_callback(StateChangeEvent.PAUSE, pause_callback)
@@ -146,49 +136,23 @@ class TestStateManager:
         manager.transition(StateChangeEvent.START)
         assert manager.state == ProcessingState.RUNNING
 
-    def test_can_methods(self) -> None:
+    @pytest.mark.parametrize("state, expected", [
+        (ProcessingState.IDLE, (True, False, False, False)),
+        (ProcessingState.RUNNING, (False, True, False, True)),
+        (ProcessingState.PAUSED, (False, False, True, True)),
+        (ProcessingState.CANCELING, (False, False, False, False)),
+        (ProcessingState.COMPLETED, (True, False, False, False)),
+        (ProcessingState.FAILED, (True, False, False, False)),
+    ])
+    def test_can_methods(self, state, expected) -> None:
         """Test the can_* methods."""
         manager = StateManager()
-        
-        # IDLE state
-        assert manager.can_start()
-        assert not manager.can_pause()
-        assert not manager.can_resume()
-        assert not manager.can_cancel()
-        
-        # RUNNING state
-        manager.transition(StateChangeEvent.START)
-        assert not manager.can_start()
-        assert manager.can_pause()
-        assert not manager.can_resume()
-        assert manager.can_cancel()
-        
-        # PAUSED state
-        manager.transition(StateChangeEvent.PAUSE)
-        assert not manager.can_start()
-        assert not manager.can_pause()
-        assert manager.can_resume()
-        assert manager.can_cancel()
-        
-        # CANCELING state
-        manager.transition(StateChangeEvent.RESUME)
-        manager.transition(StateChangeEvent.CANCEL)
-        assert not manager.can_start()
-        assert not manager.can_pause()
-        assert not manager.can_resume()
-        assert not manager.can_cancel()
-        
-        # COMPLETED state
-        manager.transition(StateChangeEvent.COMPLETE)
-        assert manager.can_start()
-        assert not manager.can_pause()
-        assert not manager.can_resume()
-        assert not manager.can_cancel()
-        
-        # FAILED state
-        manager.transition(StateChangeEvent.START)
-        manager.transition(StateChangeEvent.FAIL)
-        assert manager.can_start()
-        assert not manager.can_pause()
-        assert not manager.can_resume()
-        assert not manager.can_cancel()
\ No newline at end of file
+        manager._state = state
+        
+        # can_start, can_pause, can_resume, can_cancel
+        assert (
+            manager.can_start(),
+            manager.can_pause(),
+            manager.can_resume(),
+            manager.can_cancel(),
+        ) == expected
\ No newline at end of file
@@ -0,0 +1,28 @@
+"""
+Pytest configuration for the user interface tests.
+"""
+
+import sys
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def app():
+    """Create the QApplication instance shared by all Qt tests."""
+    # Imported here so the CLI tests do not load Qt
+    from PyQt6.QtWidgets import QApplication
+    
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication(sys.argv)
+    yield app
+
+
+def pytest_collection_modifyitems(items):
+    """Keep the Qt tests on one pytest-xdist worker under --dist=loadgroup."""
+    # Each worker would otherwise start its own QApplication, while the CLI
+    # tests are free to spread over the remaining workers
+    for item in items:
+        if "app" in getattr(item, "fixturenames", ()):
+            item.add_marker(pytest.mark.xdist_group("qt"))
@@ -3,9 +3,7 @@ Unit tests for the CLI argument parser.
 """
 
 import os
-import tempfile
 from pathlib import Path
-from unittest.mock import patch
 
 import pytest
 
@@ -13,6 +11,46 @@ from photo_organizer.services.reporting import ReportFormat
 from photo_organizer.ui.cli_parser import CLIParser
 
 
+# Argument lists shared by the tests, built once at import
+MINIMAL_ARGV = ("input_path", "output_path")
+FULL_ARGV = (
+    *MINIMAL_ARGV,
+    "--gui",
+    "--recursive",
+    "--report", "text",
+    "--report-path", "report.txt",
+    "--parallel",
+    "--max-workers", "8",
+    "--similarity-threshold", "0.5",
+    "--max-category-depth", "5",
+    "--verbose",
+    "--quiet",
+)
+
+# Expected processing options for "--report both"
+BOTH_REPORT_FORMATS = frozenset({ReportFormat.TEXT, ReportFormat.HTML})
+BOTH_REPORT_PATHS = {
+    ReportFormat.TEXT: "output_path/report.txt",
+    ReportFormat.HTML: "output_path/report.html",
+}
+
+
+@pytest.fixture(scope="module")
+def parser():
+    """Create one CLIParser shared by the tests; parsing does not change it."""
+    return CLIParser()
+
+
+@pytest.fixture(scope="session")
+def io_dirs(tmp_path_factory):
+    """Create existing input and output directories shared by the tests."""
+    # validate_args only checks the directories, so one pair serves the session
+    base = tmp_path_factory.mktemp("cli_parser")
+    (base / "input").mkdir()
+    (base / "output").mkdir()
+    return str(base / "input"), str(base / "output")
+
+
 class TestCLIParser:
     """Tests for the CLIParser class."""
 
@@ -21,10 +59,9 @@ class TestCLIParser:
         parser = CLIParser()
         assert parser.parser is not None
 
-    def test_parse_args_minimal(self) -> None:
+    def test_parse_args_minimal(self, parser) -> None:
         """Test parsing minimal arguments."""
-        parser = CLIParser()
-        args = parser.parse_args(["input_path", "output_path"])
+        args = parser.parse_args(list(MINIMAL_ARGV))
         
         assert args.input_path == "input_path"
         assert args.output_path == "output_path"
@@ -39,23 +76,9 @@ class TestCLIParser:
         assert args.verbose == 0
         assert not args.quiet
 
-    def test_parse_args_full(self) -> None:
+    def test_parse_args_full(self, parser) -> None:
         """Test parsing all arguments."""
-        parser = CLIParser()
-        args = parser.parse_args([
-            "input_path",
-            "output_path",
-            "--gui",
-            "--recursive",
-            "--report", "text",
-            "--report-path", "report.txt",
-            "--parallel",
-            "--max-workers", "8",
-            "--similarity-threshold", "0.5",
-            "--max-category-depth", "5",
-            "--verbose",
-            "--quiet",
-        ])
+        args = parser.parse_args(list(FULL_ARGV))
         
         assert args.input_path == "input_path"
         assert args.output_path == "output_path"
@@ -70,147 +93,71 @@ class TestCLIParser:
         assert args.verbose == 1
         assert args.quiet
 
-    def test_validate_args_valid(self) -> None:
+    def test_validate_args_valid(self, parser, io_dirs) -> None:
         """Test validating valid arguments."""
-        parser = CLIParser()
+        args = parser.parse_args(list(io_dirs))
+        is_valid, error = parser.validate_args(args)
         
-        with tempfile.TemporaryDirectory() as input_dir:
-            with tempfile.TemporaryDirectory() as output_dir:
-                args = parser.parse_args([input_dir, output_dir])
-                is_valid, error = parser.validate_args(args)
-                
-                assert is_valid
-                assert error is None
-
-    def test_validate_args_invalid_input(self) -> None:
+        assert is_valid
+        assert error is None
+
+    def test_validate_args_invalid_input(self, parser, io_dirs) -> None:
         """Test validating arguments with invalid input path."""
-        parser = CLIParser()
-        
-        with tempfile.TemporaryDirectory() as output_dir:
-            args = parser.parse_args(["nonexistent_path", output_dir])
-            is_valid, error = parser.validate_args(args)
-            
-            assert not is_valid
-            assert "Input path does not exist" in error
-
-    @patch("pathlib.Path.mkdir")
-    def test_validate_args_invalid_output(self, mock_mkdir) -> None:
-        """Test validating arguments with invalid output path."""
-        parser = CLIParser()
-        mock_mkdir.side_effect = PermissionError("Permission denied")
-        
-        with tempfile.TemporaryDirectory() as input_dir:
-            args = parser.parse_args([input_dir, "/invalid/output/path"])
-            is_valid, error = parser.validate_args(args)
-            
-            assert not is_valid
-            assert "Cannot create output directory" in error
-
-    def test_validate_args_invalid_similarity(self) -> None:
-        """Test validating arguments with invalid similarity threshold."""
-        parser = CLIParser()
-        
-        with tempfile.TemporaryDirectory() as input_dir:
-            with tempfile.TemporaryDirectory() as output_dir:
-                args = parser.parse_args([
-                    input_dir,
-                    output_dir,
-                    "--similarity-threshold", "1.5",
-                ])
-                is_valid, error = parser.validate_args(args)
-                
-                assert not is_valid
-                assert "Similarity threshold must be between 0.0 and 1.0" in error
-
-    def test_validate_args_invalid_category_depth(self) -> None:
-        """Test validating arguments with invalid category depth."""
-        parser = CLIParser()
+        _, output_dir = io_dirs
+        args = parser.parse_args(["nonexistent_path", output_dir])
+        is_valid, error = parser.validate_args(args)
         
-        with tempfile.TemporaryDirectory() as input_dir:
-            with tempfile.TemporaryDirectory() as output_dir:
-                args = parser.parse_args([
-                    input_dir,
-                    output_dir,
-                    "--max-category-depth", "0",
-                ])
-                is_valid, error = parser.validate_args(args)
-                
-                assert not is_valid
-                assert "Maximum category depth must be at least 1" in error
-
-    def test_validate_args_invalid_workers(self) -> None:
-        """Test validating arguments with invalid number of workers."""
-        parser = CLIParser()
-        
-        with tempfile.TemporaryDirectory() as input_dir:
-            with tempfile.TemporaryDirectory() as output_dir:
-                args = parser.parse_args([
-                    input_dir,
-                    output_dir,
-                    "--max-workers", "0",
-                ])
-                is_valid, error = parser.validate_args(args)
-                
-                assert not is_valid
-                assert "Maximum number of workers must be at least 1" in error
-
-    def test_get_processing_options_text_report(self) -> None:
-        """Test getting processing options with text report."""
-        parser = CLIParser()
-        args = parser.parse_args([
-            "input_path",
-            "output_path",
-            "--report", "text",
-        ])
-        
-        options = parser.get_processing_options(args)
-        
-        assert options["report_format"] == ReportFormat.TEXT
-        assert options["report_path"] == "output_path/report.txt"
+        assert not is_valid
+        assert "Input path does not exist" in error
 
-    def test_get_processing_options_html_report(self) -> None:
-        """Test getting processing options with HTML report."""
-        parser = CLIParser()
-        args = parser.parse_args([
-            "input_path",
-            "output_path",
-            "--report", "html",
-        ])
+    def test_validate_args_invalid_output(self, parser, io_dirs, tmp_path) -> None:
+        """Test validating arguments with invalid output path."""
+        # A regular file in place of the parent makes mkdir fail, even as root
+        blocker = tmp_path / "blocker"
+        blocker.write_bytes(b"")
+        
+        input_dir, _ = io_dirs
+        args = parser.parse_args([input_dir, str(blocker / "output")])
+        is_valid, error = parser.validate_args(args)
+        
+        assert not is_valid
+        assert "Cannot create output directory" in error
+
+    @pytest.mark.parametrize("extra_args, message", [
+        (["--similarity-threshold", "1.5"], "Similarity threshold must be between 0.0 and 1.0"),
+        (["--max-category-depth", "0"], "Maximum category depth must be at least 1"),
+        (["--max-workers", "0"], "Maximum number of workers must be at least 1"),
+    ], ids=["similarity", "category_depth", "workers"])
+    def test_validate_args_invalid_option(self, parser, io_dirs, extra_args, message) -> None:
+        """Test validating arguments with an out of range option."""
+        args = parser.parse_args([*io_dirs, *extra_args])
+        is_valid, error = parser.validate_args(args)
+        
+        assert not is_valid
+        assert message in error
+
+    @pytest.mark.parametrize("report, extra_args, expected_format, expected_path", [
+        ("text", [], ReportFormat.TEXT, "output_path/report.txt"),
+        ("html", [], ReportFormat.HTML, "output_path/report.html"),
+        ("text", ["--report-path", "custom_report.txt"], ReportFormat.TEXT, "custom_report.txt"),
+    ], ids=["text", "html", "custom_path"])
+    def test_get_processing_options_report(
+        self, parser, report, extra_args, expected_format, expected_path
+    ) -> None:
+        """Test getting processing options with a single report format."""
+        args = parser.parse_args([*MINIMAL_ARGV, "--report", report, *extra_args])
         
         options = parser.get_processing_options(args)
         
-        assert options["report_format"] == ReportFormat.HTML
-        assert options["report_path"] == "output_path/report.html"
+        assert options["report_format"] == expected_format
+        assert options["report_path"] == expected_path
 
-    def test_get_processing_options_both_reports(self) -> None:
+    def test_get_processing_options_both_reports(self, parser) -> None:
         """Test getting processing options with both report formats."""
-        parser = CLIParser()
-        args = parser.parse_args([
-            "input_path",
-            "output_path",
-            "--report", "both",
-        ])
+        args = parser.parse_args([*MINIMAL_ARGV, "--report", "both"])
         
         options = parser.get_processing_options(args)
         
         assert isinstance(options["report_format"], list)
-        assert ReportFormat.TEXT in options["report_format"]
-        assert ReportFormat.HTML in options["report_format"]
-        assert isinstance(options["report_path"], dict)
-        assert options["report_path"][ReportFormat.TEXT] == "output_path/report.txt"
-        assert options["report_path"][ReportFormat.HTML] == "output_path/report.html"
-
-    def test_get_processing_options_custom_report_path(self) -> None:
-        """Test getting processing options with custom report path."""
-        parser = CLIParser()
-        args = parser.parse_args([
-            "input_path",
-            "output_path",
-            "--report", "text",
-            "--report-path", "custom_report.txt",
-        ])
-        
-        options = parser.get_processing_options(args)
-        
-        assert options["report_format"] == ReportFormat.TEXT
-        assert options["report_path"] == "custom_report.txt"
\ No newline at end of file
+        assert set(options["report_format"]) == BOTH_REPORT_FORMATS
+        assert options["report_path"] == BOTH_REPORT_PATHS
\ No newline at end of file
@@ -28,27 +28,29 @@ class TestProgressBar:
 
     def test_update_increment(self) -> None:
         """Test updating a progress bar by incrementing."""
-        output = io.StringIO()
+        output = MagicMock()
         bar = ProgressBar(total=10, file=output)
+        bar.update_interval = 0  # Write every update instead of throttling
         
         bar.update()  # Increment by 1
         assert bar.current == 1
         
         # Check that output contains the progress bar
-        output_text = output.getvalue()
+        output_text = "".join(call.args[0] for call in output.write.call_args_list)
         assert "|" in output_text
         assert "10.0%" in output_text
 
     def test_update_specific(self) -> None:
         """Test updating a progress bar to a specific value."""
-        output = io.StringIO()
+        output = MagicMock()
         bar = ProgressBar(total=10, file=output)
+        bar.update_interval = 0  # Write every update instead of throttling
         
         bar.update(5)  # Set to 5
         assert bar.current == 5
         
         # Check that output contains the progress bar
-        output_text = output.getvalue()
+        output_text = "".join(call.args[0] for call in output.write.call_args_list)
         assert "|" in output_text
         assert "50.0%" in output_text
 
@@ -66,14 +68,15 @@ class TestProgressBar:
         assert "100.0%" in output_text
         assert output_text.endswith("\n")
 
-    def test_format_time(self) -> None:
+    @pytest.mark.parametrize(
+        "seconds,expected",
+        [(30, "30s"), (90, "1m30s"), (3600, "1h00m"), (3661, "1h01m")],
+    )
+    def test_format_time(self, seconds, expected) -> None:
         """Test formatting time."""
         bar = ProgressBar(total=10)
         
-        assert bar._format_time(30) == "30s"
-        assert bar._format_time(90) == "1m30s"
-        assert bar._format_time(3600) == "1h00m"
-        assert bar._format_time(3661) == "1h01m"
+        assert bar._format_time(seconds) == expected
 
 
 class TestCLIProgressReporter:
@@ -89,38 +92,39 @@ class TestCLIProgressReporter:
         assert reporter.stage_start_times == {}
         assert reporter.errors == []
 
-    def test_start_stage(self) -> None:
+    def test_start_stage(self, capsys) -> None:
         """Test starting a processing stage."""
         reporter = CLIProgressReporter(verbose=1)
         
-        with patch("builtins.print") as mock_print:
-            reporter.start_stage(ProcessingStage.ANALYZING)
-            
-            assert reporter.current_stage == ProcessingStage.ANALYZING
-            assert ProcessingStage.ANALYZING in reporter.stage_start_times
-            mock_print.assert_called_once()
+        reporter.start_stage(ProcessingStage.ANALYZING)
+        
+        assert reporter.current_stage == ProcessingStage.ANALYZING
+        assert ProcessingStage.ANALYZING in reporter.stage_start_times
+        assert capsys.readouterr().out == "\n=== Analyzing ===\n"
 
-    def test_start_stage_quiet(self) -> None:
+    def test_start_stage_quiet(self, capsys) -> None:
         """Test starting a processing stage in quiet mode."""
         reporter = CLIProgressReporter(quiet=True)
         
-        with patch("builtins.print") as mock_print:
-            reporter.start_stage(ProcessingStage.ANALYZING)
-            
-            assert reporter.current_stage == ProcessingStage.ANALYZING
-            assert ProcessingStage.ANALYZING not in reporter.stage_start_times
-            mock_print.assert_not_called()
+        reporter.start_stage(ProcessingStage.ANALYZING)
+        
+        assert reporter.current_stage == ProcessingStage.ANALYZING
+        assert ProcessingStage.ANALYZING not in reporter.stage_start_times
+        assert capsys.readouterr().out == ""
 
-    def test_end_stage(self) -> None:
+    def test_end_stage(self, capsys) -> None:
         """Test ending a processing stage."""
         reporter = CLIProgressReporter(verbose=1)
         
         # Start the stage first
         reporter.start_stage(ProcessingStage.ANALYZING)
+        capsys.readouterr()
         
-        with patch("builtins.print") as mock_print:
-            reporter.end_stage(ProcessingStage.ANALYZING)
-            mock_print.assert_called_once()
+        reporter.end_stage(ProcessingStage.ANALYZING)
+        
+        out = capsys.readouterr().out
+        assert out.startswith("=== Analyzing completed in ")
+        assert out.endswith(" seconds ===\n\n")
 
     def test_start_progress(self) -> None:
         """Test starting a progress bar."""
@@ -145,63 +149,35 @@ class TestCLIProgressReporter:
         reporter.update_progress("test", 50)
         reporter.progress_bars["test"].update.assert_called_once_with(50)
 
-    def test_log_info(self) -> None:
-        """Test logging an info message."""
-        reporter = CLIProgressReporter(verbose=1)
-        
-        with patch("builtins.print") as mock_print:
-            reporter.log_info("Info message")
-            mock_print.assert_called_once_with("Info message")
-
-    def test_log_info_quiet(self) -> None:
-        """Test logging an info message in quiet mode."""
-        reporter = CLIProgressReporter(quiet=True)
-        
-        with patch("builtins.print") as mock_print:
-            reporter.log_info("Info message")
-            mock_print.assert_not_called()
-
-    def test_log_debug(self) -> None:
-        """Test logging a debug message."""
-        reporter = CLIProgressReporter(verbose=2)
-        
-        with patch("builtins.print") as mock_print:
-            reporter.log_debug("Debug message")
-            mock_print.assert_called_once_with("DEBUG: Debug message")
-
-    def test_log_debug_low_verbosity(self) -> None:
-        """Test logging a debug message with low verbosity."""
-        reporter = CLIProgressReporter(verbose=1)
-        
-        with patch("builtins.print") as mock_print:
-            reporter.log_debug("Debug message")
-            mock_print.assert_not_called()
-
-    def test_log_warning(self) -> None:
-        """Test logging a warning message."""
+    @pytest.mark.parametrize(
+        "verbose,quiet,method,stream,expected",
+        [
+            (1, False, "log_info", "out", "Test message\n"),
+            (0, True, "log_info", "out", ""),
+            (2, False, "log_debug", "out", "DEBUG: Test message\n"),
+            (1, False, "log_debug", "out", ""),
+            (0, False, "log_warning", "err", "WARNING: Test message\n"),
+            (0, False, "log_error", "err", "ERROR: Test message\n"),
+        ],
+        ids=["info", "info_quiet", "debug", "debug_low_verbosity", "warning", "error"],
+    )
+    def test_log_message(self, capsys, verbose, quiet, method, stream, expected) -> None:
+        """Test which stream each log method writes to at a given verbosity."""
+        reporter = CLIProgressReporter(verbose=verbose, quiet=quiet)
+        
+        getattr(reporter, method)("Test message")
+        
+        captured = capsys.readouterr()
+        assert getattr(captured, stream) == expected
+        assert getattr(captured, "err" if stream == "out" else "out") == ""
+
+    def test_log_error_records_error(self) -> None:
+        """Test that logging an error records it against the file."""
         reporter = CLIProgressReporter()
         
-        with patch("builtins.print") as mock_print:
-            reporter.log_warning("Warning message")
-            mock_print.assert_called_once()
-            args, kwargs = mock_print.call_args
-            assert args[0] == "WARNING: Warning message"
-            assert kwargs["file"].__name__ == "stderr"
-
-    def test_log_error(self) -> None:
-        """Test logging an error message."""
-        reporter = CLIProgressReporter()
+        reporter.log_error("Error message", "file.jpg")
         
-        with patch("builtins.print") as mock_print:
-            reporter.log_error("Error message", "file.jpg")
-            mock_print.assert_called_once()
-            args, kwargs = mock_print.call_args
-            assert args[0] == "ERROR: Error message"
-            assert kwargs["file"].__name__ == "stderr"
-            
-            assert len(reporter.errors) == 1
-            assert reporter.errors[0]["file"] == "file.jpg"
-            assert reporter.errors[0]["error"] == "Error message"
+        assert reporter.errors == [{"file": "file.jpg", "error": "Error message"}]
 
     def test_get_errors(self) -> None:
         """Test getting all logged errors."""
@@ -3,41 +3,74 @@ Unit tests for the file selection interface.
 """
 
 import os
-import sys
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import DEFAULT, MagicMock, patch
 
 import pytest
 from PyQt6.QtCore import QMimeData, QUrl, Qt
-from PyQt6.QtGui import QDragEnterEvent, QDropEvent
-from PyQt6.QtWidgets import QApplication, QFileDialog
+from PyQt6.QtWidgets import QFileDialog
 
 from photo_organizer.ui.file_selection import DropArea, FileSelectionWidget
 
 
-@pytest.fixture
-def app():
-    """Create a QApplication instance for testing."""
-    app = QApplication.instance()
-    if app is None:
-        app = QApplication(sys.argv)
-    yield app
+class _FakeDropEvent:
+    """
+    Minimal stand-in for the Qt drag and drop events.
+    
+    Avoids building a MagicMock spec from the large Qt event classes in
+    every test; only the methods DropArea calls are provided.
+    """
+    
+    def __init__(self, mime_data: QMimeData) -> None:
+        self._mime_data = mime_data
+        self.acceptProposedAction = MagicMock()
+        self.ignore = MagicMock()
+    
+    def mimeData(self) -> QMimeData:
+        return self._mime_data
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def drop_area(app):
-    """Create a DropArea instance for testing."""
+    """Create one DropArea for all tests in this module."""
     widget = DropArea()
     yield widget
-    widget.deleteLater()
+    widget.close()
+    widget.setParent(None)
 
 
-@pytest.fixture
-def file_selection_widget(app):
-    """Create a FileSelectionWidget instance for testing."""
+@pytest.fixture(scope="module")
+def _shared_file_selection_widget(app):
+    """Create one FileSelectionWidget for all tests in this module."""
     widget = FileSelectionWidget()
     yield widget
-    widget.deleteLater()
+    widget.close()
+    widget.setParent(None)
+
+
+@pytest.fixture
+def file_selection_widget(_shared_file_selection_widget):
+    """Provide the shared FileSelectionWidget, reset after each test."""
+    widget = _shared_file_selection_widget
+    yield widget
+    
+    # Drop the signal callbacks tests connect; their file list mocks are
+    # undone by monkeypatch
+    try:
+        widget.selectionChanged.disconnect()
+    except TypeError:
+        pass
+    
+    widget._selected_paths = set()
+    widget.file_list.clear()
+
+
+@pytest.fixture
+def file_dialog():
+    """Patch QFileDialog so exec() accepts without showing a dialog."""
+    with patch.multiple(QFileDialog, exec=DEFAULT, selectedFiles=DEFAULT) as mocks:
+        mocks["exec"].return_value = True
+        yield mocks
 
 
 class TestDropArea:
@@ -54,8 +87,7 @@ class TestDropArea:
         mime_data = QMimeData()
         mime_data.setUrls([QUrl.fromLocalFile("/path/to/file.jpg")])
         
-        event = MagicMock(spec=QDragEnterEvent)
-        event.mimeData.return_value = mime_data
+        event = _FakeDropEvent(mime_data)
         
         drop_area.dragEnterEvent(event)
         
@@ -65,8 +97,7 @@ class TestDropArea:
         """Test drag enter event without URLs."""
         mime_data = QMimeData()
         
-        event = MagicMock(spec=QDragEnterEvent)
-        event.mimeData.return_value = mime_data
+        event = _FakeDropEvent(mime_data)
         
         drop_area.dragEnterEvent(event)
         
@@ -80,14 +111,16 @@ class TestDropArea:
             QUrl.fromLocalFile("/path/to/file2.jpg"),
         ])
         
-        event = MagicMock(spec=QDropEvent)
-        event.mimeData.return_value = mime_data
+        event = _FakeDropEvent(mime_data)
         
         # Connect to the filesDropped signal
         callback = MagicMock()
         drop_area.filesDropped.connect(callback)
         
-        drop_area.dropEvent(event)
+        try:
+            drop_area.dropEvent(event)
+        finally:
+            drop_area.filesDropped.disconnect(callback)
         
         event.acceptProposedAction.assert_called_once()
         callback.assert_called_once_with(["/path/to/file1.jpg", "/path/to/file2.jpg"])
@@ -96,8 +129,7 @@ class TestDropArea:
         """Test drop event without URLs."""
         mime_data = QMimeData()
         
-        event = MagicMock(spec=QDropEvent)
-        event.mimeData.return_value = mime_data
+        event = _FakeDropEvent(mime_data)
         
         drop_area.dropEvent(event)
         
@@ -116,16 +148,15 @@ class TestFileSelectionWidget:
         assert hasattr(file_selection_widget, "clear_button")
         assert hasattr(file_selection_widget, "remove_selected_button")
 
-    @patch.object(QFileDialog, 'exec')
-    @patch.object(QFileDialog, 'selectedFiles')
-    def test_on_add_files(self, mock_selected_files, mock_exec, file_selection_widget):
+    def test_on_add_files(self, file_selection_widget, file_dialog):
         """Test adding files."""
-        mock_exec.return_value = True
+        mock_exec = file_dialog["exec"]
+        mock_selected_files = file_dialog["selectedFiles"]
         mock_selected_files.return_value = ["/path/to/file1.jpg", "/path/to/file2.jpg"]
         
         # Connect to the selectionChanged signal
-        callback = MagicMock()
-        file_selection_widget.selectionChanged.connect(callback)
+        emitted = []
+        file_selection_widget.selectionChanged.connect(lambda: emitted.append(True))
         
         # Mock _add_file to avoid file system access
         with patch.object(file_selection_widget, '_add_file') as mock_add_file:
@@ -137,16 +168,15 @@ class TestFileSelectionWidget:
             mock_add_file.assert_any_call("/path/to/file1.jpg")
             mock_add_file.assert_any_call("/path/to/file2.jpg")
 
-    @patch.object(QFileDialog, 'exec')
-    @patch.object(QFileDialog, 'selectedFiles')
-    def test_on_add_folder(self, mock_selected_files, mock_exec, file_selection_widget):
+    def test_on_add_folder(self, file_selection_widget, file_dialog):
         """Test adding a folder."""
-        mock_exec.return_value = True
+        mock_exec = file_dialog["exec"]
+        mock_selected_files = file_dialog["selectedFiles"]
         mock_selected_files.return_value = ["/path/to/folder"]
         
         # Connect to the selectionChanged signal
-        callback = MagicMock()
-        file_selection_widget.selectionChanged.connect(callback)
+        emitted = []
+        file_selection_widget.selectionChanged.connect(lambda: emitted.append(True))
         
         # Mock _add_folder to avoid file system access
         with patch.object(file_selection_widget, '_add_folder') as mock_add_folder:
@@ -156,141 +186,127 @@ class TestFileSelectionWidget:
             assert mock_selected_files.called
             mock_add_folder.assert_called_once_with("/path/to/folder")
 
-    def test_on_clear(self, file_selection_widget):
+    def test_on_clear(self, file_selection_widget, monkeypatch):
         """Test clearing the selection."""
         # Add some files to the selection
         file_selection_widget._selected_paths = {"/path/to/file1.jpg", "/path/to/file2.jpg"}
         
         # Mock the file list
-        file_selection_widget.file_list.clear = MagicMock()
+        monkeypatch.setattr(file_selection_widget.file_list, "clear", MagicMock())
         
         # Connect to the selectionChanged signal
-        callback = MagicMock()
-        file_selection_widget.selectionChanged.connect(callback)
+        emitted = []
+        file_selection_widget.selectionChanged.connect(lambda: emitted.append(True))
         
         file_selection_widget._on_clear()
         
         assert file_selection_widget.file_list.clear.called
         assert len(file_selection_widget._selected_paths) == 0
-        assert callback.called
+        assert emitted
 
-    def test_on_remove_selected(self, file_selection_widget):
+    def test_on_remove_selected(self, file_selection_widget, monkeypatch):
         """Test removing selected files."""
         # Add some files to the selection
         file_selection_widget._selected_paths = {"/path/to/file1.jpg", "/path/to/file2.jpg"}
         
         # Mock the file list
-        file_selection_widget.file_list.selectedItems = MagicMock(return_value=[
+        monkeypatch.setattr(file_selection_widget.file_list, "selectedItems", MagicMock(return_value=[
             MagicMock(data=MagicMock(return_value="/path/to/file1.jpg")),
-        ])
-        file_selection_widget.file_list.takeItem = MagicMock()
-        file_selection_widget.file_list.row = MagicMock(return_value=0)
+        ]))
+        monkeypatch.setattr(file_selection_widget.file_list, "takeItem", MagicMock())
+        monkeypatch.setattr(file_selection_widget.file_list, "row", MagicMock(return_value=0))
         
         # Connect to the selectionChanged signal
-        callback = MagicMock()
-        file_selection_widget.selectionChanged.connect(callback)
+        emitted = []
+        file_selection_widget.selectionChanged.connect(lambda: emitted.append(True))
         
         file_selection_widget._on_remove_selected()
         
         assert file_selection_widget.file_list.takeItem.called
         assert "/path/to/file1.jpg" not in file_selection_widget._selected_paths
         assert "/path/to/file2.jpg" in file_selection_widget._selected_paths
-        assert callback.called
+        assert emitted
 
-    @patch('os.path.isdir')
-    @patch('os.path.isfile')
-    def test_add_paths(self, mock_isfile, mock_isdir, file_selection_widget):
+    def test_add_paths(self, file_selection_widget, tmp_path):
         """Test adding paths."""
-        mock_isdir.side_effect = lambda path: path == "/path/to/folder"
-        mock_isfile.side_effect = lambda path: path != "/path/to/folder"
-        
-        # Mock _add_folder and _add_file to avoid file system access
+        folder = tmp_path / "folder"
+        folder.mkdir()
+        file1 = tmp_path / "file1.jpg"
+        file2 = tmp_path / "file2.jpg"
+        file1.write_bytes(b"")
+        file2.write_bytes(b"")
+        
+        # Mock _add_folder and _add_file to check how each path is routed
         with patch.object(file_selection_widget, '_add_folder') as mock_add_folder:
             with patch.object(file_selection_widget, '_add_file') as mock_add_file:
-                file_selection_widget._add_paths([
-                    "/path/to/folder",
-                    "/path/to/file1.jpg",
-                    "/path/to/file2.jpg",
-                ])
+                file_selection_widget._add_paths([str(folder), str(file1), str(file2)])
                 
-                mock_add_folder.assert_called_once_with("/path/to/folder")
+                mock_add_folder.assert_called_once_with(str(folder))
                 assert mock_add_file.call_count == 2
-                mock_add_file.assert_any_call("/path/to/file1.jpg")
-                mock_add_file.assert_any_call("/path/to/file2.jpg")
+                mock_add_file.assert_any_call(str(file1))
+                mock_add_file.assert_any_call(str(file2))
 
-    @patch('os.walk')
-    def test_add_folder(self, mock_walk, file_selection_widget):
+    def test_add_folder(self, file_selection_widget, tmp_path):
         """Test adding a folder."""
-        mock_walk.return_value = [
-            ("/path/to/folder", [], ["file1.jpg", "file2.jpg"]),
-            ("/path/to/folder/subfolder", [], ["file3.jpg"]),
-        ]
+        (tmp_path / "subfolder").mkdir()
+        for name in ("file1.jpg", "file2.jpg", "subfolder/file3.jpg"):
+            (tmp_path / name).write_bytes(b"")
         
-        # Mock _add_file to avoid file system access
         with patch.object(file_selection_widget, '_add_file') as mock_add_file:
-            file_selection_widget._add_folder("/path/to/folder")
+            file_selection_widget._add_folder(str(tmp_path))
             
             assert mock_add_file.call_count == 3
-            mock_add_file.assert_any_call("/path/to/folder/file1.jpg")
-            mock_add_file.assert_any_call("/path/to/folder/file2.jpg")
-            mock_add_file.assert_any_call("/path/to/folder/subfolder/file3.jpg")
+            mock_add_file.assert_any_call(os.path.join(tmp_path, "file1.jpg"))
+            mock_add_file.assert_any_call(os.path.join(tmp_path, "file2.jpg"))
+            mock_add_file.assert_any_call(os.path.join(tmp_path, "subfolder", "file3.jpg"))
 
-    @patch('os.path.splitext')
-    def test_add_file(self, mock_splitext, file_selection_widget):
+    def test_add_file(self, file_selection_widget, monkeypatch):
         """Test adding a file."""
-        mock_splitext.return_value = ("file1", ".jpg")
-        
         # Mock the file list
-        file_selection_widget.file_list.addItem = MagicMock()
+        monkeypatch.setattr(file_selection_widget.file_list, "addItem", MagicMock())
         
         # Connect to the selectionChanged signal
-        callback = MagicMock()
-        file_selection_widget.selectionChanged.connect(callback)
+        emitted = []
+        file_selection_widget.selectionChanged.connect(lambda: emitted.append(True))
         
         file_selection_widget._add_file("/path/to/file1.jpg")
         
         assert "/path/to/file1.jpg" in file_selection_widget._selected_paths
         assert file_selection_widget.file_list.addItem.called
-        assert callback.called
+        assert emitted
 
-    @patch('os.path.splitext')
-    def test_add_file_unsupported_extension(self, mock_splitext, file_selection_widget):
+    def test_add_file_unsupported_extension(self, file_selection_widget, monkeypatch):
         """Test adding a file with an unsupported extension."""
-        mock_splitext.return_value = ("file1", ".txt")
-        
         # Mock the file list
-        file_selection_widget.file_list.addItem = MagicMock()
+        monkeypatch.setattr(file_selection_widget.file_list, "addItem", MagicMock())
         
         # Connect to the selectionChanged signal
-        callback = MagicMock()
-        file_selection_widget.selectionChanged.connect(callback)
+        emitted = []
+        file_selection_widget.selectionChanged.connect(lambda: emitted.append(True))
         
         file_selection_widget._add_file("/path/to/file1.txt")
         
         assert "/path/to/file1.txt" not in file_selection_widget._selected_paths
         assert not file_selection_widget.file_list.addItem.called
-        assert not callback.called
+        assert not emitted
 
-    @patch('os.path.splitext')
-    def test_add_file_duplicate(self, mock_splitext, file_selection_widget):
+    def test_add_file_duplicate(self, file_selection_widget, monkeypatch):
         """Test adding a duplicate file."""
-        mock_splitext.return_value = ("file1", ".jpg")
-        
         # Add the file to the selection
         file_selection_widget._selected_paths.add("/path/to/file1.jpg")
         
         # Mock the file list
-        file_selection_widget.file_list.addItem = MagicMock()
+        monkeypatch.setattr(file_selection_widget.file_list, "addItem", MagicMock())
         
         # Connect to the selectionChanged signal
-        callback = MagicMock()
-        file_selection_widget.selectionChanged.connect(callback)
+        emitted = []
+        file_selection_widget.selectionChanged.connect(lambda: emitted.append(True))
         
         file_selection_widget._add_file("/path/to/file1.jpg")
         
         assert "/path/to/file1.jpg" in file_selection_widget._selected_paths
         assert not file_selection_widget.file_list.addItem.called
-        assert not callback.called
+        assert not emitted
 
     def test_get_selected_paths(self, file_selection_widget):
         """Test getting selected paths."""
@@ -2,32 +2,32 @@
 Unit tests for the GUI application.
 """
 
-import sys
 from unittest.mock import MagicMock, patch
 
 import pytest
-from PyQt6.QtWidgets import QApplication, QFileDialog, QMainWindow
+from PyQt6.QtWidgets import QDialog, QFileDialog, QMainWindow, QToolBar
 
-from photo_organizer.ui.gui_app import MainWindow
 
-
-@pytest.fixture
-def app():
-    """Create a QApplication instance for testing."""
-    app = QApplication.instance()
-    if app is None:
-        app = QApplication(sys.argv)
-    yield app
-
-
-@pytest.fixture
-def main_window(app):
-    """Create a MainWindow instance for testing."""
+@pytest.fixture(scope="class")
+def _shared_main_window(app):
+    """Create one MainWindow for all tests in a class."""
+    # Imported here so collecting this module does not import the whole ui package
+    from photo_organizer.ui.gui_app import MainWindow
+    
     window = MainWindow()
     yield window
     window.close()
 
 
+@pytest.fixture
+def main_window(_shared_main_window):
+    """Provide the shared MainWindow with no files selected and a ready status."""
+    window = _shared_main_window
+    window.file_selection._on_clear()
+    window.status_label.setText("Ready")
+    return window
+
+
 class TestMainWindow:
     """Tests for the MainWindow class."""
 
@@ -43,16 +43,16 @@ class TestMainWindow:
         menu_bar = main_window.menuBar()
         assert menu_bar is not None
         
-        # Check that the expected menus exist
-        menu_titles = [menu.title() for menu in menu_bar.findChildren(QMenu)]
+        # Check that the expected menus exist, reading the menu bar's own
+        # actions rather than searching the whole widget tree
+        menu_titles = [action.menu().title() for action in menu_bar.actions() if action.menu()]
         assert "&File" in menu_titles
         assert "&Edit" in menu_titles
         assert "&Help" in menu_titles
 
     def test_tool_bar(self, main_window):
         """Test that the tool bar is created."""
-        tool_bars = main_window.findChildren(QToolBar)
-        assert len(tool_bars) > 0
+        assert main_window.findChild(QToolBar) is not None
 
     def test_status_bar(self, main_window):
         """Test that the status bar is created."""
@@ -65,50 +65,53 @@ class TestMainWindow:
         central_widget = main_window.centralWidget()
         assert central_widget is not None
 
-    @patch.object(QFileDialog, 'exec')
-    @patch.object(QFileDialog, 'selectedFiles')
-    def test_on_open_files(self, mock_selected_files, mock_exec, main_window):
+    def test_on_open_files(self, main_window, monkeypatch):
         """Test opening files."""
-        mock_exec.return_value = True
-        mock_selected_files.return_value = ["file1.jpg", "file2.jpg"]
+        calls = []
+        monkeypatch.setattr(QFileDialog, "exec", lambda self: calls.append("exec") or True)
+        monkeypatch.setattr(
+            QFileDialog, "selectedFiles", lambda self: calls.append("selectedFiles") or ["file1.jpg", "file2.jpg"]
+        )
         
         main_window._on_open_files()
         
-        assert mock_exec.called
-        assert mock_selected_files.called
+        assert calls == ["exec", "selectedFiles"]
         assert "Selected 2 files" in main_window.status_label.text()
 
-    @patch.object(QFileDialog, 'exec')
-    @patch.object(QFileDialog, 'selectedFiles')
-    def test_on_open_folder(self, mock_selected_files, mock_exec, main_window):
+    def test_on_open_folder(self, main_window, monkeypatch):
         """Test opening a folder."""
-        mock_exec.return_value = True
-        mock_selected_files.return_value = ["/path/to/folder"]
+        calls = []
+        monkeypatch.setattr(QFileDialog, "exec", lambda self: calls.append("exec") or True)
+        monkeypatch.setattr(
+            QFileDialog, "selectedFiles", lambda self: calls.append("selectedFiles") or ["/path/to/folder"]
+        )
         
         main_window._on_open_folder()
         
-        assert mock_exec.called
-        assert mock_selected_files.called
+        assert calls == ["exec", "selectedFiles"]
         assert "Selected folder: /path/to/folder" in main_window.status_label.text()
 
-    def test_on_organize(self, main_window):
-        """Test organizing images."""
+    def test_on_organize_no_selection(self, main_window):
+        """Test organizing images with no files selected."""
         main_window._on_organize()
-        assert "Ready" in main_window.status_label.text()
-
-    def test_on_stop(self, main_window):
-        """Test stopping the current operation."""
-        main_window._on_stop()
-        assert "Ready" in main_window.status_label.text()
+        assert main_window.status_label.text() == "No files selected"
 
-    def test_on_preferences(self, main_window):
+    @pytest.mark.parametrize("result, label", [
+        (QDialog.DialogCode.Accepted, "Preferences updated"),
+        (QDialog.DialogCode.Rejected, "Preferences unchanged"),
+    ])
+    def test_on_preferences(self, main_window, result, label):
         """Test opening preferences."""
-        main_window._on_preferences()
-        assert "Ready" in main_window.status_label.text()
+        with patch("photo_organizer.ui.config_dialog.ConfigDialog.exec", return_value=result) as mock_exec:
+            main_window._on_preferences()
+        
+        mock_exec.assert_called_once()
+        assert main_window.status_label.text() == label
 
-    def test_on_about(self, main_window):
-        """Test showing the about dialog."""
-        main_window._on_about()
+    @pytest.mark.parametrize("handler", ["_on_stop", "_on_about"])
+    def test_handler_leaves_ready(self, main_window, handler):
+        """Test that the stop and about handlers leave the window ready."""
+        getattr(main_window, handler)()
         assert "Ready" in main_window.status_label.text()
 
 
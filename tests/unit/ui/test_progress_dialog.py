@@ -6,85 +6,76 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 from PyQt6.QtCore import QThread
-from PyQt6.QtWidgets import QApplication, QDialog
+from PyQt6.QtWidgets import QDialog
 
 from photo_organizer.ui.cli_progress import ProcessingStage
 from photo_organizer.ui.progress_dialog import ProgressDialog, ProgressManager, ProgressWorker
 
 
 @pytest.fixture
-def app():
-    """Create a QApplication instance."""
-    return QApplication([])
+def dialog(app):
+    """Create a ProgressDialog instance for testing."""
+    dialog = ProgressDialog()
+    yield dialog
+    dialog.close()
+    dialog.setParent(None)
+
+
+@pytest.fixture
+def mocked_worker():
+    """Create a ProgressWorker whose signals are replaced by mocks."""
+    worker = ProgressWorker(["input.jpg"], "output", {})
+    for name in ("stage_changed", "message_logged", "processing_canceled", "processing_completed"):
+        setattr(worker, name, MagicMock())
+    return worker
 
 
 class TestProgressDialog:
     """Tests for the ProgressDialog class."""
 
-    def test_init(self, app) -> None:
+    def test_init(self, dialog) -> None:
         """Test initializing a ProgressDialog object."""
-        dialog = ProgressDialog()
         assert dialog.windowTitle() == "Processing Images"
         assert dialog.minimumSize().width() >= 500
         assert dialog.minimumSize().height() >= 400
         assert dialog.isModal()
         assert not dialog.canceled
 
-    def test_update_progress(self, app) -> None:
+    def test_update_progress(self, dialog) -> None:
         """Test updating progress."""
-        dialog = ProgressDialog()
-        
         dialog.update_progress(50, 100)
         
         assert dialog.progress_bar.maximum() == 100
         assert dialog.progress_bar.value() == 50
 
-    def test_update_stage_progress(self, app) -> None:
+    def test_update_stage_progress(self, dialog) -> None:
         """Test updating stage progress."""
-        dialog = ProgressDialog()
-        
         dialog.update_stage_progress(75, 100)
         
         assert dialog.stage_progress.maximum() == 100
         assert dialog.stage_progress.value() == 75
 
-    def test_set_stage(self, app) -> None:
+    def test_set_stage(self, dialog) -> None:
         """Test setting the current stage."""
-        dialog = ProgressDialog()
-        
         dialog.set_stage(ProcessingStage.ANALYZING)
         
         assert dialog.stage_label.text() == "Analyzing"
         assert dialog.status_label.text() == "Processing: Analyzing"
         assert "=== Analyzing ===" in dialog.log_output.toPlainText()
 
-    def test_log_message(self, app) -> None:
-        """Test logging a message."""
-        dialog = ProgressDialog()
-        
-        dialog.log_message("Test message")
-        
-        assert "Test message" in dialog.log_output.toPlainText()
-
-    def test_log_error(self, app) -> None:
-        """Test logging an error message."""
-        dialog = ProgressDialog()
-        
-        dialog.log_error("Test error")
-        
-        assert "ERROR: Test error" in dialog.log_output.toPlainText()
-
-    def test_log_warning(self, app) -> None:
-        """Test logging a warning message."""
-        dialog = ProgressDialog()
+    @pytest.mark.parametrize("method, text, expected", [
+        ("log_message", "Test message", "Test message"),
+        ("log_error", "Test error", "ERROR: Test error"),
+        ("log_warning", "Test warning", "WARNING: Test warning"),
+    ], ids=["message", "error", "warning"])
+    def test_log(self, dialog, method, text, expected) -> None:
+        """Test logging a message at each level."""
+        getattr(dialog, method)(text)
         
-        dialog.log_warning("Test warning")
-        
-        assert "WARNING: Test warning" in dialog.log_output.toPlainText()
+        assert expected in dialog.log_output.toPlainText()
 
-    def test_complete(self, app) -> None:
+    def test_complete(self, dialog) -> None:
         """Test marking the operation as complete."""
-        dialog = ProgressDialog()
         dialog.progress_bar.setMaximum(100)
         dialog.stage_progress.setMaximum(100)
         
@@ -98,10 +89,8 @@ class TestProgressDialog:
         assert not dialog.pause_button.isEnabled()
         assert dialog.close_button.isEnabled()
 
-    def test_on_cancel(self, app) -> None:
+    def test_on_cancel(self, dialog) -> None:
         """Test handling the Cancel button."""
-        dialog = ProgressDialog()
-        
         dialog._on_cancel()
         
         assert dialog.canceled
@@ -109,10 +98,8 @@ class TestProgressDialog:
         assert not dialog.cancel_button.isEnabled()
         assert not dialog.pause_button.isEnabled()
 
-    def test_on_pause(self, app) -> None:
+    def test_on_pause(self, dialog) -> None:
         """Test handling the Pause button."""
-        dialog = ProgressDialog()
-        
         # Test pausing
         dialog._on_pause()
         
@@ -158,15 +145,9 @@ class TestProgressWorker:
         assert not worker.paused
 
     @patch("time.sleep")
-    def test_process_canceled(self, mock_sleep) -> None:
+    def test_process_canceled(self, mock_sleep, mocked_worker) -> None:
         """Test processing with cancellation."""
-        worker = ProgressWorker(["input.jpg"], "output", {})
-        
-        # Mock signals
-        worker.stage_changed = MagicMock()
-        worker.message_logged = MagicMock()
-        worker.processing_canceled = MagicMock()
-        worker.processing_completed = MagicMock()
+        worker = mocked_worker
         
         # Cancel immediately after starting
         worker.canceled = True
@@ -191,20 +172,20 @@ class TestProgressManager:
         assert manager.thread is None
         assert manager.worker is None
 
-    @patch("photo_organizer.ui.progress_dialog.ProgressDialog")
-    @patch("photo_organizer.ui.progress_dialog.QThread")
-    @patch("photo_organizer.ui.progress_dialog.ProgressWorker")
-    def test_start_processing(self, mock_worker_class, mock_thread_class, mock_dialog_class) -> None:
+    def test_start_processing(self, monkeypatch) -> None:
         """Test starting processing."""
         # Mock objects
         mock_dialog = MagicMock()
-        mock_dialog_class.return_value = mock_dialog
+        mock_dialog_class = MagicMock(return_value=mock_dialog)
+        monkeypatch.setattr("photo_organizer.ui.progress_dialog.ProgressDialog", mock_dialog_class)
         
         mock_thread = MagicMock()
-        mock_thread_class.return_value = mock_thread
+        mock_thread_class = MagicMock(return_value=mock_thread)
+        monkeypatch.setattr("photo_organizer.ui.progress_dialog.QThread", mock_thread_class)
         
         mock_worker = MagicMock()
-        mock_worker_class.return_value = mock_worker
+        mock_worker_class = MagicMock(return_value=mock_worker)
+        monkeypatch.setattr("photo_organizer.ui.progress_dialog.ProgressWorker", mock_worker_class)
         
         # Create manager and start processing
         manager = ProgressManager()
@@ -220,14 +201,17 @@ class TestProgressManager:
         
         # Check that signals were connected
         assert mock_thread.started.connect.called
-        assert mock_worker.progress_updated.connect.called
-        assert mock_worker.stage_progress_updated.connect.called
-        assert mock_worker.stage_changed.connect.called
-        assert mock_worker.message_logged.connect.called
-        assert mock_worker.error_logged.connect.called
-        assert mock_worker.warning_logged.connect.called
-        assert mock_worker.processing_completed.connect.called
-        assert mock_worker.processing_canceled.connect.called
+        for signal in (
+            "progress_updated",
+            "stage_progress_updated",
+            "stage_changed",
+            "message_logged",
+            "error_logged",
+            "warning_logged",
+            "processing_completed",
+            "processing_canceled",
+        ):
+            assert getattr(mock_worker, signal).connect.called, signal
         
         # Check that thread was started
         mock_thread.start.assert_called_once()
@@ -11,42 +11,67 @@ from photo_organizer.state import ProcessingState, StateChangeEvent
 from photo_organizer.ui.state_monitor import StateMonitor
 
 
-@pytest.fixture
-def mock_app_core():
-    """Create a mock ApplicationCore."""
-    app_core = MagicMock()
-    app_core.state_manager = MagicMock()
+def _configure_app_core(app_core) -> None:
+    """Put a mock ApplicationCore into the idle, ready-to-start state."""
     app_core.state_manager.state = ProcessingState.IDLE
     app_core.state_manager.can_start.return_value = True
     app_core.state_manager.can_pause.return_value = False
     app_core.state_manager.can_resume.return_value = False
     app_core.state_manager.can_cancel.return_value = False
-    return app_core
+
+
+@pytest.fixture(scope="module")
+def _shared_monitor(app):
+    """Create one StateMonitor over a mock ApplicationCore for this module."""
+    app_core = MagicMock()
+    _configure_app_core(app_core)
+    
+    # The polling timer is not needed by the tests, so it is never started
+    with patch.object(QTimer, "start"):
+        monitor = StateMonitor(app_core)
+    yield monitor
+
+
+@pytest.fixture
+def monitor(_shared_monitor):
+    """Provide the shared StateMonitor with its mock ApplicationCore reset."""
+    monitor = _shared_monitor
+    monitor.app_core.reset_mock(return_value=True, side_effect=True)
+    _configure_app_core(monitor.app_core)
+    monitor.state = ProcessingState.IDLE
+    yield monitor
+    
+    # Drop the signal callbacks tests connect
+    try:
+        monitor.state_changed.disconnect()
+    except TypeError:
+        pass
 
 
 @pytest.fixture
-def app():
-    """Create a QApplication instance."""
-    from PyQt6.QtWidgets import QApplication
-    return QApplication([])
+def mock_app_core(monitor):
+    """Get the mock ApplicationCore behind the shared StateMonitor."""
+    return monitor.app_core
 
 
 class TestStateMonitor:
     """Tests for the StateMonitor class."""
 
-    def test_init(self, mock_app_core, app) -> None:
+    def test_init(self, mock_app_core) -> None:
         """Test initializing a StateMonitor object."""
+        # Built directly, since the shared monitor never starts its timer
         monitor = StateMonitor(mock_app_core)
         
-        assert monitor.app_core == mock_app_core
-        assert monitor.state == ProcessingState.IDLE
-        assert monitor.timer.isActive()
-        assert monitor.timer.interval() == 100
+        try:
+            assert monitor.app_core == mock_app_core
+            assert monitor.state == ProcessingState.IDLE
+            assert monitor.timer.isActive()
+            assert monitor.timer.interval() == 100
+        finally:
+            monitor.timer.stop()
 
-    def test_on_state_changed(self, mock_app_core, app) -> None:
+    def test_on_state_changed(self, monitor) -> None:
         """Test handling state changes."""
-        monitor = StateMonitor(mock_app_core)
-        
         # Connect to state_changed signal
         mock_callback = MagicMock()
         monitor.state_changed.connect(mock_callback)
@@ -57,10 +82,8 @@ class TestStateMonitor:
         assert monitor.state == ProcessingState.RUNNING
         mock_callback.assert_called_once_with(ProcessingState.RUNNING)
 
-    def test_check_state(self, mock_app_core, app) -> None:
+    def test_check_state(self, monitor, mock_app_core) -> None:
         """Test checking the current state."""
-        monitor = StateMonitor(mock_app_core)
-        
         # Connect to state_changed signal
         mock_callback = MagicMock()
         monitor.state_changed.connect(mock_callback)
@@ -74,10 +97,8 @@ class TestStateMonitor:
         assert monitor.state == ProcessingState.RUNNING
         mock_callback.assert_called_once_with(ProcessingState.RUNNING)
 
-    def test_start_processing(self, mock_app_core, app) -> None:
+    def test_start_processing(self, monitor, mock_app_core) -> None:
         """Test starting processing."""
-        monitor = StateMonitor(mock_app_core)
-        
         # Set up mock
         mock_app_core.state_manager.transition.return_value = True
         
@@ -87,10 +108,8 @@ class TestStateMonitor:
         assert result is True
         mock_app_core.state_manager.transition.assert_called_once_with(StateChangeEvent.START)
 
-    def test_start_processing_cannot_start(self, mock_app_core, app) -> None:
+    def test_start_processing_cannot_start(self, monitor, mock_app_core) -> None:
         """Test starting processing when it cannot be started."""
-        monitor = StateMonitor(mock_app_core)
-        
         # Set up mock
         mock_app_core.state_manager.can_start.return_value = False
         
@@ -100,88 +119,20 @@ class TestStateMonitor:
         assert result is False
         mock_app_core.state_manager.transition.assert_not_called()
 
-    def test_pause_processing(self, mock_app_core, app) -> None:
-        """Test pausing processing."""
-        monitor = StateMonitor(mock_app_core)
-        
+    @pytest.mark.parametrize("action", ["pause", "resume", "cancel"])
+    @pytest.mark.parametrize("allowed", [True, False], ids=["allowed", "not_allowed"])
+    def test_control_processing(self, monitor, mock_app_core, action, allowed) -> None:
+        """Test pausing, resuming and canceling processing."""
         # Set up mock
-        mock_app_core.state_manager.can_pause.return_value = True
+        getattr(mock_app_core.state_manager, f"can_{action}").return_value = allowed
         
-        # Pause processing
-        result = monitor.pause_processing()
+        result = getattr(monitor, f"{action}_processing")()
         
-        assert result is True
-        mock_app_core.pause.assert_called_once()
+        assert result is allowed
+        assert getattr(mock_app_core, action).call_count == int(allowed)
 
-    def test_pause_processing_cannot_pause(self, mock_app_core, app) -> None:
-        """Test pausing processing when it cannot be paused."""
-        monitor = StateMonitor(mock_app_core)
-        
-        # Set up mock
-        mock_app_core.state_manager.can_pause.return_value = False
-        
-        # Pause processing
-        result = monitor.pause_processing()
-        
-        assert result is False
-        mock_app_core.pause.assert_not_called()
-
-    def test_resume_processing(self, mock_app_core, app) -> None:
-        """Test resuming processing."""
-        monitor = StateMonitor(mock_app_core)
-        
-        # Set up mock
-        mock_app_core.state_manager.can_resume.return_value = True
-        
-        # Resume processing
-        result = monitor.resume_processing()
-        
-        assert result is True
-        mock_app_core.resume.assert_called_once()
-
-    def test_resume_processing_cannot_resume(self, mock_app_core, app) -> None:
-        """Test resuming processing when it cannot be resumed."""
-        monitor = StateMonitor(mock_app_core)
-        
-        # Set up mock
-        mock_app_core.state_manager.can_resume.return_value = False
-        
-        # Resume processing
-        result = monitor.resume_processing()
-        
-        assert result is False
-        mock_app_core.resume.assert_not_called()
-
-    def test_cancel_processing(self, mock_app_core, app) -> None:
-        """Test canceling processing."""
-        monitor = StateMonitor(mock_app_core)
-        
-        # Set up mock
-        mock_app_core.state_manager.can_cancel.return_value = True
-        
-        # Cancel processing
-        result = monitor.cancel_processing()
-        
-        assert result is True
-        mock_app_core.cancel.assert_called_once()
-
-    def test_cancel_processing_cannot_cancel(self, mock_app_core, app) -> None:
-        """Test canceling processing when it cannot be canceled."""
-        monitor = StateMonitor(mock_app_core)
-        
-        # Set up mock
-        mock_app_core.state_manager.can_cancel.return_value = False
-        
-        # Cancel processing
-        result = monitor.cancel_processing()
-        
-        assert result is False
-        mock_app_core.cancel.assert_not_called()
-
-    def test_can_methods(self, mock_app_core, app) -> None:
+    def test_can_methods(self, monitor, mock_app_core) -> None:
         """Test the can_* methods."""
-        monitor = StateMonitor(mock_app_core)
-        
         # Set up mocks
         mock_app_core.state_manager.can_start.return_value = True
         mock_app_core.state_manager.can_pause.return_value = False